@@ -0,0 +1,188 @@
+# backtest/intrabar.py
+
+import time as _time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from backtest.resolver import resolve_trade, Resolution, NONE
+
+
+M5_SECONDS = 300
+
+# cache series of M1 windows fetched for single ambiguous bars
+M1_WINDOWS = "M1_windows"
+
+
+class IntrabarResolver:
+    """
+    Re-resolves ambiguous M5 exit bars on M1 data.
+
+    An exit bar is ambiguous when its range touches more than one
+    of the live levels (stop, TP, BE trigger), or the BE trigger and
+    entry in the same bar — the M5 loop can't know which came first
+    and always assumes the stop.
+
+    M1 bars are read from the local BarCache, and only for those
+    bars. The M1 history is memory-mapped once, so untouched days
+    are never read from disk.
+
+    With a connected terminal (`mt5`), a bar the cache can't cover
+    has just its own M1 window fetched (copy_rates_range), kept in
+    the cache's sparse M1_WINDOWS series for the next run. The
+    contiguous M1 series is left alone: the replay reads it as a
+    continuous history.
+    """
+
+    def __init__(self, cache, symbol: str, mt5=None):
+        self.cache = cache
+        self.symbol = symbol
+        self.mt5 = mt5
+        self._series = {}       # cache series → memory-mapped Bars
+
+        self.trades = 0
+        self.ambiguous_bars = 0
+        self.trades_changed = 0
+        self.m1_bars_used = 0
+        self.m1_missing = 0
+        self.m1_requests = 0
+        self.m1_fetched = 0
+        self.seconds = 0.0
+
+    # -------------------------------------------------
+    def resolve(
+        self, m5, entry_index, direction, entry, sl, tp, be_level
+    ) -> Resolution:
+        self.trades += 1
+
+        coarse = resolve_trade(
+            m5.high, m5.low, entry_index, direction, entry, sl, tp, be_level
+        )
+
+        res = coarse
+
+        while res.exit_reason != NONE:
+            j = res.exit_index
+            # stop already at entry when the bar opened?
+            be_active = 0 <= res.be_index < j
+
+            if not self._ambiguous(m5, j, entry, sl, tp, be_level, be_active):
+                break
+
+            self.ambiguous_bars += 1
+            fine = self._resolve_bar(
+                m5, j, direction, entry, sl, tp, be_level, be_active
+            )
+
+            if fine is None:
+                break  # no M1 data → keep the M5 answer
+
+            if be_active:
+                be_index = res.be_index
+            else:
+                be_index = j if fine.be_index >= 0 else -1
+
+            if fine.exit_reason != NONE:
+                res = Resolution(fine.exit_reason, j, be_index)
+                break
+
+            if be_index < 0:
+                break  # M1 disagrees with M5 range → keep the M5 answer
+
+            # BE fired inside the bar without an exit → continue on M5
+            res = resolve_trade(
+                m5.high, m5.low, j, direction,
+                entry, entry, tp, be_level, be_active=True,
+            )
+            res.be_index = be_index
+
+        if (res.exit_reason, res.exit_index) != (
+            coarse.exit_reason, coarse.exit_index
+        ):
+            self.trades_changed += 1
+
+        return res
+
+    # -------------------------------------------------
+    def _ambiguous(self, m5, j, entry, sl, tp, be_level, be_active):
+        hi, lo = m5.high[j], m5.low[j]
+
+        def touched(level):
+            return lo <= level <= hi
+
+        if be_active:
+            return touched(entry) and touched(tp)
+
+        hits = touched(sl) + touched(tp) + touched(be_level)
+        return hits >= 2 or (touched(be_level) and touched(entry))
+
+    def _resolve_bar(self, m5, j, direction, entry, sl, tp, be_level, be_active):
+        started = _time.perf_counter()
+
+        window = self._m1_window(int(m5.time[j]))
+
+        if window is None:
+            self.m1_missing += 1
+            self.seconds += _time.perf_counter() - started
+            return None
+
+        high, low = window
+        self.m1_bars_used += len(high)
+
+        fine = resolve_trade(
+            high, low, -1, direction,
+            entry, entry if be_active else sl, tp, be_level,
+            be_active=be_active,
+        )
+
+        self.seconds += _time.perf_counter() - started
+        return fine
+
+    def _m1_window(self, t0):
+        """
+        (high, low) of the M1 bars inside the M5 bar opening at t0:
+        cache first, then the terminal. None if neither has any.
+        """
+        for series in ("M1", M1_WINDOWS):
+            m1 = self._series.get(series)
+            if m1 is None:
+                m1 = self._series[series] = self.cache.load(self.symbol, series)
+
+            lo = int(np.searchsorted(m1.time, t0, side="left"))
+            hi = int(np.searchsorted(m1.time, t0 + M5_SECONDS, side="left"))
+            if hi > lo:
+                return m1.high[lo:hi], m1.low[lo:hi]
+
+        if self.mt5 is None:
+            return None
+
+        rates = self.mt5.copy_rates_range(
+            self.symbol, self.mt5.TIMEFRAME_M1,
+            datetime.fromtimestamp(t0, timezone.utc),
+            datetime.fromtimestamp(t0 + M5_SECONDS - 1, timezone.utc),
+        )
+        self.m1_requests += 1
+        if rates is None or len(rates) == 0:
+            return None
+        self.m1_fetched += len(rates)
+
+        # append-only: a window older than the cached tail is used
+        # for this run but not kept
+        if self.cache.append(self.symbol, M1_WINDOWS, rates):
+            self._series.pop(M1_WINDOWS, None)   # re-map with the new rows
+
+        return (
+            np.asarray(rates["high"], dtype=np.float64),
+            np.asarray(rates["low"], dtype=np.float64),
+        )
+
+    # -------------------------------------------------
+    def report(self):
+        print("\n--- INTRABAR (M1) RESOLUTION ---")
+        print(f"Trades resolved: {self.trades}")
+        print(f"Ambiguous M5 bars: {self.ambiguous_bars}")
+        print(f"Trades changed by M1: {self.trades_changed}")
+        print(f"M1 bars read: {self.m1_bars_used} | missing M1 bars: {self.m1_missing}")
+        if self.mt5 is not None:
+            print(f"M1 fetched: {self.m1_fetched} bars in {self.m1_requests} requests")
+        print(f"Extra time: {self.seconds * 1000:.1f} ms")
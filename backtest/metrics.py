@@ -0,0 +1,90 @@
+# backtest/metrics.py
+
+
+class RunningStats:
+    """
+    Trade count, wins, R sum and worst drawdown of one group of
+    trades, updated in O(1).
+    """
+
+    __slots__ = ("trades", "wins", "sum_r", "max_drawdown")
+
+    def __init__(self):
+        self.trades = 0
+        self.wins = 0
+        self.sum_r = 0.0
+        self.max_drawdown = 0.0
+
+    def update(self, r: float, drawdown: float):
+        self.trades += 1
+        self.wins += r > 0
+        self.sum_r += r
+        self.max_drawdown = min(self.max_drawdown, drawdown)
+
+    @property
+    def winrate(self) -> float:
+        return self.wins / self.trades if self.trades else 0.0
+
+    @property
+    def expectancy(self) -> float:
+        return self.sum_r / self.trades if self.trades else 0.0
+
+
+class TradeMetrics:
+    """
+    Equity, peak and drawdown plus per-direction and primary/flip
+    stats, fed one trade record at a time by the Backtester.
+
+    A group's max_drawdown is the deepest account drawdown seen on
+    one of its trades (the contribution the old report printed).
+    """
+
+    def __init__(self, initial_balance: float):
+        self.initial_balance = initial_balance
+        self.balance = initial_balance
+        self.peak = initial_balance
+        self.drawdown = 0.0
+
+        self.all = RunningStats()
+        self.primary = RunningStats()
+        self.flip = RunningStats()
+        self.by_direction = {"SELL": RunningStats(), "BUY": RunningStats()}
+
+    # -------------------------------------------------
+    def update(self, record: dict):
+        r = record["R"]
+
+        self.balance += record["pnl"]
+        self.peak = max(self.peak, self.balance)
+        self.drawdown = self.balance - self.peak
+
+        self.all.update(r, self.drawdown)
+        self.by_direction[record["direction"]].update(r, self.drawdown)
+        (self.flip if record["is_flip"] else self.primary).update(r, self.drawdown)
+
+    # -------------------------------------------------
+    def summary(self) -> dict:
+        return {
+            "trades": self.all.trades,
+            "winrate": self.all.winrate,
+            "expectancy": self.all.expectancy,
+            "max_drawdown": self.all.max_drawdown,
+            "final_balance": self.balance,
+        }
+
+    def breakdown(self) -> dict:
+        groups = {
+            "primary": self.primary,
+            "flip": self.flip,
+            "sell": self.by_direction["SELL"],
+            "buy": self.by_direction["BUY"],
+        }
+        return {
+            name: {
+                "trades": g.trades,
+                "winrate": g.winrate,
+                "expectancy": g.expectancy,
+                "max_drawdown": g.max_drawdown,
+            }
+            for name, g in groups.items()
+        }
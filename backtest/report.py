@@ -0,0 +1,57 @@
+# backtest/report.py
+
+import json
+import os
+
+from backtest.trade_store import trades_frame
+
+
+def write_report(metrics, equity, out_dir: str, trade_log=None) -> list[str]:
+    """
+    Writes summary.json, equity.png and (with a trade store)
+    trades.csv into `out_dir`. Returns the paths written.
+
+    matplotlib is imported here, with the non-interactive backend,
+    so runs that never render don't load it.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    written = []
+
+    path = os.path.join(out_dir, "summary.json")
+    with open(path, "w") as f:
+        json.dump(
+            {**metrics.summary(), "breakdown": metrics.breakdown()},
+            f, indent=2,
+        )
+    written.append(path)
+
+    path = os.path.join(out_dir, "equity.png")
+    if plot_equity(equity, path):
+        written.append(path)
+
+    if trade_log and os.path.isdir(trade_log):
+        path = os.path.join(out_dir, "trades.csv")
+        trades_frame(trade_log).to_csv(path, index=False)
+        written.append(path)
+
+    return written
+
+
+def plot_equity(equity, path: str) -> bool:
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("⚠️ matplotlib not installed — equity chart skipped")
+        return False
+
+    fig, ax = plt.subplots(figsize=(10, 5))
+    ax.plot(equity)
+    ax.set_title("Equity Curve")
+    ax.set_xlabel("Trades")
+    ax.set_ylabel("Balance")
+    ax.grid(True)
+    fig.savefig(path, dpi=100, bbox_inches="tight")
+    plt.close(fig)
+    return True
@@ -0,0 +1,264 @@
+# backtest/resolver.py
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+SL = "SL"
+BE = "BE"
+TP = "TP"
+NONE = "NONE"
+
+# first forward window scanned; doubles until a hit or end of data
+WINDOW = 256
+
+# resolve_batch: cap on bars compared per pass (plans x window)
+BLOCK = 1 << 20
+
+
+@dataclass
+class Resolution:
+    exit_reason: str
+    exit_index: int
+    be_index: int = -1  # bar where the stop moved to entry, -1 = never
+
+
+# =============================
+# FIRST-TRUE SEARCH
+# =============================
+def first_at_or_above(values, level, start, stop=None):
+    """
+    First index in [start, stop) with values[i] >= level, else stop.
+    """
+    return _first_true(values, level, start, stop, above=True)
+
+
+def first_at_or_below(values, level, start, stop=None):
+    """
+    First index in [start, stop) with values[i] <= level, else stop.
+    """
+    return _first_true(values, level, start, stop, above=False)
+
+
+def _first_true(values, level, start, stop, above):
+    if stop is None:
+        stop = len(values)
+
+    pos = start
+    size = WINDOW
+
+    while pos < stop:
+        end = min(pos + size, stop)
+        window = values[pos:end]
+        hits = window >= level if above else window <= level
+
+        k = int(hits.argmax())
+        if hits[k]:
+            return pos + k
+
+        pos = end
+        size *= 2
+
+    return stop
+
+
+# =============================
+# SINGLE TRADE
+# =============================
+def resolve_trade(
+    high,
+    low,
+    entry_index: int,
+    direction: str,
+    entry: float,
+    sl: float,
+    tp: float,
+    be_level: float,
+    be_active: bool = False,
+    stop: int | None = None,
+) -> Resolution:
+    """
+    Same rules as the bar-by-bar loop, bar j from entry_index + 1:
+
+        1) BE trigger moves the stop to entry (same bar applies)
+        2) stop checked before TP within a bar
+
+    Exit reason is SL, BE (stop hit after the move), TP or NONE.
+    With be_active=True the stop is assumed already at `sl` and
+    be_index is reported as entry_index.
+    """
+    n = len(high) if stop is None else stop
+    start = entry_index + 1
+
+    if direction == "SELL":
+        adverse, favourable = high, low
+        hit_stop, hit_target = first_at_or_above, first_at_or_below
+    else:
+        adverse, favourable = low, high
+        hit_stop, hit_target = first_at_or_below, first_at_or_above
+
+    # -------------------------------
+    # BEFORE BREAKEVEN
+    # -------------------------------
+    if not be_active:
+        be_idx = hit_target(favourable, be_level, start, n)
+        sl_idx = hit_stop(adverse, sl, start, be_idx)
+        tp_idx = hit_target(favourable, tp, start, be_idx)
+
+        if min(sl_idx, tp_idx) < be_idx:
+            if sl_idx <= tp_idx:
+                return Resolution(SL, sl_idx)
+            return Resolution(TP, tp_idx)
+
+        if be_idx >= n:
+            return Resolution(NONE, n - 1)
+
+        start = be_idx
+        sl = entry
+    else:
+        be_idx = entry_index
+
+    # -------------------------------
+    # STOP AT ENTRY
+    # -------------------------------
+    sl_idx = hit_stop(adverse, sl, start, n)
+    tp_idx = hit_target(favourable, tp, start, min(sl_idx + 1, n))
+
+    if sl_idx >= n and tp_idx >= n:
+        return Resolution(NONE, n - 1, be_idx)
+
+    if sl_idx <= tp_idx:
+        return Resolution(BE, sl_idx, be_idx)
+    return Resolution(TP, tp_idx, be_idx)
+
+
+# =============================
+# BATCH
+# =============================
+def resolve_batch(high, low, entry_index, direction, entry, sl, tp, be_level):
+    """
+    Resolves many trade plans against the same bar arrays, with the
+    rules of resolve_trade.
+
+    All plan arguments are equal-length sequences. Every search runs
+    for all plans of a side at once (first_true_batch). Returns
+    (exit_reason, exit_index) arrays aligned with the plans.
+    """
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+
+    entry_index = np.asarray(entry_index, dtype=np.int64)
+    direction = np.asarray(direction)
+    entry = np.asarray(entry, dtype=np.float64)
+    sl = np.asarray(sl, dtype=np.float64)
+    tp = np.asarray(tp, dtype=np.float64)
+    be_level = np.asarray(be_level, dtype=np.float64)
+
+    count = len(entry_index)
+    reasons = np.empty(count, dtype="<U4")
+    exits = np.empty(count, dtype=np.int64)
+
+    for sell in (True, False):
+        k = np.flatnonzero((direction == "SELL") == sell)
+        if not len(k):
+            continue
+        if sell:
+            adverse, favourable, stop_above = high, low, True
+        else:
+            adverse, favourable, stop_above = low, high, False
+
+        reasons[k], exits[k] = _resolve_side(
+            adverse, favourable, stop_above,
+            entry_index[k], entry[k], sl[k], tp[k], be_level[k],
+        )
+
+    return reasons, exits
+
+
+def _resolve_side(adverse, favourable, stop_above, entry_index, entry, sl, tp, be_level):
+    n = len(adverse)
+    start = entry_index + 1
+    end = np.full(len(start), n, dtype=np.int64)
+
+    def hit_stop(level, lo, hi):
+        return first_true_batch(adverse, level, lo, hi, above=stop_above)
+
+    def hit_target(level, lo, hi):
+        return first_true_batch(favourable, level, lo, hi, above=not stop_above)
+
+    reasons = np.full(len(start), NONE, dtype="<U4")
+    exits = np.full(len(start), n - 1, dtype=np.int64)
+
+    # before breakeven
+    be_idx = hit_target(be_level, start, end)
+    sl_idx = hit_stop(sl, start, be_idx)
+    tp_idx = hit_target(tp, start, be_idx)
+
+    early = np.minimum(sl_idx, tp_idx) < be_idx
+    stopped = early & (sl_idx <= tp_idx)
+    reasons[stopped] = SL
+    exits[stopped] = sl_idx[stopped]
+    target = early & ~stopped
+    reasons[target] = TP
+    exits[target] = tp_idx[target]
+
+    # stop at entry from the BE bar
+    moved = ~early & (be_idx < n)
+    if moved.any():
+        be_idx = be_idx[moved]
+        sl_idx = hit_stop(entry[moved], be_idx, end[moved])
+        tp_idx = hit_target(tp[moved], be_idx, np.minimum(sl_idx + 1, n))
+
+        sub_reasons = reasons[moved]
+        sub_exits = exits[moved]
+        done = (sl_idx < n) | (tp_idx < n)
+        at_entry = done & (sl_idx <= tp_idx)
+        sub_reasons[at_entry] = BE
+        sub_exits[at_entry] = sl_idx[at_entry]
+        target = done & ~at_entry
+        sub_reasons[target] = TP
+        sub_exits[target] = tp_idx[target]
+
+        reasons[moved] = sub_reasons
+        exits[moved] = sub_exits
+
+    return reasons, exits
+
+
+def first_true_batch(values, levels, starts, stops, above):
+    """
+    first_at_or_above / first_at_or_below for many searches over the
+    same array: per row, the first index in [starts, stops) crossing
+    levels, else stops.
+
+    Unfinished rows share one doubling window per pass, compared as a
+    (rows, window) block and reduced with argmax along each row.
+    """
+    levels = np.asarray(levels, dtype=np.float64)
+    out = np.array(stops, dtype=np.int64)
+    pos = np.array(starts, dtype=np.int64)
+
+    rows = np.flatnonzero(pos < out)
+    size = WINDOW
+
+    while len(rows):
+        width = min(size, max(WINDOW, BLOCK // len(rows)))
+
+        idx = pos[rows, None] + np.arange(width)
+        inside = idx < out[rows, None]
+        window = values[np.minimum(idx, len(values) - 1)]
+        if above:
+            hits = (window >= levels[rows, None]) & inside
+        else:
+            hits = (window <= levels[rows, None]) & inside
+
+        k = hits.argmax(axis=1)
+        found = hits[np.arange(len(rows)), k]
+        out[rows[found]] = pos[rows[found]] + k[found]
+
+        pos[rows] += width
+        rows = rows[~found & (pos[rows] < out[rows])]
+        size *= 2
+
+    return out
@@ -9,25 +9,29 @@ import os
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, PROJECT_ROOT)
 
-import MetaTrader5 as mt5
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-from datetime import time
+from datetime import time, datetime
+
+from core.mt5_api import mt5
+
+if not mt5.available():  # offline: cached bars only
+    mt5 = None
 
-from core.mt5_connector import connect
 from core.entry_engine import EntryEngine
 from config.settings import SYMBOL
 from core.double_break_detector import DoubleBreakDetector
+from core.bars import Bars
+from core.bar_cache import BarCache
+from core.levels import build_level_table, ROLLING
+from backtest.resolver import resolve_trade
+from backtest.intrabar import IntrabarResolver
+from backtest.trade_store import TradeWriter
+from backtest.metrics import TradeMetrics
+from backtest.report import write_report
+
+from core.news_blackout import calendar
 
-from core.news_blackout import in_news_blackout
-from core.event_logger import (
-    log_pdh_taken,
-    log_pdl_taken,
-    log_double_break,
-    log_entry,
-    log_sl,
-    log_flip
-)
 # =============================
 # BACKTEST CONFIG
 # =============================
@@ -37,6 +41,19 @@ RISK_PER_TRADE = 3000
 
 RR_TARGET = 5
 BE_RR = 4
+MAX_CANDLES = 25
+
+# ROLLING = last 24 H1 bars, CALENDAR = previous UTC day (live definition)
+LEVEL_MODE = ROLLING
+
+# closed bars are synced here when a terminal is connected
+BAR_CACHE_DIR = os.path.join(PROJECT_ROOT, "data", "bars")
+
+# re-resolve ambiguous M5 exit bars on cached M1 bars
+INTRABAR = False
+
+# one timestamped folder per CLI run (summary, equity chart, trades)
+REPORT_DIR = os.path.join(PROJECT_ROOT, "reports")
 
 
 # =============================
@@ -49,58 +66,100 @@ NY_START = time(13, 0)
 NY_END   = time(21, 0)
 
 
-def in_session(t):
-    tm = t.time()
-    return (
-        LONDON_START <= tm <= LONDON_END or
-        NY_START <= tm <= NY_END
-    )
+SESSIONS = (
+    ("LONDON", LONDON_START, LONDON_END),
+    ("NY", NY_START, NY_END),
+)
+
+
+def in_session(t, sessions=SESSIONS):
+    return get_session(t, sessions) is not None
 
-def get_session(t):
+def get_session(t, sessions=SESSIONS):
     tm = t.time()
-    if LONDON_START <= tm <= LONDON_END:
-        return "LONDON"
-    if NY_START <= tm <= NY_END:
-        return "NY"
+    for name, start, end in sessions:
+        if start <= tm <= end:
+            return name
     return None
 
 
+def _seconds(tm):
+    return tm.hour * 3600 + tm.minute * 60 + tm.second
+
+
+def session_mask(times, sessions=SESSIONS):
+    """
+    Vectorized in_session() over an int64 epoch-second array.
+    """
+    sod = times % 86400
+    mask = np.zeros(len(times), dtype=bool)
+    for _, start, end in sessions:
+        mask |= (sod >= _seconds(start)) & (sod <= _seconds(end))
+    return mask
+
+
+def bar_time(bars, i):
+    return pd.Timestamp(int(bars.time[i]), unit="s")
+
+
 
 # =============================
 # DATA LOADERS
 # =============================
+bar_cache = BarCache(BAR_CACHE_DIR)
+
+
+def terminal_connected():
+    return mt5 is not None and mt5.terminal_info() is not None
+
+
+def fetch_bars(symbol, timeframe, bars):
+    """
+    Last `bars` closed bars from the local cache.
+    New bars are appended first if a terminal is connected.
+    """
+    if terminal_connected():
+        bar_cache.sync(mt5, symbol, timeframe, bars)
+    return bar_cache.tail(symbol, timeframe, bars)
+
+
 def fetch_m5(symbol, bars):
-    rates = mt5.copy_rates_from_pos(
-        symbol,
-        mt5.TIMEFRAME_M5,
-        0,
-        bars
-    )
-    df = pd.DataFrame(rates)
-    df["time"] = pd.to_datetime(df["time"], unit="s")
-    return df
+    return fetch_bars(symbol, "M5", bars)
 
 
 def fetch_h1(symbol, bars):
-    rates = mt5.copy_rates_from_pos(
-        symbol,
-        mt5.TIMEFRAME_H1,
-        0,
-        bars
-    )
-    df = pd.DataFrame(rates)
-    df["time"] = pd.to_datetime(df["time"], unit="s")
-    return df
+    return fetch_bars(symbol, "H1", bars)
 
 
 # =============================
 # BACKTEST ENGINE
 # =============================
 class Backtester:
-    def __init__(self):
+    def __init__(
+        self,
+        rr_target=RR_TARGET,
+        be_rr=BE_RR,
+        enable_flip=ENABLE_FLIP,
+        max_candles=MAX_CANDLES,
+        sessions=SESSIONS,
+        intrabar=None,
+        trade_log=None,
+        report_dir=None,
+        news=None,
+    ):
+        self.rr_target = rr_target
+        self.be_rr = be_rr
+        self.enable_flip = enable_flip
+        self.max_candles = max_candles
+        self.sessions = sessions
+        self.intrabar = intrabar  # IntrabarResolver or None
+        self.trade_log = trade_log  # directory for the columnar trade store
+        self.report_dir = report_dir  # files written by export_results
+        self.news = news if news is not None else calendar()  # shared with the live loop
+
         self.balance = INITIAL_BALANCE
         self.equity = [INITIAL_BALANCE]
-        self.trades = []
+        self.metrics = TradeMetrics(INITIAL_BALANCE)
 
         self.entry_engine = EntryEngine(SYMBOL)
 
@@ -111,51 +170,80 @@ class Backtester:
         }
 
     # -----------------------------------------
-    def run(self):
-        m5 = fetch_m5(SYMBOL, START_BARS)
-        h1 = fetch_h1(SYMBOL, START_BARS // 12)
+    def run(self, m5=None, h1=None, report=True):
+        if m5 is None:
+            m5 = fetch_m5(SYMBOL, START_BARS)
+        if h1 is None:
+            h1 = fetch_h1(SYMBOL, START_BARS // 12)
 
-        if m5.empty or h1.empty:
+        if len(m5) == 0 or len(h1) == 0:
             print("❌ No historical data")
             return
 
-        h1.set_index("time", inplace=True)
+        if isinstance(m5, pd.DataFrame):
+            m5 = Bars.from_frame(m5)
+        if isinstance(h1, pd.DataFrame):
+            h1 = Bars.from_frame(h1)
+
+        # -------------------------------
+        # PDH / PDL for every M5 bar (one pass)
+        # -------------------------------
+        pdh_table, pdl_table = build_level_table(
+            m5.time, h1, mode=LEVEL_MODE
+        )
+        # news blackout bars are skipped before anything is simulated
+        tradable = session_mask(m5.time, self.sessions) & ~self.news.mask(SYMBOL, m5.time)
+
+        writer = (
+            TradeWriter(self.trade_log, [s[0] for s in self.sessions])
+            if self.trade_log else None
+        )
+        try:
+            self._simulate(m5, pdh_table, pdl_table, tradable, writer)
+        finally:
+            if writer:
+                writer.close()
+
+        if report:
+            self.export_results()
+
+    # -----------------------------------------
+    def _simulate(self, m5, pdh_table, pdl_table, tradable, writer):
+        high = m5.high
+        low = m5.low
 
         detector = None
         trade_taken = False
         flip_used = False
 
         for i in range(50, len(m5)):
-            candle = m5.iloc[i]
-            t = candle["time"]
-
-            if not in_session(t):
+            if not tradable[i]:
                 continue
 
-            # -------------------------------
-            # PDH / PDL from previous 24 H1 bars
-            # -------------------------------
-            h1_window = h1[h1.index < t].tail(24)
-            if len(h1_window) < 24:
-                continue
+            pdh = pdh_table[i]
+            pdl = pdl_table[i]
 
-            pdh = h1_window["high"].max()
-            pdl = h1_window["low"].min()
+            if pdh != pdh:  # NaN → not enough H1 history
+                continue
 
             # -------------------------------
             # ARM LIQUIDITY EVENT
             # -------------------------------
             if detector is None:
                 # SELL SIDE (PDH taken)
-                if candle["high"] >= pdh:
-                    detector = DoubleBreakDetector(pdh, "SELL")
+                if high[i] >= pdh:
+                    detector = DoubleBreakDetector(
+                        pdh, "SELL", self.max_candles
+                    )
                     direction = "SELL"
                     tp_level = pdl
                     flip_direction = "BUY"
 
                 # BUY SIDE (PDL taken)
-                elif candle["low"] <= pdl:
-                    detector = DoubleBreakDetector(pdl, "BUY")
+                elif low[i] <= pdl:
+                    detector = DoubleBreakDetector(
+                        pdl, "BUY", self.max_candles
+                    )
                     direction = "BUY"
                     tp_level = pdh
                     flip_direction = "SELL"
@@ -173,6 +261,7 @@ class Backtester:
                         pass
 
                     Signal.direction = direction
+                    self.entry_engine.update(m5, entry_index)
                     plan = self.entry_engine.build_trade_plan(
                         Signal(), tp_level
                     )
@@ -187,20 +276,20 @@ class Backtester:
                         m5,
                         entry_index,
                         plan,
-                        allow_flip=ENABLE_FLIP,
+                        allow_flip=self.enable_flip,
                         flip_used=flip_used,
                         flip_direction=flip_direction,
                         flip_tp=tp_level,
                     )
 
                     for trade in outcome["trades"]:
-                        self.trades.append(trade)
+                        self.balance += trade["pnl"]
+                        trade["balance"] = self.balance
+                        self.metrics.update(trade)
+                        if writer:
+                            writer.write(trade)
 
-                    self.balance += outcome["pnl"]
                     self.equity.append(self.balance)
-                    
-                    if in_news_blackout(SYMBOL, t.to_pydatetime()):
-                        continue
 
                     if direction == "SELL":
                         self.stats["sell_trades"] += 1
@@ -218,8 +307,6 @@ class Backtester:
                 trade_taken = False
                 flip_used = False
 
-        self.export_results()
-
     # -----------------------------------------
     def simulate_trade(
         self,
@@ -260,9 +347,9 @@ class Backtester:
         # -------------------------------
         # SAME SESSION CHECK
         # -------------------------------
-        primary_exit_time = m5.iloc[primary["exit_index"]]["time"]
-        primary_session = get_session(m5.iloc[entry_index]["time"])
-        exit_session = get_session(primary_exit_time)
+        primary_exit_time = bar_time(m5, primary["exit_index"])
+        primary_session = get_session(bar_time(m5, entry_index), self.sessions)
+        exit_session = get_session(primary_exit_time, self.sessions)
 
         if primary_session is None or exit_session != primary_session:
             return {
@@ -278,6 +365,7 @@ class Backtester:
             pass
 
         FlipSignal.direction = flip_direction
+        self.entry_engine.update(m5, primary["exit_index"])
         flip_plan = self.entry_engine.build_trade_plan(
             FlipSignal(), flip_tp
         )
@@ -340,153 +428,116 @@ class Backtester:
         risk = abs(entry - sl)
 
         if plan.direction == "SELL":
-            tp = entry - risk * RR_TARGET
-            be_level = entry - risk * BE_RR
+            tp = entry - risk * self.rr_target
+            be_level = entry - risk * self.be_rr
+        else:
+            tp = entry + risk * self.rr_target
+            be_level = entry + risk * self.be_rr
+
+        if self.intrabar:
+            res = self.intrabar.resolve(
+                m5, entry_index, plan.direction, entry, sl, tp, be_level
+            )
         else:
-            tp = entry + risk * RR_TARGET
-            be_level = entry + risk * BE_RR
-
-        sl_moved_to_be = False
-
-        for j in range(entry_index + 1, len(m5)):
-            row = m5.iloc[j]
-
-            # ---------------------------
-            # BE TRIGGER
-            # ---------------------------
-            if not sl_moved_to_be:
-                if (
-                    plan.direction == "SELL"
-                    and row["low"] <= be_level
-                ) or (
-                    plan.direction == "BUY"
-                    and row["high"] >= be_level
-                ):
-                    sl = entry
-                    sl_moved_to_be = True
-
-            # ---------------------------
-            # SL
-            # ---------------------------
-            if (
-                plan.direction == "SELL"
-                and row["high"] >= sl
-            ) or (
-                plan.direction == "BUY"
-                and row["low"] <= sl
-            ):
-                r = 0 if sl_moved_to_be else -1
-                return {
-                    "pnl": r * RISK_PER_TRADE,
-                    "exit_reason": "BE" if sl_moved_to_be else "SL",
-                    "exit_index": j,
-                    "record": {
-                        "direction": plan.direction,
-                        "result": "BE" if sl_moved_to_be else "SL",
-                        "R": r
-                    }
-                }
-
-            # ---------------------------
-            # TP
-            # ---------------------------
-            if (
-                plan.direction == "SELL"
-                and row["low"] <= tp
-            ) or (
-                plan.direction == "BUY"
-                and row["high"] >= tp
-            ):
-                return {
-                    "pnl": RR_TARGET * RISK_PER_TRADE,
-                    "exit_reason": "TP",
-                    "exit_index": j,
-                    "record": {
-                        "direction": plan.direction,
-                        "result": "TP",
-                        "R": RR_TARGET
-                    }
-                }
+            res = resolve_trade(
+                m5.high,
+                m5.low,
+                entry_index,
+                plan.direction,
+                entry,
+                sl,
+                tp,
+                be_level,
+            )
+
+        r = {
+            "SL": -1,
+            "BE": 0,
+            "TP": self.rr_target,
+        }.get(res.exit_reason, 0)
+
+        exit_price = {
+            "SL": sl,
+            "BE": entry,
+            "TP": tp,
+        }.get(res.exit_reason, m5.close[res.exit_index])
 
         return {
-            "pnl": 0,
-            "exit_reason": "NONE",
-            "exit_index": len(m5) - 1,
+            "pnl": r * RISK_PER_TRADE,
+            "exit_reason": res.exit_reason,
+            "exit_index": res.exit_index,
             "record": {
                 "direction": plan.direction,
-                "result": "NONE",
-                "R": 0
+                "result": res.exit_reason,
+                "R": r,
+                "pnl": r * RISK_PER_TRADE,
+                "entry_index": entry_index,
+                "exit_index": res.exit_index,
+                "entry_time": int(m5.time[entry_index]),
+                "exit_time": int(m5.time[res.exit_index]),
+                "session": get_session(bar_time(m5, entry_index), self.sessions),
+                "entry": entry,
+                "stop_loss": sl,
+                "take_profit": tp,
+                "exit_price": float(exit_price),
             }
         }
 
+    # -----------------------------------------
+    def summary(self):
+        """
+        Headline numbers for one run (used by the parameter sweep).
+        """
+        return self.metrics.summary()
+
     # -----------------------------------------
     def export_results(self):
-        df = pd.DataFrame(self.trades)
+        m = self.metrics
 
         print("\n📊 FINAL BACKTEST RESULTS")
         print(self.stats)
 
-        if df.empty:
+        if self.intrabar:
+            self.intrabar.report()
+
+        if m.all.trades == 0:
             print("❌ No trades")
             return
 
-        df.to_csv("backtest_results.csv", index=False)
-
-        winrate = (df["R"] > 0).mean()
-        expectancy = df["R"].mean()
-
-        print(f"Trades: {len(df)}")
-        print(f"Winrate: {winrate:.2%}")
-        print(f"Expectancy (R): {expectancy:.2f}")
+        print(f"Trades: {m.all.trades}")
+        print(f"Winrate: {m.all.winrate:.2%}")
+        print(f"Expectancy (R): {m.all.expectancy:.2f}")
         print(f"Final Balance: {self.balance:,.2f}")
 
-        plt.figure(figsize=(10, 5))
-        plt.plot(self.equity)
-        plt.title("Equity Curve")
-        plt.xlabel("Trades")
-        plt.ylabel("Balance")
-        plt.grid(True)
-        plt.show()
-
-
         # ---------------------------
         # FLIP-ONLY STATISTICS
         # ---------------------------
-        flips = df[df["is_flip"] == True]
-        primaries = df[df["is_flip"] == False]
-
         print("\n--- PRIMARY vs FLIP BREAKDOWN ---")
 
-        if not primaries.empty:
+        if m.primary.trades:
             print(
-                f"Primary Trades: {len(primaries)} | "
-                f"Winrate: {(primaries['R'] > 0).mean():.2%} | "
-                f"Expectancy: {primaries['R'].mean():.2f}R"
+                f"Primary Trades: {m.primary.trades} | "
+                f"Winrate: {m.primary.winrate:.2%} | "
+                f"Expectancy: {m.primary.expectancy:.2f}R"
             )
 
-        if not flips.empty:
+        if m.flip.trades:
             print(
-                f"Flip Trades: {len(flips)} | "
-                f"Winrate: {(flips['R'] > 0).mean():.2%} | "
-                f"Expectancy: {flips['R'].mean():.2f}R"
+                f"Flip Trades: {m.flip.trades} | "
+                f"Winrate: {m.flip.winrate:.2%} | "
+                f"Expectancy: {m.flip.expectancy:.2f}R"
             )
 
-
         # ---------------------------
         # FLIP DRAWDOWN CONTRIBUTION
         # ---------------------------
-        df["equity_step"] = df["R"] * RISK_PER_TRADE
-        df["equity_curve"] = INITIAL_BALANCE + df["equity_step"].cumsum()
-
-        df["peak"] = df["equity_curve"].cummax()
-        df["drawdown"] = df["equity_curve"] - df["peak"]
-
-        flip_dd = df[df["is_flip"] == True]["drawdown"].min()
-        primary_dd = df[df["is_flip"] == False]["drawdown"].min()
-
         print("\n--- DRAWDOWN CONTRIBUTION ---")
-        print(f"Primary Max Drawdown: {primary_dd:,.2f}")
-        print(f"Flip Max Drawdown: {flip_dd:,.2f}")
+        print(f"Primary Max Drawdown: {m.primary.max_drawdown:,.2f}")
+        print(f"Flip Max Drawdown: {m.flip.max_drawdown:,.2f}")
+
+        if self.report_dir:
+            for path in write_report(m, self.equity, self.report_dir, self.trade_log):
+                print(f"💾 {path}")
 
 
 
@@ -494,6 +545,18 @@ class Backtester:
 # RUN
 # =============================
 if __name__ == "__main__":
-    connect(SYMBOL)
-    bt = Backtester()
+    if mt5 is not None:
+        from core.mt5_connector import connect
+        connect(SYMBOL)
+
+    out = os.path.join(REPORT_DIR, datetime.now().strftime("%Y%m%d_%H%M%S"))
+
+    bt = Backtester(
+        intrabar=(
+            IntrabarResolver(bar_cache, SYMBOL, mt5 if terminal_connected() else None)
+            if INTRABAR else None
+        ),
+        trade_log=os.path.join(out, "trades"),
+        report_dir=out,
+    )
     bt.run()
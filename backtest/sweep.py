@@ -0,0 +1,140 @@
+# backtest/sweep.py
+
+import sys
+import os
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+import pandas as pd
+from datetime import time
+
+from core.bars import Bars, SharedBars
+from backtest.run_backtest import (
+    Backtester,
+    fetch_m5,
+    fetch_h1,
+    START_BARS,
+    SESSIONS,
+)
+
+
+# =============================
+# WORKER STATE
+# =============================
+# attached once per worker process by _init_worker
+_SHARED = []
+_M5 = None
+_H1 = None
+
+
+def _init_worker(m5_handle, h1_handle):
+    global _M5, _H1
+
+    m5 = SharedBars.attach(m5_handle)
+    h1 = SharedBars.attach(h1_handle)
+    _SHARED.extend([m5, h1])  # keep the mappings alive
+
+    _M5 = m5.bars
+    _H1 = h1.bars
+
+
+def _run_combo(params):
+    bt = Backtester(**params)
+    bt.run(_M5, _H1, report=False)
+    return {**params, **bt.summary()}
+
+
+# =============================
+# GRID
+# =============================
+def expand_grid(grid: dict) -> list[dict]:
+    """
+    {"rr_target": [3, 5], "be_rr": [2, 4]} → 4 parameter dicts.
+    Keys are Backtester keyword arguments.
+    """
+    keys = list(grid)
+    return [
+        dict(zip(keys, values))
+        for values in itertools.product(*(grid[k] for k in keys))
+    ]
+
+
+def format_sessions(sessions) -> str:
+    return " | ".join(
+        f"{name} {start:%H:%M}-{end:%H:%M}"
+        for name, start, end in sessions
+    )
+
+
+# =============================
+# SWEEP
+# =============================
+def run_sweep(
+    grid: dict, m5: Bars, h1: Bars, processes=None, trades_dir=None
+) -> pd.DataFrame:
+    """
+    Runs one Backtester per grid combination on a process pool.
+
+    M5 / H1 bars are placed in shared memory once; workers attach
+    to them instead of receiving a pickled copy per task.
+    Returns one row per combination with winrate, expectancy and
+    max drawdown. With `trades_dir`, every combination streams its
+    trades to its own store there (path in the trade_log column).
+    """
+    combos = expand_grid(grid)
+
+    if trades_dir:
+        combos = [
+            {**params, "trade_log": os.path.join(trades_dir, f"combo_{k:04d}")}
+            for k, params in enumerate(combos)
+        ]
+
+    m5_shared = SharedBars.create(m5)
+    h1_shared = SharedBars.create(h1)
+
+    try:
+        with ProcessPoolExecutor(
+            max_workers=processes,
+            initializer=_init_worker,
+            initargs=(m5_shared.handle, h1_shared.handle),
+        ) as pool:
+            rows = list(pool.map(_run_combo, combos, chunksize=1))
+    finally:
+        m5_shared.close()
+        h1_shared.close()
+
+    table = pd.DataFrame(rows)
+    if "sessions" in table.columns:
+        table["sessions"] = table["sessions"].map(format_sessions)
+
+    return table.sort_values("expectancy", ascending=False, ignore_index=True)
+
+
+# =============================
+# RUN
+# =============================
+if __name__ == "__main__":
+    from config.settings import SYMBOL
+
+    m5 = fetch_m5(SYMBOL, START_BARS)
+    h1 = fetch_h1(SYMBOL, START_BARS // 12)
+
+    grid = {
+        "rr_target": [3, 4, 5, 6],
+        "be_rr": [2, 3, 4],
+        "enable_flip": [True, False],
+        "max_candles": [15, 25, 40],
+        "sessions": [
+            SESSIONS,
+            (("LONDON", time(7, 0), time(11, 0)), ("NY", time(13, 0), time(17, 0))),
+        ],
+    }
+
+    results = run_sweep(grid, m5, h1)
+    results.to_csv("sweep_results.csv", index=False)
+
+    print("\n📊 PARAMETER SWEEP")
+    print(results.head(20).to_string(index=False))
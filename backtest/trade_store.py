@@ -0,0 +1,149 @@
+# backtest/trade_store.py
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from core.column_store import ColumnStore
+
+
+# string fields are stored as small integer codes
+DIRECTIONS = ("SELL", "BUY")
+RESULTS = ("SL", "BE", "TP", "NONE")
+
+TRADE_SCHEMA = {
+    "entry_time": np.int64,     # key column (epoch seconds)
+    "exit_time": np.int64,
+    "entry_index": np.int64,
+    "exit_index": np.int64,
+    "direction": np.int8,
+    "result": np.int8,
+    "session": np.int8,         # -1 = outside every session
+    "is_flip": np.bool_,
+    "entry": np.float64,
+    "stop_loss": np.float64,
+    "take_profit": np.float64,
+    "exit_price": np.float64,
+    "R": np.float64,
+    "pnl": np.float64,
+    "balance": np.float64,
+}
+
+BATCH_SIZE = 4096
+LABELS_FILE = "labels.json"
+
+
+class TradeWriter:
+    """
+    Streams backtest trade records into a ColumnStore under
+    `directory`, flushing every `batch_size` trades.
+
+    Records are the dicts built by Backtester.manage_trade. Session
+    names are encoded by position in `sessions`; the names are saved
+    next to the columns so read_trades() can decode them.
+    """
+
+    def __init__(self, directory: str, sessions=(), batch_size=BATCH_SIZE):
+        self.store = ColumnStore(directory, TRADE_SCHEMA)
+        self.sessions = list(sessions)
+        self.batch_size = batch_size
+
+        self._buffer = {
+            name: np.empty(batch_size, dtype=dtype)
+            for name, dtype in self.store.schema.items()
+        }
+        self._n = 0
+        self.written = 0
+
+        self._save_labels(directory)
+
+    def _save_labels(self, directory):
+        path = os.path.join(directory, LABELS_FILE)
+        labels = {"session": self.sessions}
+
+        if os.path.exists(path):
+            with open(path) as f:
+                saved = json.load(f)
+            if saved["session"] != self.sessions:
+                raise ValueError(
+                    f"{directory} holds trades for sessions {saved['session']}"
+                )
+            return
+
+        with open(path, "w") as f:
+            json.dump(labels, f)
+
+    # -------------------------------------------------
+    def write(self, record: dict):
+        buf = self._buffer
+        n = self._n
+        session = record.get("session")
+
+        buf["entry_time"][n] = record["entry_time"]
+        buf["exit_time"][n] = record["exit_time"]
+        buf["entry_index"][n] = record["entry_index"]
+        buf["exit_index"][n] = record["exit_index"]
+        buf["direction"][n] = DIRECTIONS.index(record["direction"])
+        buf["result"][n] = RESULTS.index(record["result"])
+        buf["session"][n] = self.sessions.index(session) if session is not None else -1
+        buf["is_flip"][n] = record["is_flip"]
+        buf["entry"][n] = record["entry"]
+        buf["stop_loss"][n] = record["stop_loss"]
+        buf["take_profit"][n] = record["take_profit"]
+        buf["exit_price"][n] = record["exit_price"]
+        buf["R"][n] = record["R"]
+        buf["pnl"][n] = record["pnl"]
+        buf["balance"][n] = record["balance"]
+
+        self._n += 1
+        if self._n == self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self._n == 0:
+            return
+        self.store.append({
+            name: column[:self._n] for name, column in self._buffer.items()
+        })
+        self.written += self._n
+        self._n = 0
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# =============================
+# READING
+# =============================
+def read_trades(directory: str) -> dict:
+    """
+    Memory-mapped columns of a trade store (raw codes, zero copy).
+    """
+    return ColumnStore(directory, TRADE_SCHEMA).read()
+
+
+def trades_frame(directory: str) -> pd.DataFrame:
+    """
+    Decoded DataFrame: UTC times and categorical direction /
+    result / session.
+    """
+    cols = read_trades(directory)
+
+    with open(os.path.join(directory, LABELS_FILE)) as f:
+        sessions = json.load(f)["session"]
+
+    df = pd.DataFrame({name: np.asarray(col) for name, col in cols.items()})
+    df["entry_time"] = pd.to_datetime(df["entry_time"], unit="s", utc=True)
+    df["exit_time"] = pd.to_datetime(df["exit_time"], unit="s", utc=True)
+    df["direction"] = pd.Categorical.from_codes(df["direction"], DIRECTIONS)
+    df["result"] = pd.Categorical.from_codes(df["result"], RESULTS)
+    df["session"] = pd.Categorical.from_codes(df["session"], sessions)
+    return df
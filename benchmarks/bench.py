@@ -0,0 +1,224 @@
+# benchmarks/bench.py
+#
+#   python -m benchmarks.bench run --bars 100000 --save
+#   python -m benchmarks.bench compare --bars 100000 --threshold 0.15
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from benchmarks.synthetic import generate_market
+from core.double_break_detector import DoubleBreakDetector
+from core.entry_engine import EntryEngine
+from core.levels import build_level_table
+from backtest.resolver import resolve_batch
+
+
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), "baselines.json")
+DEFAULT_THRESHOLD = 0.15
+
+
+# =============================
+# BENCHMARKS
+# =============================
+# each takes (m5, h1) and returns the number of items processed
+
+def bench_levels(m5, h1):
+    build_level_table(m5.time, h1)
+    return len(m5)
+
+
+def bench_detector(m5, h1):
+    detector = DoubleBreakDetector(0.0, "SELL", max_candles=len(m5))
+    for i in range(len(m5)):
+        detector.update(m5, i)
+        if detector.completed:
+            direction = "BUY" if detector.direction == "SELL" else "SELL"
+            detector = DoubleBreakDetector(0.0, direction, max_candles=len(m5))
+    return len(m5)
+
+
+def bench_entry_engine(m5, h1, window=300, step=50):
+    class Signal:
+        direction = "SELL"
+
+    engine = EntryEngine("BENCH")
+    calls = 0
+
+    for end in range(window, len(m5), step):
+        engine.update(m5, end - 1)
+        engine.build_trade_plan(Signal(), m5.low[end - 1] - 0.01)
+        calls += 1
+
+    return calls
+
+
+def bench_resolver(m5, h1, plans=2000):
+    rng = np.random.default_rng(0)
+    idx = rng.integers(0, len(m5) - 1, plans)
+    sell = rng.random(plans) < 0.5
+    risk = rng.uniform(0.0005, 0.002, plans)
+    sign = np.where(sell, -1.0, 1.0)
+    entry = np.where(sell, m5.low[idx], m5.high[idx])
+
+    resolve_batch(
+        m5.high, m5.low, idx,
+        np.where(sell, "SELL", "BUY"),
+        entry, entry - sign * risk, entry + sign * risk * 5, entry + sign * risk * 4,
+    )
+    return plans
+
+
+def bench_backtester(m5, h1):
+    from backtest.run_backtest import Backtester
+
+    Backtester().run(m5, h1, report=False)
+    return len(m5)
+
+
+BENCHMARKS = {
+    "levels": (bench_levels, "bars"),
+    "detector": (bench_detector, "bars"),
+    "entry_engine": (bench_entry_engine, "plans"),
+    "resolver": (bench_resolver, "plans"),
+    "backtester": (bench_backtester, "bars"),
+}
+
+
+# =============================
+# RUNNER
+# =============================
+def measure(fn, m5, h1, repeat=3):
+    """
+    Best of `repeat` timed passes, then one traced pass for peak
+    memory (tracemalloc would distort the timing).
+    """
+    seconds = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        items = fn(m5, h1)
+        seconds = min(seconds, time.perf_counter() - started)
+
+    tracemalloc.start()
+    fn(m5, h1)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "items": items,
+        "seconds": seconds,
+        "per_sec": items / seconds if seconds > 0 else float("inf"),
+        "peak_mb": peak / 1e6,
+    }
+
+
+def run_all(bars: int, seed: int, only=None, repeat=3) -> dict:
+    m5, h1 = generate_market(bars, seed)
+
+    results = {}
+    for name, (fn, unit) in BENCHMARKS.items():
+        if only and name not in only:
+            continue
+        result = measure(fn, m5, h1, repeat)
+        result["unit"] = unit
+        result["bars"] = bars
+        results[name] = result
+
+    return results
+
+
+def print_results(results: dict):
+    print(f"\n{'benchmark':<14}{'throughput':>22}{'seconds':>10}{'peak MB':>10}")
+    for name, r in results.items():
+        rate = f"{r['per_sec']:,.0f} {r['unit']}/s"
+        print(f"{name:<14}{rate:>22}{r['seconds']:>10.3f}{r['peak_mb']:>10.1f}")
+
+
+# =============================
+# BASELINES
+# =============================
+def load_baselines(path=BASELINE_FILE) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baselines(results: dict, path=BASELINE_FILE):
+    baselines = load_baselines(path)
+    baselines.update(results)
+    with open(path, "w") as f:
+        json.dump(baselines, f, indent=2)
+
+
+def compare(results: dict, baselines: dict, threshold: float) -> list[str]:
+    """
+    Returns one message per regression: throughput down or peak
+    memory up by more than `threshold` (fraction) vs the baseline.
+    """
+    regressions = []
+
+    for name, r in results.items():
+        base = baselines.get(name)
+        if base is None or base.get("bars") != r["bars"]:
+            continue
+
+        if r["per_sec"] < base["per_sec"] * (1 - threshold):
+            regressions.append(
+                f"{name}: throughput {r['per_sec']:,.0f} < "
+                f"baseline {base['per_sec']:,.0f} {r['unit']}/s"
+            )
+
+        if r["peak_mb"] > base["peak_mb"] * (1 + threshold) + 0.1:
+            regressions.append(
+                f"{name}: peak memory {r['peak_mb']:.1f} MB > "
+                f"baseline {base['peak_mb']:.1f} MB"
+            )
+
+    return regressions
+
+
+# =============================
+# CLI
+# =============================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="DoubleBBot hot-path benchmarks")
+    parser.add_argument("command", choices=["run", "compare"])
+    parser.add_argument("--bars", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--only", nargs="*", choices=list(BENCHMARKS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--save", action="store_true", help="store results as baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--baselines", default=BASELINE_FILE)
+    args = parser.parse_args(argv)
+
+    results = run_all(args.bars, args.seed, args.only, args.repeat)
+    print_results(results)
+
+    if args.save:
+        save_baselines(results, args.baselines)
+        print(f"\n💾 Baseline saved → {args.baselines}")
+
+    if args.command == "compare":
+        regressions = compare(results, load_baselines(args.baselines), args.threshold)
+        if regressions:
+            print("\n❌ REGRESSIONS")
+            for msg in regressions:
+                print(f" - {msg}")
+            return 1
+        print("\n✅ No regressions")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+# benchmarks/synthetic.py
+
+import numpy as np
+
+from core.bars import Bars
+
+
+BARS_PER_DAY = 288          # M5
+BARS_PER_HOUR = 12
+START_TIME = 1704672000     # 2024-01-08 00:00 UTC (Monday)
+
+VOL = 0.0002                # base M5 close-to-close noise
+UNIT = 0.0005               # pattern step
+WICK = 0.0001
+
+# London open window where the daily sweep is placed (bar of day)
+EVENT_FIRST = 7 * BARS_PER_HOUR + 6
+EVENT_LAST = 10 * BARS_PER_HOUR
+
+RAMP_BARS = 6
+
+# SELL structure after the PDH sweep, relative to the sweep peak:
+# (close, upper wick, lower wick) in UNITs. Two swing lows, each
+# broken by a close below it, with no higher high in between.
+# BUY is the mirror image.
+PATTERN = np.array([
+    (-1.0, 0.1, 0.1),
+    (-2.0, 0.0, 0.2),   # swing low A
+    (-1.5, 0.1, 0.1),   # pullback confirms A
+    (-3.0, 0.0, 0.1),   # break ①
+    (-3.6, 0.0, 0.2),   # swing low B
+    (-3.2, 0.1, 0.1),   # pullback confirms B
+    (-4.5, 0.0, 0.1),   # break ② → entry
+    (-5.0, 0.0, 0.1),
+    (-5.5, 0.0, 0.1),
+])
+
+
+def generate_market(n_bars: int, seed: int = 0):
+    """
+    Deterministic M5 market with one PDH or PDL sweep per day
+    (from day 2 on), each followed by a double-break structure.
+
+    Returns (m5, h1) Bars. Same seed + size → identical arrays.
+    """
+    rng = np.random.default_rng(seed)
+
+    inc = rng.normal(0.0, VOL, n_bars)
+    up_wick = rng.random(n_bars) * WICK
+    dn_wick = rng.random(n_bars) * WICK
+    sides = rng.random(n_bars // BARS_PER_DAY + 1) < 0.5
+    starts = rng.integers(EVENT_FIRST, EVENT_LAST, n_bars // BARS_PER_DAY + 1)
+
+    close = np.empty(n_bars)
+    high = np.empty(n_bars)
+    low = np.empty(n_bars)
+    opens = np.empty(n_bars)
+
+    last_close = 1.1000
+    span = RAMP_BARS + len(PATTERN)
+
+    for day, s in enumerate(range(0, n_bars, BARS_PER_DAY)):
+        e = min(s + BARS_PER_DAY, n_bars)
+        c = last_close + np.cumsum(inc[s:e])
+        uw = up_wick[s:e].copy()
+        dw = dn_wick[s:e].copy()
+
+        k = int(starts[day])
+        if day > 0 and k + span < e - s:
+            hist = slice(max(0, s - BARS_PER_DAY), s)
+            sell = bool(sides[day])
+            sign = 1.0 if sell else -1.0
+
+            # sweep target just beyond the last day's extreme
+            if sell:
+                target = max(high[hist].max(), c[:k].max() + WICK) + 0.5 * UNIT
+            else:
+                target = min(low[hist].min(), c[:k].min() - WICK) - 0.5 * UNIT
+
+            before = c[k - 1]
+            c[k:k + RAMP_BARS] = np.linspace(before, target, RAMP_BARS + 1)[1:]
+            uw[k:k + RAMP_BARS] = 0.1 * UNIT
+            dw[k:k + RAMP_BARS] = 0.1 * UNIT
+
+            p = k + RAMP_BARS
+            c[p:p + len(PATTERN)] = target + sign * PATTERN[:, 0] * UNIT
+            wick_a = PATTERN[:, 1] * UNIT
+            wick_b = PATTERN[:, 2] * UNIT
+            uw[p:p + len(PATTERN)] = wick_a if sell else wick_b
+            dw[p:p + len(PATTERN)] = wick_b if sell else wick_a
+
+            # rest of the day continues from the pattern end
+            tail = p + len(PATTERN)
+            c[tail:] = c[tail - 1] + np.cumsum(inc[s + tail:e])
+
+        o = np.r_[last_close, c[:-1]]
+        opens[s:e] = o
+        close[s:e] = c
+        high[s:e] = np.maximum(o, c) + uw
+        low[s:e] = np.minimum(o, c) - dw
+        last_close = c[-1]
+
+    times = START_TIME + np.arange(n_bars, dtype=np.int64) * 300
+    m5 = Bars(times, opens, high, low, close)
+    return m5, resample_h1(m5)
+
+
+def resample_h1(m5: Bars) -> Bars:
+    """
+    H1 bars from complete groups of 12 M5 bars.
+    """
+    n = len(m5) // BARS_PER_HOUR * BARS_PER_HOUR
+
+    def grid(a):
+        return a[:n].reshape(-1, BARS_PER_HOUR)
+
+    return Bars(
+        grid(m5.time)[:, 0],
+        grid(m5.open)[:, 0],
+        grid(m5.high).max(axis=1),
+        grid(m5.low).min(axis=1),
+        grid(m5.close)[:, -1],
+    )
@@ -1,8 +1,20 @@
-# core/news_blackout.py
-
-def in_news_blackout():
-    """
-    Return True if high-impact news is active.
-    Stubbed for now — will be replaced with real feed.
-    """
-    return False
+# config/news_blackout.py
+
+import os
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# =========================
+# NEWS BLACKOUT
+# =========================
+# local calendar, one event per line: time,currency,impact[,title]
+# (time in UTC, ISO or epoch seconds; only HIGH impact is used)
+NEWS_CALENDAR_FILE = os.path.join(PROJECT_ROOT, "data", "news_calendar.csv")
+
+BLACKOUT_MINUTES = 15   # each side of the release
+
+# extra events on top of the file: (currency, UTC datetime)
+HIGH_IMPACT_EVENTS = [
+    # Example:
+    # ("USD", datetime(2024, 6, 14, 12, 30)),  # CPI
+]
@@ -1,15 +1,19 @@
 # config/settings.py
 
-import MetaTrader5 as mt5
 from datetime import time
 
+try:
+    import MetaTrader5 as mt5
+except ImportError:  # offline backtests / Linux CI
+    mt5 = None
+
 # =========================
 # SYMBOL & TIMEFRAMES
 # =========================
 SYMBOL = "EURUSDm"
 
-HTF = mt5.TIMEFRAME_H1
-LTF = mt5.TIMEFRAME_M5
+HTF = mt5.TIMEFRAME_H1 if mt5 else 16385  # TIMEFRAME_H1
+LTF = mt5.TIMEFRAME_M5 if mt5 else 5      # TIMEFRAME_M5
 
 # =========================
 # RISK MANAGEMENT
@@ -36,6 +40,20 @@ SLIPPAGE = 5
 PRIMARY_MAGIC = 91001
 FLIP_MAGIC = 91002
 
+# =========================
+# TERMINAL CALLS (core/mt5_api)
+# =========================
+MT5_RETRIES = 2            # extra attempts for reads failing with an IPC error
+MT5_RETRY_DELAY = 0.05     # seconds, times the attempt number
+
+# per bar-close cycle (closes + monitoring until the next close),
+# all symbols; "*" = every call. Going over only warns.
+MT5_CALL_BUDGET = {
+    "*": 200,
+    "copy_rates_from_pos": 20,
+    "order_send": 10,
+}
+
 # =========================
 # SAFETY
 # =========================
@@ -0,0 +1,11 @@
+# config/symbols.py
+
+from config.settings import SYMBOL
+
+# =========================
+# LIVE WATCHLIST
+# =========================
+# one engine process trades all of these on one terminal connection
+SYMBOLS = [
+    SYMBOL,
+]
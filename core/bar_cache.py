@@ -0,0 +1,154 @@
+# core/bar_cache.py
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from core.bars import Bars
+from core.column_store import ColumnStore
+
+
+TIMEFRAMES = {
+    "M1": 60,
+    "M5": 300,
+    "H1": 3600,
+}
+
+SCHEMA = {
+    "time": np.int64,
+    "open": np.float64,
+    "high": np.float64,
+    "low": np.float64,
+    "close": np.float64,
+    "tick_volume": np.int64,
+}
+
+
+class BarCache:
+    """
+    Local on-disk bar history keyed by symbol and timeframe:
+
+        <root>/<symbol>/<timeframe>/<column>.bin
+
+    Only CLOSED bars are stored. Reads are memory-mapped slices,
+    so loading any date range does not copy the history.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self._stores = {}
+
+    # -------------------------------------------------
+    def store(self, symbol: str, timeframe: str) -> ColumnStore:
+        key = (symbol, timeframe)
+        if key not in self._stores:
+            self._stores[key] = ColumnStore(
+                os.path.join(self.root, symbol, timeframe), SCHEMA
+            )
+        return self._stores[key]
+
+    def last_time(self, symbol: str, timeframe: str):
+        store = self.store(symbol, timeframe)
+        rows = len(store)
+        if rows == 0:
+            return None
+        return int(store.column("time", rows)[-1])
+
+    # -------------------------------------------------
+    def append(self, symbol: str, timeframe: str, rates) -> int:
+        """
+        Appends bars newer than the last cached one.
+        `rates` is a structured array as returned by mt5.copy_rates_*.
+        Returns the number of bars written.
+        """
+        if rates is None or len(rates) == 0:
+            return 0
+
+        times = np.asarray(rates["time"], dtype=np.int64)
+        last = self.last_time(symbol, timeframe)
+        if last is not None:
+            new = times > last
+            rates = rates[new]
+            times = times[new]
+
+        if len(rates) == 0:
+            return 0
+
+        names = rates.dtype.names
+        self.store(symbol, timeframe).append({
+            "time": times,
+            "open": rates["open"],
+            "high": rates["high"],
+            "low": rates["low"],
+            "close": rates["close"],
+            "tick_volume": (
+                rates["tick_volume"] if "tick_volume" in names
+                else np.zeros(len(rates), dtype=np.int64)
+            ),
+        })
+        return len(rates)
+
+    # -------------------------------------------------
+    def sync(self, mt5, symbol: str, timeframe: str, bars: int) -> int:
+        """
+        Pulls closed bars from a connected terminal into the cache.
+
+        Empty cache → last `bars` closed bars.
+        Otherwise only bars newer than the cached tail are fetched
+        (request size grows until it overlaps the cache).
+        """
+        tf = getattr(mt5, f"TIMEFRAME_{timeframe}")
+        last = self.last_time(symbol, timeframe)
+
+        # position 0 is the forming bar → start at 1
+        if last is None:
+            return self.append(
+                symbol, timeframe, mt5.copy_rates_from_pos(symbol, tf, 1, bars)
+            )
+
+        count = 256
+        while True:
+            rates = mt5.copy_rates_from_pos(symbol, tf, 1, count)
+            if rates is None or len(rates) == 0:
+                return 0
+            if rates["time"][0] <= last or len(rates) < count:
+                return self.append(symbol, timeframe, rates)
+            count *= 4
+
+    # -------------------------------------------------
+    def load(self, symbol: str, timeframe: str, start=None, end=None) -> Bars:
+        """
+        Zero-copy Bars view of cached bars with start <= time < end.
+        `start` / `end` may be datetimes or epoch seconds.
+        """
+        columns = self.store(symbol, timeframe).read()
+        times = columns["time"]
+
+        lo = 0 if start is None else int(
+            np.searchsorted(times, _epoch(start), side="left")
+        )
+        hi = len(times) if end is None else int(
+            np.searchsorted(times, _epoch(end), side="left")
+        )
+
+        return Bars(
+            times[lo:hi],
+            columns["open"][lo:hi],
+            columns["high"][lo:hi],
+            columns["low"][lo:hi],
+            columns["close"][lo:hi],
+        )
+
+    def tail(self, symbol: str, timeframe: str, bars: int) -> Bars:
+        """
+        Last `bars` cached bars (zero copy).
+        """
+        full = self.load(symbol, timeframe)
+        return full.slice(max(0, len(full) - bars), len(full))
+
+
+def _epoch(value) -> int:
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    return int(pd.Timestamp(value).timestamp())
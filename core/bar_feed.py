@@ -0,0 +1,152 @@
+# core/bar_feed.py
+
+import numpy as np
+
+from core.bars import Bars
+
+
+FIELDS = ("time", "open", "high", "low", "close")
+
+
+class BarRing:
+    """
+    Fixed-size ring of the last `capacity` closed bars plus the
+    forming bar, one NumPy array per field.
+
+    Every slot is written twice (at s and s + slots), so the newest
+    bars are always one contiguous slice: windows are views, never
+    copies, and appending never shifts data.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.slots = capacity + 1  # + forming bar
+
+        self.time = np.zeros(2 * self.slots, dtype=np.int64)
+        self.open = np.zeros(2 * self.slots)
+        self.high = np.zeros(2 * self.slots)
+        self.low = np.zeros(2 * self.slots)
+        self.close = np.zeros(2 * self.slots)
+
+        self.count = 0           # closed bars written so far
+        self.has_forming = False
+        self._views = {}
+
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+
+    @property
+    def last_time(self):
+        if self.count == 0:
+            return None
+        return int(self.time[(self.count - 1) % self.slots])
+
+    # -------------------------------------------------
+    def extend(self, rates):
+        """
+        Appends closed bars (structured array, oldest first).
+        """
+        rates = rates[-self.capacity:]
+        n = len(rates)
+        if n == 0:
+            return
+
+        pos = (self.count + np.arange(n)) % self.slots
+        for name in FIELDS:
+            arr = getattr(self, name)
+            arr[pos] = rates[name]
+            arr[pos + self.slots] = rates[name]
+
+        self.count += n
+        self.has_forming = False
+        self._views.clear()
+
+    def set_forming(self, rate):
+        s = self.count % self.slots
+        if self.has_forming and all(
+            getattr(self, name)[s] == rate[name] for name in FIELDS
+        ):
+            return
+
+        for name in FIELDS:
+            arr = getattr(self, name)
+            arr[s] = arr[s + self.slots] = rate[name]
+
+        self.has_forming = True
+        self._views.pop(True, None)
+
+    # -------------------------------------------------
+    def window(self, forming: bool = False) -> Bars:
+        """
+        Closed bars, oldest first (plus the forming bar as the last
+        row when `forming`). Cached until the ring changes.
+        """
+        forming = forming and self.has_forming
+        view = self._views.get(forming)
+        if view is None:
+            n = len(self)
+            start = (self.count - n) % self.slots
+            end = start + n + forming
+            view = Bars(
+                self.time[start:end],
+                self.open[start:end],
+                self.high[start:end],
+                self.low[start:end],
+                self.close[start:end],
+            )
+            self._views[forming] = view
+        return view
+
+
+class BarFeed:
+    """
+    Incremental bar source for the live loop.
+
+    subscribe() fills one BarRing per (symbol, timeframe); poll()
+    then asks the terminal for the forming bar and the last two
+    closed ones: the older one is already held after a single close,
+    so the usual close costs one call. The request widens only when
+    more bars were missed.
+    """
+
+    def __init__(self, mt5):
+        self.mt5 = mt5
+        self.rings = {}
+
+    # -------------------------------------------------
+    def subscribe(self, symbol: str, timeframe: int, capacity: int) -> BarRing:
+        key = (symbol, timeframe)
+        if key not in self.rings:
+            self.rings[key] = BarRing(capacity)
+            self.poll(symbol, timeframe)
+        return self.rings[key]
+
+    def poll(self, symbol: str, timeframe: int) -> int:
+        """
+        Pulls new bars. Returns the number of newly closed bars.
+        """
+        ring = self.rings[(symbol, timeframe)]
+        last = ring.last_time
+        limit = ring.capacity + 1
+        count = min(3, limit) if last is not None else limit
+
+        while True:
+            rates = self.mt5.copy_rates_from_pos(symbol, timeframe, 0, count)
+            if rates is None or len(rates) == 0:
+                return 0
+            # oldest returned bar already held (or nothing more to ask)
+            if last is None or rates["time"][0] <= last or count >= limit:
+                break
+            count = min(count * 4, limit)
+
+        closed = rates[:-1]
+        if last is not None:
+            closed = closed[closed["time"] > last]
+
+        ring.extend(closed)
+        ring.set_forming(rates[-1])
+        return len(closed)
+
+    # -------------------------------------------------
+    def bars(self, symbol: str, timeframe: int, forming: bool = False) -> Bars:
+        return self.rings[(symbol, timeframe)].window(forming)
@@ -0,0 +1,188 @@
+# core/bars.py
+
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from core.swings import SwingIndex
+
+
+# =============================
+# TIME HELPERS
+# =============================
+def epoch_seconds(times) -> np.ndarray:
+    """
+    Converts datetimes (naive = UTC, or tz-aware) / epoch ints
+    to an int64 array of epoch seconds.
+    """
+    if isinstance(times, (pd.Series, pd.Index)) and times.dtype.kind == "M":
+        idx = pd.DatetimeIndex(times)
+        if idx.tz is not None:
+            idx = idx.tz_convert("UTC").tz_localize(None)
+        return idx.to_numpy().astype("datetime64[s]").astype(np.int64)
+
+    arr = np.asarray(times)
+    if arr.dtype.kind == "M":
+        return arr.astype("datetime64[s]").astype(np.int64)
+    return arr.astype(np.int64)
+
+
+# =============================
+# BAR STORE
+# =============================
+class Bars:
+    """
+    Column-oriented OHLC store.
+
+    Contiguous float64 arrays for open / high / low / close and
+    int64 epoch-second times, read directly by position:
+
+        bars.high[i], bars.close[i - 1]
+    """
+
+    __slots__ = ("time", "open", "high", "low", "close", "_swings")
+
+    def __init__(self, time, open, high, low, close):
+        self.time = np.ascontiguousarray(time, dtype=np.int64)
+        self.open = np.ascontiguousarray(open, dtype=np.float64)
+        self.high = np.ascontiguousarray(high, dtype=np.float64)
+        self.low = np.ascontiguousarray(low, dtype=np.float64)
+        self.close = np.ascontiguousarray(close, dtype=np.float64)
+        self._swings = {}
+
+    # -------------------------------------------------
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "Bars":
+        if "time" in df.columns:
+            times = epoch_seconds(df["time"])
+        elif df.index.dtype.kind == "M":
+            times = epoch_seconds(df.index)
+        else:
+            times = np.zeros(len(df), dtype=np.int64)
+
+        return cls(
+            times,
+            df["open"].to_numpy(dtype=np.float64),
+            df["high"].to_numpy(dtype=np.float64),
+            df["low"].to_numpy(dtype=np.float64),
+            df["close"].to_numpy(dtype=np.float64),
+        )
+
+    @classmethod
+    def from_rates(cls, rates) -> "Bars":
+        """
+        Builds from the structured array returned by
+        mt5.copy_rates_* (no DataFrame round trip).
+        """
+        return cls(
+            rates["time"],
+            rates["open"],
+            rates["high"],
+            rates["low"],
+            rates["close"],
+        )
+
+    # -------------------------------------------------
+    def __len__(self) -> int:
+        return len(self.close)
+
+    def swings(self, order: int = 1):
+        """
+        Shared SwingIndex for these bars (built once per order).
+        """
+        if order not in self._swings:
+            self._swings[order] = SwingIndex(self.high, self.low, order)
+        return self._swings[order]
+
+    def slice(self, start: int, end: int) -> "Bars":
+        """
+        View of bars [start, end) — no copy.
+        """
+        return Bars(
+            self.time[start:end],
+            self.open[start:end],
+            self.high[start:end],
+            self.low[start:end],
+            self.close[start:end],
+        )
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({
+            "time": pd.to_datetime(self.time, unit="s"),
+            "open": self.open,
+            "high": self.high,
+            "low": self.low,
+            "close": self.close,
+        })
+
+
+def column(data, name: str) -> np.ndarray:
+    """
+    Positional column access for either a Bars store or a DataFrame.
+    """
+    if isinstance(data, Bars):
+        return getattr(data, name)
+    if name == "time":
+        return epoch_seconds(data["time"])
+    return data[name].to_numpy()
+
+
+# =============================
+# SHARED MEMORY
+# =============================
+class SharedBars:
+    """
+    Bars copied once into a shared-memory block so worker processes
+    can attach to the same arrays without a per-worker copy.
+
+        shared = SharedBars.create(bars)         # parent
+        view = SharedBars.attach(shared.handle)  # worker
+        view.bars.high[i]
+    """
+
+    FIELDS = ("time", "open", "high", "low", "close")
+
+    def __init__(self, shm, length: int, owner: bool):
+        self._shm = shm
+        self._owner = owner
+        self.length = length
+
+        width = length * 8
+        arrays = []
+        for k, field in enumerate(self.FIELDS):
+            dtype = np.int64 if field == "time" else np.float64
+            arrays.append(np.ndarray(
+                (length,), dtype=dtype, buffer=shm.buf, offset=k * width
+            ))
+        self.bars = Bars(*arrays)
+
+    # -------------------------------------------------
+    @classmethod
+    def create(cls, bars: Bars) -> "SharedBars":
+        size = max(1, len(bars) * 8 * len(cls.FIELDS))
+        shm = shared_memory.SharedMemory(create=True, size=size)
+
+        shared = cls(shm, len(bars), owner=True)
+        for field in cls.FIELDS:
+            getattr(shared.bars, field)[:] = getattr(bars, field)
+        return shared
+
+    @classmethod
+    def attach(cls, handle) -> "SharedBars":
+        name, length = handle
+        return cls(shared_memory.SharedMemory(name=name), length, owner=False)
+
+    # -------------------------------------------------
+    @property
+    def handle(self):
+        """
+        Picklable (name, length) pair passed to workers.
+        """
+        return self._shm.name, self.length
+
+    def close(self):
+        self.bars = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
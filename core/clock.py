@@ -0,0 +1,17 @@
+# core/clock.py
+
+import time
+from datetime import datetime, timezone
+
+
+class SystemClock:
+    """
+    Wall clock used by the live loop. The replay harness swaps in a
+    simulated clock with the same two methods.
+    """
+
+    def now(self) -> datetime:
+        return datetime.now(timezone.utc)
+
+    def sleep(self, seconds: float):
+        time.sleep(seconds)
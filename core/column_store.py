@@ -0,0 +1,73 @@
+# core/column_store.py
+
+import os
+
+import numpy as np
+
+
+class ColumnStore:
+    """
+    Append-only columnar store: one raw little-endian file per column
+    inside `directory`, read back through np.memmap (zero copy).
+
+    The first column in `schema` is the key column. It is written
+    last on append, so a crash mid-append never exposes a partial row;
+    leftover bytes in the other columns are trimmed on the next append.
+    """
+
+    def __init__(self, directory: str, schema: dict):
+        self.directory = directory
+        self.schema = {name: np.dtype(dtype) for name, dtype in schema.items()}
+        self.key = next(iter(self.schema))
+
+        os.makedirs(directory, exist_ok=True)
+
+    # -------------------------------------------------
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, f"{name}.bin")
+
+    def _rows(self, name: str) -> int:
+        path = self._path(name)
+        if not os.path.exists(path):
+            return 0
+        return os.path.getsize(path) // self.schema[name].itemsize
+
+    def __len__(self) -> int:
+        return min(self._rows(name) for name in self.schema)
+
+    # -------------------------------------------------
+    def append(self, columns: dict):
+        """
+        Appends equal-length arrays for every column in the schema.
+        """
+        rows = len(self)
+
+        # trim any partial write left by a crash
+        for name, dtype in self.schema.items():
+            if self._rows(name) > rows:
+                with open(self._path(name), "r+b") as f:
+                    f.truncate(rows * dtype.itemsize)
+
+        order = [n for n in self.schema if n != self.key] + [self.key]
+
+        for name in order:
+            data = np.ascontiguousarray(columns[name], dtype=self.schema[name])
+            with open(self._path(name), "ab") as f:
+                f.write(data.tobytes())
+
+    # -------------------------------------------------
+    def column(self, name: str, rows: int | None = None) -> np.ndarray:
+        """
+        Read-only memory-mapped view of one column.
+        """
+        dtype = self.schema[name]
+        rows = len(self) if rows is None else rows
+
+        if rows == 0:
+            return np.empty(0, dtype=dtype)
+
+        return np.memmap(self._path(name), dtype=dtype, mode="r", shape=(rows,))
+
+    def read(self) -> dict:
+        rows = len(self)
+        return {name: self.column(name, rows) for name in self.schema}
@@ -0,0 +1,90 @@
+# core/daily_levels.py
+
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+
+
+H1_SECONDS = 3600
+
+
+@dataclass(frozen=True)
+class DayLevels:
+    day: date        # the trading day the levels apply to
+    pdh: float | None
+    pdl: float | None
+
+
+class DailyLevels:
+    """
+    Previous-UTC-day high / low, computed once per day boundary.
+
+    get() answers from the cache until the UTC date changes. The day
+    is taken from `h1` bars when the caller already holds them (the
+    live feed), otherwise fetched once with copy_rates_range.
+
+    Also remembers which levels were already traded (per day).
+    """
+
+    def __init__(self, symbol: str, mt5=None):
+        self.symbol = symbol
+        self.mt5 = mt5
+
+        self.levels: DayLevels | None = None
+        self.used_levels = set()
+
+    # -------------------------------------------------
+    def get(self, now=None, h1=None):
+        """
+        (pdh, pdl) for the day of `now`, or (None, None) when the
+        previous day has no H1 bars.
+        """
+        if now is None:
+            now = datetime.now(timezone.utc)
+        today = now.date()
+
+        if self.levels is None or self.levels.day != today:
+            levels, complete = self._compute(today, h1)
+            if not complete:
+                return levels.pdh, levels.pdl
+            self.levels = levels
+            self.used_levels = set()
+
+        return self.levels.pdh, self.levels.pdl
+
+    def _compute(self, today: date, h1):
+        """
+        Returns (levels, complete). Incomplete results (the last
+        hour of the day not closed yet) are not cached.
+        """
+        prev = today - timedelta(days=1)
+        start = datetime(prev.year, prev.month, prev.day, tzinfo=timezone.utc)
+        t0 = int(start.timestamp())
+        empty = DayLevels(today, None, None)
+
+        if h1 is not None and len(h1) and h1.time[0] <= t0:
+            complete = bool(h1.time[-1] >= t0 + 86400 - H1_SECONDS)
+            day = (h1.time >= t0) & (h1.time < t0 + 86400)
+            if not day.any():
+                return empty, complete
+            levels = DayLevels(today, float(h1.high[day].max()), float(h1.low[day].min()))
+            return levels, complete
+
+        if self.mt5 is None:
+            return empty, False
+
+        rates = self.mt5.copy_rates_range(
+            self.symbol,
+            self.mt5.TIMEFRAME_H1,
+            start,
+            start + timedelta(seconds=86400 - H1_SECONDS),
+        )
+        if rates is None or len(rates) == 0:
+            return empty, rates is not None
+        return DayLevels(today, float(rates["high"].max()), float(rates["low"].min())), True
+
+    # -------------------------------------------------
+    def mark_used(self, level: float):
+        self.used_levels.add(round(level, 5))
+
+    def is_unused(self, level: float) -> bool:
+        return round(level, 5) not in self.used_levels
@@ -0,0 +1,123 @@
+# core/deal_tracker.py
+
+from collections import deque
+from datetime import datetime, timedelta, timezone
+
+
+class DealTracker:
+    """
+    Incremental view of the account's deal history.
+
+    poll() asks the terminal only for deals at or after a time
+    cursor (tickets already seen at the cursor second are skipped)
+    and indexes them by position_id and magic, so questions like
+    "did this position close, how and when?" are dict lookups.
+
+    Deals older than `retention` seconds are forgotten.
+    """
+
+    def __init__(self, mt5, symbol=None, start=None, retention=7 * 86400, keep_per_magic=1000):
+        self.mt5 = mt5
+        self.symbol = symbol
+        self.retention = retention
+        self.keep_per_magic = keep_per_magic
+
+        if start is None:
+            start = datetime.now(timezone.utc)
+        self.cursor = int(start.timestamp()) if isinstance(start, datetime) else int(start)
+        self._at_cursor = set()    # tickets seen in the cursor second
+
+        self.entries = {}          # position_id → opening deal
+        self.exits = {}            # position_id → closing deal
+        self.last_exit = None
+        self._by_magic = {}        # magic → deque[(seq, closing deal)]
+        self._seq = 0
+
+    # -------------------------------------------------
+    def poll(self, now=None) -> list:
+        """
+        Fetches and indexes new deals; returns them oldest first.
+        """
+        if now is None:
+            now = datetime.now(timezone.utc)
+
+        # generous upper bound: deal times are broker server time
+        deals = self.mt5.history_deals_get(
+            datetime.fromtimestamp(self.cursor, timezone.utc),
+            now + timedelta(days=1),
+        )
+        if not deals:
+            return []
+
+        new = [
+            d for d in deals
+            if (d.time > self.cursor or d.ticket not in self._at_cursor)
+            and (self.symbol is None or d.symbol == self.symbol)
+        ]
+        new.sort(key=lambda d: (d.time, d.ticket))
+
+        for d in deals:
+            if d.time > self.cursor:
+                self.cursor = d.time
+                self._at_cursor = set()
+        self._at_cursor.update(d.ticket for d in deals if d.time == self.cursor)
+
+        for d in new:
+            self._index(d)
+
+        self._prune()
+        return new
+
+    def _index(self, deal):
+        if deal.entry == self.mt5.DEAL_ENTRY_IN:
+            self.entries[deal.position_id] = deal
+            return
+
+        self.exits[deal.position_id] = deal
+        self.last_exit = deal
+
+        self._seq += 1
+        closes = self._by_magic.get(deal.magic)
+        if closes is None:
+            closes = self._by_magic[deal.magic] = deque(maxlen=self.keep_per_magic)
+        closes.append((self._seq, deal))
+
+    def _prune(self):
+        cutoff = self.cursor - self.retention
+        for index in (self.entries, self.exits):
+            while index:
+                position, deal = next(iter(index.items()))
+                if deal.time >= cutoff:
+                    break
+                del index[position]
+
+    # -------------------------------------------------
+    # QUERIES (no terminal calls)
+    # -------------------------------------------------
+    def opened(self, position_id):
+        return self.entries.get(position_id)
+
+    def closed(self, position_id):
+        """
+        Closing deal of the position, or None while it is open.
+        """
+        return self.exits.get(position_id)
+
+    def closed_by_sl(self, position_id):
+        deal = self.exits.get(position_id)
+        if deal is not None and deal.reason == self.mt5.DEAL_REASON_SL:
+            return deal
+        return None
+
+    def last_close(self, magic=None):
+        if magic is None:
+            return self.last_exit
+        closes = self._by_magic.get(magic)
+        return closes[-1][1] if closes else None
+
+    def closes_since(self, magic, seq: int = 0) -> list:
+        """
+        (seq, closing deal) pairs of `magic` indexed after sequence
+        number `seq`, oldest first, so a reader can resume.
+        """
+        return [(s, d) for s, d in self._by_magic.get(magic, ()) if s > seq]
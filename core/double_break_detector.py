@@ -1,6 +1,8 @@
 # core/double_break_detector.py
 
-import pandas as pd
+from collections import deque
+
+from core.bars import column
 from core.structure import is_swing_high, is_swing_low
 
 
@@ -13,6 +15,10 @@ class DoubleBreakDetector:
 
     SELL:
         - break & close below TWO confirmed swing lows
+
+    Two equivalent feeds:
+        update(df, i)                         → index-based
+        on_bar(open, high, low, close, time)  → streaming, O(1) memory
     """
 
     def __init__(self, liquidity_level: float, direction: str, max_candles: int = 25):
@@ -22,20 +28,82 @@ class DoubleBreakDetector:
 
         self.breaks: list[float] = []
         self.completed = False
+        self.entry_time = None
 
         self._candles_seen = 0
         self._last_swing = None
 
+        # streaming state: last 3 bars as (high, low, close)
+        self._window = deque(maxlen=3)
+        self._position = -1
+
     # --------------------------------------------------
-    def update(self, df: pd.DataFrame, i: int):
+    def update(self, df, i: int):
         """
         Returns entry index ONLY on second valid structural break.
         Otherwise returns None.
+
+        `df` may be a Bars store or a DataFrame.
         """
+        if not self._advance(i):
+            return None
 
-        if self.completed:
+        high = column(df, "high")
+        low = column(df, "low")
+        close = column(df, "close")
+
+        return self._step(
+            i,
+            high[i - 1], low[i - 1],
+            high[i], low[i], close[i],
+            is_swing_high(df, i - 1),
+            is_swing_low(df, i - 1),
+        )
+
+    # --------------------------------------------------
+    def prime(self, open, high, low, close, time=None):
+        """
+        Pushes a history bar into the streaming window without
+        evaluating it (e.g. the bars before the sweep).
+        """
+        self._window.append((high, low, close))
+        self._position += 1
+
+    def on_bar(self, open, high, low, close, time=None):
+        """
+        Streaming form of update(): push each bar once, in order.
+        Returns the entry bar position (bars pushed so far, including
+        primed ones, minus one) on the second valid break, else None.
+        """
+        self.prime(open, high, low, close, time)
+        i = self._position
+
+        if not self._advance(i):
             return None
 
+        (h2, l2, _), (h1, l1, _), (h0, l0, c0) = self._window
+
+        entry = self._step(
+            i,
+            h1, l1,
+            h0, l0, c0,
+            h1 > h2 and h1 > h0,
+            l1 < l2 and l1 < l0,
+        )
+
+        if entry is not None:
+            self.entry_time = time
+        return entry
+
+    # --------------------------------------------------
+    def _advance(self, i: int) -> bool:
+        """
+        Counts the candle and applies expiry.
+        Returns False when there is nothing to evaluate.
+        """
+        if self.completed:
+            return False
+
         self._candles_seen += 1
 
         # -------------------------------
@@ -43,27 +111,30 @@ class DoubleBreakDetector:
         # -------------------------------
         if self._candles_seen > self.max_candles:
             self.completed = True
-            return None
-
-        if i < 2:
-            return None
-
-        prev = df.iloc[i - 1]
-        curr = df.iloc[i]
+            return False
 
+        return i >= 2
 
+    # --------------------------------------------------
+    def _step(
+        self,
+        i,
+        prev_high, prev_low,
+        curr_high, curr_low, curr_close,
+        prev_is_swing_high, prev_is_swing_low,
+    ):
         # ===============================
         # STRUCTURE INVALIDATION
         # ===============================
         if self.direction == "BUY":
             # Any lower low invalidates bullish structure
-            if curr["low"] < prev["low"] and self._last_swing is not None:
+            if curr_low < prev_low and self._last_swing is not None:
                 self.breaks.clear()
                 self._last_swing = None
 
         elif self.direction == "SELL":
             # Any higher high invalidates bearish structure
-            if curr["high"] > prev["high"] and self._last_swing is not None:
+            if curr_high > prev_high and self._last_swing is not None:
                 self.breaks.clear()
                 self._last_swing = None
 
@@ -71,14 +142,14 @@ class DoubleBreakDetector:
         # SELL → break swing LOWS
         # ===============================
         if self.direction == "SELL":
-            if is_swing_low(df, i - 1):
-                self._last_swing = prev["low"]
+            if prev_is_swing_low:
+                self._last_swing = prev_low
 
             if self._last_swing is None:
                 return None
 
             # BREAK ONLY IF CLOSE BELOW SWING
-            if curr["close"] < self._last_swing:
+            if curr_close < self._last_swing:
                 self._register_break(self._last_swing)
                 self._last_swing = None  # force new swing
 
@@ -86,14 +157,14 @@ class DoubleBreakDetector:
         # BUY → break swing HIGHS
         # ===============================
         else:
-            if is_swing_high(df, i - 1):
-                self._last_swing = prev["high"]
+            if prev_is_swing_high:
+                self._last_swing = prev_high
 
             if self._last_swing is None:
                 return None
 
             # BREAK ONLY IF CLOSE ABOVE SWING
-            if curr["close"] > self._last_swing:
+            if curr_close > self._last_swing:
                 self._register_break(self._last_swing)
                 self._last_swing = None  # force new swing
 
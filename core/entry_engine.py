@@ -1,7 +1,10 @@
 # core/entry_engine.py
 
 from dataclasses import dataclass
-import pandas as pd
+
+import numpy as np
+
+from core.bars import column
 
 
 @dataclass
@@ -15,41 +18,100 @@ class TradePlan:
 
 
 class EntryEngine:
+    """
+    Entry at the signal bar's extreme, stop beyond the last
+    opposite-colour candle before it.
+
+    update(bars, i) points the engine at bars [0, i] of a Bars store
+    or DataFrame (no copy; bar i is the signal bar) and folds the new
+    bars into running last-bullish / last-bearish indices, so the
+    pullback lookup in build_trade_plan is O(1).
+    """
+
     def __init__(self, symbol: str):
         self.symbol = symbol
-        self.df: pd.DataFrame | None = None
+
+        self._bars = None
+        self._open = self._high = self._low = self._close = None
+
+        self.end = -1          # signal bar
+        self._scanned = 0      # bars [0, _scanned) folded into last_*
+        self.last_bull = -1
+        self.last_bear = -1
+
+    # -------------------------------------------------
+    @property
+    def df(self):
+        return self._bars
+
+    @df.setter
+    def df(self, data):
+        # whole frame, signal = last row
+        if data is None:
+            self._bars = None
+            self.end = -1
+            return
+        self.update(data, len(data) - 1)
+
+    # -------------------------------------------------
+    def update(self, bars, i: int):
+        if bars is not self._bars or i < self._scanned:
+            self._attach(bars, i)
+        else:
+            o, c = self._open, self._close
+            for k in range(self._scanned, i):
+                if c[k] > o[k]:
+                    self.last_bull = k
+                elif c[k] < o[k]:
+                    self.last_bear = k
+            self._scanned = i
+
+        self.end = i
+
+    def _attach(self, bars, i):
+        self._bars = bars
+        self._open = column(bars, "open")
+        self._high = column(bars, "high")
+        self._low = column(bars, "low")
+        self._close = column(bars, "close")
+
+        self.last_bull = self._last_candle(1.0, i)
+        self.last_bear = self._last_candle(-1.0, i)
+        self._scanned = i
+
+    def _last_candle(self, sign, stop, window=64):
+        """
+        Last index < stop whose body has `sign`, searched backwards
+        in doubling chunks.
+        """
+        o, c = self._open, self._close
+        hi = stop
+        while hi > 0:
+            lo = max(0, hi - window)
+            hits = np.flatnonzero(np.sign(c[lo:hi] - o[lo:hi]) == sign)
+            if len(hits):
+                return lo + int(hits[-1])
+            hi = lo
+            window *= 2
+        return -1
 
     # -------------------------------------------------
     def build_trade_plan(self, signal, tp: float) -> TradePlan:
-        if self.df is None or len(self.df) < 3:
+        if self._bars is None or self.end < 2:
             return TradePlan(
                 signal.direction, 0, 0, 0, False,
                 "Not enough candles"
             )
 
         direction = signal.direction
-        df = self.df.reset_index(drop=True)
 
         # --------------------------------------------
         # FIND OPPOSITE CANDLE (PULLBACK)
         # --------------------------------------------
-        pullback_index = None
+        # BUY → bearish candle, SELL → bullish candle
+        pullback_index = self.last_bear if direction == "BUY" else self.last_bull
 
-        if direction == "BUY":
-            # bearish candle = close < open
-            for i in range(len(df) - 2, -1, -1):
-                if df.loc[i, "close"] < df.loc[i, "open"]:
-                    pullback_index = i
-                    break
-
-        else:  # SELL
-            # bullish candle = close > open
-            for i in range(len(df) - 2, -1, -1):
-                if df.loc[i, "close"] > df.loc[i, "open"]:
-                    pullback_index = i
-                    break
-
-        if pullback_index is None:
+        if pullback_index < 0:
             return TradePlan(
                 direction, 0, 0, 0, False,
                 "No opposite candle found"
@@ -58,14 +120,14 @@ class EntryEngine:
         # --------------------------------------------
         # ENTRY & STOP LOGIC
         # --------------------------------------------
-        last = df.iloc[-1]
+        i = self.end
 
         if direction == "BUY":
-            entry = last["high"]
-            sl = df.loc[pullback_index, "low"]
+            entry = float(self._high[i])
+            sl = float(self._low[pullback_index])
         else:
-            entry = last["low"]
-            sl = df.loc[pullback_index, "high"]
+            entry = float(self._low[i])
+            sl = float(self._high[pullback_index])
 
         if entry == sl:
             return TradePlan(
@@ -1,5 +1,23 @@
 from datetime import datetime, timezone
-from core.notifier import send
+from core.notifier import send, LOW, HIGH
+
+# optional append-only record of every event (core/journal.Journal)
+journal = None
+
+
+def use_journal(j):
+    global journal
+    journal = j
+
+
+def record(event, symbol, **data):
+    if journal is not None:
+        journal.write(event, data, symbol=symbol)
+
+
+def flush_journal():
+    if journal is not None:
+        journal.flush()
 
 
 def timestamp():
@@ -7,15 +25,18 @@ def timestamp():
 
 
 def log_levels(symbol, pdh, pdl):
+    record("levels", symbol, pdh=pdh, pdl=pdl)
     send(
         f"📏 *{symbol} — DAILY LEVELS*\n"
         f"PDH: `{pdh:.5f}`\n"
         f"PDL: `{pdl:.5f}`\n"
-        f"{timestamp()}"
+        f"{timestamp()}",
+        LOW,
     )
 
 
 def log_pdh_taken(symbol, price, pdh):
+    record("pdh_taken", symbol, price=price, pdh=pdh)
     send(
         f"🚨 *{symbol} — PDH SWEPT*\n"
         f"High: `{price:.5f}`\n"
@@ -26,6 +47,7 @@ def log_pdh_taken(symbol, price, pdh):
 
 
 def log_pdl_taken(symbol, price, pdl):
+    record("pdl_taken", symbol, price=price, pdl=pdl)
     send(
         f"🚨 *{symbol} — PDL SWEPT*\n"
         f"Low: `{price:.5f}`\n"
@@ -36,6 +58,7 @@ def log_pdl_taken(symbol, price, pdl):
 
 
 def log_double_break(symbol, direction, breaks):
+    record("double_break", symbol, direction=direction, breaks=breaks)
     send(
         f"🧱 *{symbol} — DOUBLE BREAK CONFIRMED*\n"
         f"Direction: {direction}\n"
@@ -45,6 +68,7 @@ def log_double_break(symbol, direction, breaks):
 
 
 def log_entry(symbol, direction, entry, sl, tp, rr):
+    record("entry", symbol, direction=direction, entry=entry, sl=sl, tp=tp, rr=rr)
     send(
         f"🎯 *{symbol} — ENTRY CONFIRMED*\n"
         f"Direction: {direction}\n"
@@ -52,11 +76,13 @@ def log_entry(symbol, direction, entry, sl, tp, rr):
         f"SL: `{sl:.5f}`\n"
         f"TP: `{tp:.5f}`\n"
         f"RR: `{rr:.2f}R`\n"
-        f"{timestamp()}"
+        f"{timestamp()}",
+        HIGH,
     )
 
 
 def log_flip(symbol, direction, entry, sl, tp, rr):
+    record("flip", symbol, direction=direction, entry=entry, sl=sl, tp=tp, rr=rr)
     send(
         f"🔁 *{symbol} — FLIP CONFIRMED*\n"
         f"Direction: {direction}\n"
@@ -64,5 +90,6 @@ def log_flip(symbol, direction, entry, sl, tp, rr):
         f"SL: `{sl:.5f}`\n"
         f"TP: `{tp:.5f}`\n"
         f"RR: `{rr:.2f}R`\n"
-        f"{timestamp()}"
+        f"{timestamp()}",
+        HIGH,
     )
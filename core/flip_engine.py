@@ -1,6 +1,6 @@
 # core/flip_engine.py
 
-import MetaTrader5 as mt5
+from core.mt5_api import mt5
 from typing import Optional
 
 from core.entry_engine import EntryEngine
@@ -10,8 +10,9 @@ from config.settings import SYMBOL
 
 
 class FlipEngine:
-    def __init__(self, symbol: str):
+    def __init__(self, symbol: str, state=None):
         self.symbol = symbol
+        self.state = state      # shared TradeState for the executor
         self.flipped_today = False
 
     # -------------------------------------------------
@@ -23,7 +24,8 @@ class FlipEngine:
         self,
         stopped_direction: str,
         pdh: float,
-        pdl: float
+        pdl: float,
+        bars=None,
     ) -> Optional[int]:
 
         if not self.can_flip():
@@ -34,8 +36,10 @@ class FlipEngine:
         tp_level = pdh if flip_direction == "BUY" else pdl
 
         entry_engine = EntryEngine(self.symbol)
+        if bars is not None:
+            entry_engine.update(bars, len(bars) - 1)
         risk = RiskManager(self.symbol)
-        executor = OrderExecutor(self.symbol)
+        executor = OrderExecutor(self.symbol, self.state)
 
         # Build synthetic signal-like object
         class _Signal:
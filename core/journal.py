@@ -0,0 +1,296 @@
+# core/journal.py
+
+import json
+import os
+import time
+from datetime import datetime, timezone
+
+
+BATCH_SIZE = 64
+FLUSH_INTERVAL = 1.0             # seconds a record may sit in memory
+MAX_BYTES = 8 * 1024 * 1024      # segment size before rotating
+INDEX_FILE = "index.json"
+
+
+class Journal:
+    """
+    Append-only event journal: JSON Lines segments under `directory`.
+
+    Records are buffered and group-committed: one write (and fsync)
+    per `batch_size` records, or once the oldest buffered record is
+    `flush_interval` seconds old (checked on write; flush() / close()
+    commit the rest).
+    A new segment starts on each UTC day or once a segment reaches
+    `max_bytes`.
+
+    index.json keeps one summary per segment (time range, count,
+    event types, symbols) so query() only opens segments that can
+    match. A crash loses at most the unflushed batch: a torn last
+    line is cut off and the index is rebuilt from the segments on
+    the next open.
+    """
+
+    def __init__(self, directory: str, batch_size=BATCH_SIZE,
+                 flush_interval=FLUSH_INTERVAL, max_bytes=MAX_BYTES, fsync=True):
+        self.directory = directory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.fsync = fsync
+
+        os.makedirs(directory, exist_ok=True)
+
+        self.segments = self._load_index()
+        self._buffer = []
+        self._oldest = None          # monotonic time of the first buffered record
+        self.written = 0
+
+    # -------------------------------------------------
+    # WRITE
+    # -------------------------------------------------
+    def write(self, event: str, data=None, symbol=None, at=None):
+        """
+        Queues one record; `at` is a datetime or epoch seconds
+        (default: now).
+        """
+        if at is None:
+            t = time.time()
+        elif isinstance(at, datetime):
+            t = at.timestamp()
+        else:
+            t = float(at)
+
+        self._buffer.append({
+            "time": t,
+            "timestamp": datetime.fromtimestamp(t, timezone.utc).isoformat(),
+            "event": event,
+            "symbol": symbol,
+            "data": data or {},
+        })
+
+        now = time.monotonic()
+        if self._oldest is None:
+            self._oldest = now
+
+        if (len(self._buffer) >= self.batch_size
+                or now - self._oldest >= self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        if not self._buffer:
+            return
+
+        batch, self._buffer, self._oldest = self._buffer, [], None
+
+        # one batch can span a day boundary or a size limit:
+        # commit it as one write per segment (ASCII: len == bytes)
+        lines = [json.dumps(r, separators=(",", ":")) + "\n" for r in batch]
+        start = 0
+        while start < len(batch):
+            segment = self._segment_for(batch[start]["time"], len(lines[start]))
+
+            end = start + 1
+            size = segment["bytes"] + len(lines[start])
+            while (end < len(batch)
+                   and _day(batch[end]["time"]) == segment["day"]
+                   and size + len(lines[end]) <= self.max_bytes):
+                size += len(lines[end])
+                end += 1
+
+            self._append(segment, batch[start:end], "".join(lines[start:end]))
+            start = end
+
+        self._save_index()
+
+    def _append(self, segment, records, text):
+        data = text.encode()
+        with open(os.path.join(self.directory, segment["file"]), "ab") as f:
+            f.write(data)
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+
+        segment["bytes"] += len(data)
+        _summarize(segment, records)
+        self.written += len(records)
+
+    def _segment_for(self, t: float, nbytes: int) -> dict:
+        day = _day(t)
+        last = self.segments[-1] if self.segments else None
+
+        if last is not None and last["day"] == day and (
+            last["bytes"] == 0 or last["bytes"] + nbytes <= self.max_bytes
+        ):
+            return last
+
+        seq = last["seq"] + 1 if last is not None and last["day"] == day else 0
+        segment = {
+            "file": f"{day}-{seq:03d}.jsonl",
+            "day": day,
+            "seq": seq,
+            "bytes": 0,
+            "count": 0,
+            "start": None,
+            "end": None,
+            "events": [],
+            "symbols": [],
+        }
+        self.segments.append(segment)
+        return segment
+
+    # -------------------------------------------------
+    # READ
+    # -------------------------------------------------
+    def query(self, event=None, symbol=None, start=None, end=None) -> list:
+        """
+        Records matching every given filter, oldest first.
+        `start` / `end` (datetimes or epoch seconds) are inclusive.
+        """
+        self.flush()
+
+        lo = _epoch(start) if start is not None else None
+        hi = _epoch(end) if end is not None else None
+
+        out = []
+        for segment in self.segments:
+            if not segment["count"]:
+                continue
+            if lo is not None and segment["end"] < lo:
+                continue
+            if hi is not None and segment["start"] > hi:
+                continue
+            if event is not None and event not in segment["events"]:
+                continue
+            if symbol is not None and symbol not in segment["symbols"]:
+                continue
+
+            for record in _read(os.path.join(self.directory, segment["file"])):
+                if event is not None and record["event"] != event:
+                    continue
+                if symbol is not None and record["symbol"] != symbol:
+                    continue
+                if lo is not None and record["time"] < lo:
+                    continue
+                if hi is not None and record["time"] > hi:
+                    continue
+                out.append(record)
+
+        out.sort(key=lambda r: r["time"])
+        return out
+
+    # -------------------------------------------------
+    # INDEX
+    # -------------------------------------------------
+    def _load_index(self) -> list:
+        path = os.path.join(self.directory, INDEX_FILE)
+        files = sorted(
+            name for name in os.listdir(self.directory) if name.endswith(".jsonl")
+        )
+
+        segments = []
+        if os.path.exists(path):
+            with open(path) as f:
+                segments = json.load(f)
+
+        known = {s["file"]: s for s in segments}
+        rebuilt = []
+        for name in files:
+            full = os.path.join(self.directory, name)
+            _repair_tail(full)
+            size = os.path.getsize(full)
+
+            segment = known.get(name)
+            if segment is None or segment["bytes"] != size:
+                # written after the last index save (crash): rescan
+                day, seq = name[:-len(".jsonl")].rsplit("-", 1)
+                segment = {
+                    "file": name, "day": day, "seq": int(seq), "bytes": size,
+                    "count": 0, "start": None, "end": None,
+                    "events": [], "symbols": [],
+                }
+                _summarize(segment, list(_read(full)))
+            rebuilt.append(segment)
+
+        return rebuilt
+
+    def _save_index(self):
+        path = os.path.join(self.directory, INDEX_FILE)
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.segments, f)
+        os.replace(tmp, path)
+
+    # -------------------------------------------------
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# =============================
+# HELPERS
+# =============================
+def _day(t: float) -> str:
+    return datetime.fromtimestamp(t, timezone.utc).strftime("%Y%m%d")
+
+
+def _epoch(value) -> float:
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return float(value)
+
+
+def _summarize(segment: dict, records: list):
+    if not records:
+        return
+
+    times = [r["time"] for r in records]
+    lo, hi = min(times), max(times)
+    segment["start"] = lo if segment["start"] is None else min(segment["start"], lo)
+    segment["end"] = hi if segment["end"] is None else max(segment["end"], hi)
+    segment["count"] += len(records)
+
+    events = set(segment["events"])
+    events.update(r["event"] for r in records)
+    segment["events"] = sorted(events)
+
+    symbols = set(segment["symbols"])
+    symbols.update(r["symbol"] for r in records if r["symbol"] is not None)
+    segment["symbols"] = sorted(symbols)
+
+
+def _read(path: str):
+    with open(path, "rb") as f:
+        for line in f:
+            if line.endswith(b"\n"):
+                yield json.loads(line)
+
+
+def _repair_tail(path: str):
+    """
+    Cuts a torn final line left by a crash mid-write.
+    """
+    size = os.path.getsize(path)
+    if size == 0:
+        return
+
+    with open(path, "rb+") as f:
+        f.seek(size - 1)
+        if f.read(1) == b"\n":
+            return
+
+        pos = size
+        while pos > 0:
+            step = min(4096, pos)
+            f.seek(pos - step)
+            chunk = f.read(step)
+            k = chunk.rfind(b"\n")
+            if k >= 0:
+                f.truncate(pos - step + k + 1)
+                return
+            pos -= step
+        f.truncate(0)
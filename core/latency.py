@@ -0,0 +1,140 @@
+# core/latency.py
+
+import os
+import time
+from contextlib import nullcontext
+
+import numpy as np
+
+
+WINDOW = 1024              # samples kept per stage for the quantiles
+EXPORT_INTERVAL = 60.0     # seconds between file exports
+QUANTILES = (0.5, 0.95, 0.99)
+METRIC = "doubleb_stage_latency_seconds"
+
+_OFF = nullcontext()
+
+
+class StageStats:
+    """
+    Rolling window of one stage's durations (seconds) plus
+    cumulative count / sum.
+    """
+
+    def __init__(self, window=WINDOW):
+        self.samples = np.zeros(window)
+        self.n = 0
+        self.total = 0.0
+
+    def add(self, seconds: float):
+        self.samples[self.n % len(self.samples)] = seconds
+        self.n += 1
+        self.total += seconds
+
+    def window(self) -> np.ndarray:
+        return self.samples[:min(self.n, len(self.samples))]
+
+    def quantiles(self, qs=QUANTILES) -> dict:
+        w = self.window()
+        if not len(w):
+            return {q: float("nan") for q in qs}
+        return dict(zip(qs, np.quantile(w, qs)))
+
+
+class _Stage:
+    __slots__ = ("stats", "t0")
+
+    def __init__(self, stats):
+        self.stats = stats
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.stats.add(time.perf_counter() - self.t0)
+        return False
+
+
+class LatencyRecorder:
+    """
+    Per-stage timers for the live loop.
+
+        with latency.stage("order_send"):
+            executor.place_limit(...)
+
+    Durations go into a rolling window per stage; maybe_export()
+    writes p50 / p95 / p99, count and sum to `path` in Prometheus
+    text format (a summary per stage) every `export_interval`
+    seconds. Disabled, stage() returns a shared no-op context and
+    nothing is timed or written.
+    """
+
+    def __init__(self, enabled=True, path=None, window=WINDOW, export_interval=EXPORT_INTERVAL):
+        self.enabled = enabled
+        self.path = path
+        self.window = window
+        self.export_interval = export_interval
+
+        self.stages = {}
+        self._last_export = time.monotonic()
+
+    # -------------------------------------------------
+    def stage(self, name: str):
+        if not self.enabled:
+            return _OFF
+        stats = self.stages.get(name)
+        if stats is None:
+            stats = self.stages[name] = StageStats(self.window)
+        return _Stage(stats)
+
+    def record(self, name: str, seconds: float):
+        if not self.enabled:
+            return
+        stats = self.stages.get(name)
+        if stats is None:
+            stats = self.stages[name] = StageStats(self.window)
+        stats.add(seconds)
+
+    def summary(self) -> dict:
+        """
+        {stage: {"p50", "p95", "p99", "count", "sum"}}
+        """
+        out = {}
+        for name, stats in self.stages.items():
+            q = stats.quantiles()
+            out[name] = {
+                "p50": q[0.5], "p95": q[0.95], "p99": q[0.99],
+                "count": stats.n, "sum": stats.total,
+            }
+        return out
+
+    # -------------------------------------------------
+    # EXPORT
+    # -------------------------------------------------
+    def prometheus(self) -> str:
+        lines = [
+            f"# HELP {METRIC} Live loop stage duration (rolling window quantiles).",
+            f"# TYPE {METRIC} summary",
+        ]
+        for name in sorted(self.stages):
+            stats = self.stages[name]
+            for q, value in stats.quantiles().items():
+                lines.append(f'{METRIC}{{stage="{name}",quantile="{q}"}} {value:.9g}')
+            lines.append(f'{METRIC}_sum{{stage="{name}"}} {stats.total:.9g}')
+            lines.append(f'{METRIC}_count{{stage="{name}"}} {stats.n}')
+        return "\n".join(lines) + "\n"
+
+    def export(self, path=None):
+        path = path or self.path
+        if not self.enabled or path is None:
+            return
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            f.write(self.prometheus())
+        os.replace(tmp, path)   # scrapers never see a half-written file
+        self._last_export = time.monotonic()
+
+    def maybe_export(self):
+        if self.enabled and time.monotonic() - self._last_export >= self.export_interval:
+            self.export()
@@ -0,0 +1,101 @@
+# core/levels.py
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from core.bars import Bars, epoch_seconds
+
+
+ROLLING = "rolling"     # last N closed-or-forming H1 bars before t
+CALENDAR = "calendar"   # previous UTC calendar day
+
+DAY_SECONDS = 86400
+
+
+# =============================
+# INTERNAL HELPERS
+# =============================
+def _h1_columns(h1):
+    if isinstance(h1, Bars):
+        return h1.time, h1.high, h1.low
+
+    times = h1["time"] if "time" in h1.columns else h1.index
+    return (
+        epoch_seconds(times),
+        h1["high"].to_numpy(dtype=np.float64),
+        h1["low"].to_numpy(dtype=np.float64),
+    )
+
+
+# =============================
+# PUBLIC API
+# =============================
+def rolling_levels(times, h1_times, h1_high, h1_low, lookback: int = 24):
+    """
+    PDH / PDL = max high / min low of the last `lookback` H1 bars
+    opening strictly before each timestamp.
+    """
+    n = len(times)
+    pdh = np.full(n, np.nan)
+    pdl = np.full(n, np.nan)
+
+    if len(h1_times) < lookback:
+        return pdh, pdl
+
+    roll_high = sliding_window_view(h1_high, lookback).max(axis=1)
+    roll_low = sliding_window_view(h1_low, lookback).min(axis=1)
+
+    # number of H1 bars with open time < t
+    count = np.searchsorted(h1_times, times, side="left")
+    ok = count >= lookback
+
+    pdh[ok] = roll_high[count[ok] - lookback]
+    pdl[ok] = roll_low[count[ok] - lookback]
+    return pdh, pdl
+
+
+def calendar_levels(times, h1_times, h1_high, h1_low):
+    """
+    PDH / PDL = max high / min low of the previous UTC calendar day
+    (same definition as the live loop).
+    """
+    n = len(times)
+    pdh = np.full(n, np.nan)
+    pdl = np.full(n, np.nan)
+
+    if len(h1_times) == 0:
+        return pdh, pdl
+
+    h1_day = h1_times // DAY_SECONDS
+    days, starts = np.unique(h1_day, return_index=True)
+    day_high = np.maximum.reduceat(h1_high, starts)
+    day_low = np.minimum.reduceat(h1_low, starts)
+
+    wanted = times // DAY_SECONDS - 1
+    pos = np.searchsorted(days, wanted)
+    pos_clipped = np.minimum(pos, len(days) - 1)
+    ok = (pos < len(days)) & (days[pos_clipped] == wanted)
+
+    pdh[ok] = day_high[pos_clipped[ok]]
+    pdl[ok] = day_low[pos_clipped[ok]]
+    return pdh, pdl
+
+
+def build_level_table(times, h1, mode: str = ROLLING, lookback: int = 24):
+    """
+    Precomputes PDH / PDL for every timestamp in one vectorized pass.
+
+    `times` are the M5 bar times, `h1` is a Bars store or a DataFrame
+    with high / low and a time column (or a DatetimeIndex), ascending.
+    Returns two float arrays aligned with `times`; NaN where not enough
+    H1 history exists.
+    """
+    t = epoch_seconds(times)
+    h1_t, h1_high, h1_low = _h1_columns(h1)
+
+    if mode == ROLLING:
+        return rolling_levels(t, h1_t, h1_high, h1_low, lookback)
+    if mode == CALENDAR:
+        return calendar_levels(t, h1_t, h1_high, h1_low)
+
+    raise ValueError(f"Unknown level mode: {mode}")
@@ -0,0 +1,216 @@
+# core/mt5_api.py
+
+import importlib
+import sys
+import time
+
+import numpy as np
+
+from config.settings import MT5_RETRIES, MT5_RETRY_DELAY, MT5_CALL_BUDGET
+
+
+MODULE = "MetaTrader5"
+
+# functions that only read terminal state: safe to retry
+READS = frozenset({
+    "account_info", "terminal_info", "symbol_info", "symbol_info_tick",
+    "copy_rates_from", "copy_rates_from_pos", "copy_rates_range",
+    "copy_ticks_from", "copy_ticks_range",
+    "positions_get", "positions_total", "orders_get", "orders_total",
+    "history_deals_get", "history_orders_get",
+})
+
+# last_error() codes of a failed terminal round trip (IPC send /
+# receive / init / connect / timeout): worth another attempt
+IPC_ERRORS = frozenset({-10001, -10002, -10003, -10004, -10005})
+
+
+class CallStats:
+    """
+    Accounting of one API function: calls, failures (None result),
+    retries, time spent and payload returned.
+    """
+
+    __slots__ = ("calls", "failures", "retries", "seconds", "max_seconds",
+                 "items", "bytes", "cycle_calls")
+
+    def __init__(self):
+        self.calls = 0
+        self.failures = 0
+        self.retries = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.items = 0
+        self.bytes = 0
+        self.cycle_calls = 0
+
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class MT5Api:
+    """
+    Thin facade over the MetaTrader5 module; import `mt5` from here
+    instead of the module itself.
+
+    Constants pass straight through. Functions are looked up on the
+    module at call time (so replay stand-ins and monkeypatched tests
+    still apply) and wrapped to record call counts, latency and
+    payload size per function.
+
+    `retries` extra attempts are made for read-only calls that fail
+    with an IPC error. `budget` maps function names (or "*" for the
+    total) to a per-cycle call limit; begin_cycle() resets the cycle
+    counters and calls past a limit are reported once per cycle.
+    """
+
+    def __init__(self, retries=0, retry_delay=0.05, budget=None):
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.budget = dict(budget or {})
+
+        self.stats = {}
+        self.cycle_total = 0
+        self.over_budget = set()
+        self._wrappers = {}
+
+    # -------------------------------------------------
+    @staticmethod
+    def module():
+        mod = sys.modules.get(MODULE)
+        if mod is None:
+            mod = importlib.import_module(MODULE)
+        return mod
+
+    def available(self) -> bool:
+        try:
+            self.module()
+        except ImportError:
+            return False
+        return True
+
+    def __getattr__(self, name):
+        value = getattr(self.module(), name)
+        if not callable(value) or name.startswith("__"):
+            return value
+
+        cached = self._wrappers.get(name)
+        if cached is not None and cached[0] == value:   # bound methods compare equal
+            return cached[1]
+
+        wrapper = self._wrap(name, value)
+        self._wrappers[name] = (value, wrapper)
+        return wrapper
+
+    # -------------------------------------------------
+    def _wrap(self, name, fn):
+        stats = self.stats.get(name)
+        if stats is None:
+            stats = self.stats[name] = CallStats()
+        read = name in READS
+
+        def call(*args, **kwargs):
+            self._count(name, stats)
+            # policy read per call: retries / retry_delay may change
+            # after the wrapper is cached
+            retries = self.retries if read else 0
+
+            attempt = 0
+            while True:
+                t0 = time.perf_counter()
+                result = fn(*args, **kwargs)
+                dt = time.perf_counter() - t0
+
+                stats.seconds += dt
+                if dt > stats.max_seconds:
+                    stats.max_seconds = dt
+
+                if result is not None or attempt >= retries or not self._ipc_failed():
+                    break
+                attempt += 1
+                stats.retries += 1
+                time.sleep(self.retry_delay * attempt)
+
+            if result is None:
+                stats.failures += 1
+            else:
+                _payload(stats, result)
+            return result
+
+        call.__name__ = name
+        call.__wrapped__ = fn
+        return call
+
+    def _ipc_failed(self) -> bool:
+        last_error = getattr(self.module(), "last_error", None)
+        if last_error is None:
+            return False
+        error = last_error()
+        return bool(error) and error[0] in IPC_ERRORS
+
+    def _count(self, name, stats):
+        stats.calls += 1
+        stats.cycle_calls += 1
+        self.cycle_total += 1
+
+        if not self.budget:
+            return
+        for key, used in ((name, stats.cycle_calls), ("*", self.cycle_total)):
+            limit = self.budget.get(key)
+            if limit is not None and used > limit and key not in self.over_budget:
+                self.over_budget.add(key)
+                print(f"⚠️ MT5 call budget exceeded: {key} > {limit} this cycle")
+
+    # -------------------------------------------------
+    # REPORTING
+    # -------------------------------------------------
+    def begin_cycle(self):
+        for stats in self.stats.values():
+            stats.cycle_calls = 0
+        self.cycle_total = 0
+        self.over_budget = set()
+
+    def call_stats(self) -> dict:
+        """
+        {function: CallStats.as_dict()} for every function called.
+        """
+        return {name: s.as_dict() for name, s in self.stats.items() if s.calls}
+
+    def reset_stats(self):
+        for name in self.stats:
+            self.stats[name] = CallStats()
+        self._wrappers.clear()
+        self.begin_cycle()
+
+    def format_stats(self) -> str:
+        rows = sorted(self.call_stats().items(), key=lambda kv: -kv[1]["seconds"])
+        lines = [f"{'function':<22}{'calls':>9}{'fail':>6}{'retry':>6}"
+                 f"{'avg ms':>9}{'max ms':>9}{'items':>10}{'KB':>10}"]
+        for name, s in rows:
+            lines.append(
+                f"{name:<22}{s['calls']:>9}{s['failures']:>6}{s['retries']:>6}"
+                f"{1000 * s['seconds'] / s['calls']:>9.3f}{1000 * s['max_seconds']:>9.3f}"
+                f"{s['items']:>10}{s['bytes'] / 1024:>10.1f}"
+            )
+        return "\n".join(lines)
+
+
+def _payload(stats, result):
+    # a namedtuple (account_info, symbol_info_tick, ...) is one record,
+    # not a sequence of its fields
+    if hasattr(result, "_fields"):
+        stats.items += 1
+        stats.bytes += sys.getsizeof(result)
+    elif isinstance(result, np.ndarray):
+        stats.items += len(result)
+        stats.bytes += result.nbytes
+    elif isinstance(result, (tuple, list)):
+        stats.items += len(result)
+        stats.bytes += sum(sys.getsizeof(x) for x in result)
+    else:
+        stats.items += 1
+        stats.bytes += sys.getsizeof(result)
+
+
+# the one instance every module uses
+mt5 = MT5Api(retries=MT5_RETRIES, retry_delay=MT5_RETRY_DELAY, budget=MT5_CALL_BUDGET)
@@ -1,16 +1,23 @@
 # core/mt5_connector.py
 
-import MetaTrader5 as mt5
+from core.mt5_api import mt5
 import sys
 
-def connect(symbol: str):
+def connect(symbols):
+    """
+    Initializes the terminal and selects one symbol or a list.
+    """
+    if isinstance(symbols, str):
+        symbols = [symbols]
+
     if not mt5.initialize():
         print("❌ MT5 initialization failed")
         sys.exit(1)
 
-    if not mt5.symbol_select(symbol, True):
-        print(f"❌ Failed to select symbol: {symbol}")
-        sys.exit(1)
+    for symbol in symbols:
+        if not mt5.symbol_select(symbol, True):
+            print(f"❌ Failed to select symbol: {symbol}")
+            sys.exit(1)
 
     account = mt5.account_info()
     if account is None:
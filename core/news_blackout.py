@@ -1,15 +1,150 @@
 # core/news_blackout.py
 
-from datetime import datetime, timedelta
+import csv
+import os
+import re
+from datetime import datetime, timezone
 
-# HARD-CODED HIGH IMPACT EVENTS (UTC)
-# Replace or automate later if needed
-HIGH_IMPACT_EVENTS = [
-    # Example:
-    # ("USD", datetime(2024, 6, 14, 12, 30)),  # CPI
-]
+import numpy as np
+import pandas as pd
 
-BLACKOUT_MINUTES = 15
+from core.bars import epoch_seconds
+from config.news_blackout import (
+    NEWS_CALENDAR_FILE,
+    BLACKOUT_MINUTES,
+    HIGH_IMPACT_EVENTS,
+)
+
+
+class NewsCalendar:
+    """
+    High-impact news windows, indexed per currency.
+
+    Each event blocks [time - blackout, time + blackout]. Overlapping
+    windows are merged, so every currency holds sorted, disjoint
+    (start, end) epoch-second arrays: a point query is one binary
+    search and mask() does the same for a whole timestamp array.
+
+    A symbol is affected by every calendar currency among its first
+    six letters (EURUSDm → EUR, USD).
+    """
+
+    def __init__(self, events=(), blackout_minutes=BLACKOUT_MINUTES):
+        self.blackout = int(blackout_minutes * 60)
+
+        times = {}
+        for currency, when in events:
+            times.setdefault(currency.upper(), []).append(_epoch(when))
+
+        self.windows = {}
+        for currency, ts in times.items():
+            ts = np.sort(np.asarray(ts, dtype=np.int64))
+            self.windows[currency] = _merge(ts - self.blackout, ts + self.blackout)
+
+        self._symbols = {}
+
+    @classmethod
+    def load(cls, path, blackout_minutes=BLACKOUT_MINUTES, extra=()):
+        """
+        Reads a `time,currency,impact[,title]` CSV (header optional);
+        only HIGH impact rows are kept. A missing file gives an
+        empty calendar.
+        """
+        events = list(extra)
+        if os.path.exists(path):
+            with open(path, newline="") as f:
+                for row in csv.reader(f):
+                    if len(row) < 3 or row[0].strip().lower() == "time":
+                        continue
+                    if row[2].strip().upper() != "HIGH":
+                        continue
+                    events.append((row[1].strip(), row[0].strip()))
+        return cls(events, blackout_minutes)
+
+    def __len__(self):
+        return sum(len(s) for s, _ in self.windows.values())
+
+    # -------------------------------------------------
+    def currencies(self, symbol: str) -> list:
+        found = self._symbols.get(symbol)
+        if found is None:
+            letters = re.sub("[^A-Z]", "", symbol.upper())[:6]
+            found = self._symbols[symbol] = [
+                c for c in (letters[:3], letters[3:6]) if c in self.windows
+            ]
+        return found
+
+    def in_blackout(self, symbol: str, when) -> bool:
+        t = _epoch(when)
+        for currency in self.currencies(symbol):
+            starts, ends = self.windows[currency]
+            k = int(np.searchsorted(starts, t, side="right")) - 1
+            if k >= 0 and t <= ends[k]:
+                return True
+        return False
+
+    def mask(self, symbol: str, times) -> np.ndarray:
+        """
+        Vectorized in_blackout() over epoch seconds (or datetimes).
+        """
+        times = epoch_seconds(times)
+        out = np.zeros(len(times), dtype=bool)
+        for currency in self.currencies(symbol):
+            starts, ends = self.windows[currency]
+            if not len(starts):
+                continue
+            k = np.searchsorted(starts, times, side="right") - 1
+            out |= (k >= 0) & (times <= ends[np.maximum(k, 0)])
+        return out
+
+
+# =============================
+# HELPERS
+# =============================
+def _epoch(value) -> int:
+    if isinstance(value, datetime):
+        if value.tzinfo is None:       # naive = UTC
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp())
+    if isinstance(value, (int, np.integer, float)):
+        return int(value)
+    if isinstance(value, str) and value.isdigit():
+        return int(value)
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is None:
+        ts = ts.tz_localize("UTC")
+    return int(ts.timestamp())
+
+
+def _merge(starts, ends):
+    """
+    Sorted starts → disjoint (starts, ends) covering the same time.
+    """
+    if not len(starts):
+        return starts, ends
+
+    # a new interval begins where the start passes every earlier end
+    reach = np.maximum.accumulate(ends)
+    new = np.r_[True, starts[1:] > reach[:-1]]
+    first = np.flatnonzero(new)
+    last = np.r_[first[1:] - 1, len(starts) - 1]
+    return starts[first], reach[last]
+
+
+# =============================
+# SHARED CALENDAR
+# =============================
+_calendar = None
+
+
+def calendar() -> NewsCalendar:
+    """
+    The calendar file + HIGH_IMPACT_EVENTS, loaded once.
+    """
+    global _calendar
+    if _calendar is None:
+        _calendar = NewsCalendar.load(NEWS_CALENDAR_FILE, extra=HIGH_IMPACT_EVENTS)
+    return _calendar
 
 
 def in_news_blackout(symbol, now=None):
@@ -17,13 +152,9 @@ def in_news_blackout(symbol, now=None):
     Returns True if within blackout window of high-impact news
     """
     if now is None:
-        now = datetime.utcnow()
-
-    currency = symbol[:3]  # EURUSD → EUR
+        now = datetime.now(timezone.utc)
+    return calendar().in_blackout(symbol, now)
 
-    for curr, event_time in HIGH_IMPACT_EVENTS:
-        if curr in symbol:
-            if abs((now - event_time).total_seconds()) <= BLACKOUT_MINUTES * 60:
-                return True
 
-    return False
+def news_mask(symbol, times):
+    return calendar().mask(symbol, times)
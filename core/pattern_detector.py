@@ -1,11 +1,12 @@
 # core/pattern_detector.py
 
-import MetaTrader5 as mt5
+from core.mt5_api import mt5
 import pandas as pd
 from dataclasses import dataclass
 from datetime import datetime
 
 from config.settings import SYMBOL, LTF
+from core.swings import SwingIndex
 
 
 @dataclass
@@ -17,10 +18,30 @@ class PatternSignal:
 
 
 class PatternDetector:
-    def __init__(self, symbol: str, pdh: float, pdl: float):
+    def __init__(self, symbol: str, pdh: float = None, pdl: float = None, levels=None):
+        """
+        Fixed pdh / pdl, or a DailyLevels service that rolls them
+        over at each UTC day boundary.
+        """
         self.symbol = symbol
-        self.pdh = pdh
-        self.pdl = pdl
+        self.levels = levels
+        self._pdh = pdh
+        self._pdl = pdl
+
+        self._swing_df = None
+        self._swing_index = None
+
+    @property
+    def pdh(self):
+        if self.levels is not None:
+            return self.levels.get()[0]
+        return self._pdh
+
+    @property
+    def pdl(self):
+        if self.levels is not None:
+            return self.levels.get()[1]
+        return self._pdl
 
     # -------------------------------------------------
     def fetch_m5(self, bars=200):
@@ -34,19 +55,26 @@ class PatternDetector:
         df["time"] = pd.to_datetime(df["time"], unit="s")
         return df
 
+    # -------------------------------------------------
+    def swing_index(self, df) -> SwingIndex:
+        """
+        2-bar swing index, built once per fetched frame and shared
+        by both pattern checks.
+        """
+        if self._swing_df is not df:
+            self._swing_df = df
+            self._swing_index = SwingIndex(
+                df["high"].to_numpy(), df["low"].to_numpy(), order=2
+            )
+        return self._swing_index
+
     # -------------------------------------------------
     def detect_swing_highs(self, df):
-        swings = []
-        for i in range(2, len(df) - 2):
-            high = df.loc[i, "high"]
-            if (
-                high > df.loc[i - 1, "high"] and
-                high > df.loc[i - 2, "high"] and
-                high > df.loc[i + 1, "high"] and
-                high > df.loc[i + 2, "high"]
-            ):
-                swings.append((i, high))
-        return swings
+        high = df["high"].to_numpy()
+        return [
+            (int(i), high[i])
+            for i in self.swing_index(df).swing_highs()
+        ]
 
     # -------------------------------------------------
     def detect_inducements(self, df, direction="SELL"):
@@ -68,8 +96,9 @@ class PatternDetector:
     # -------------------------------------------------
     def pattern_1_sell(self, df):
         inducements = self.detect_inducements(df, "SELL")
+        pdh = self.pdh
 
-        post_pdh = [(i, lvl) for i, lvl in inducements if lvl > self.pdh]
+        post_pdh = [(i, lvl) for i, lvl in inducements if lvl > pdh]
 
         if len(post_pdh) < 2:
             return None
@@ -91,9 +120,10 @@ class PatternDetector:
     # -------------------------------------------------
     def pattern_2_sell(self, df):
         inducements = self.detect_inducements(df, "SELL")
+        pdh = self.pdh
 
-        post_pdh = [(i, lvl) for i, lvl in inducements if lvl > self.pdh]
-        pre_pdh = [(i, lvl) for i, lvl in inducements if lvl < self.pdh]
+        post_pdh = [(i, lvl) for i, lvl in inducements if lvl > pdh]
+        pre_pdh = [(i, lvl) for i, lvl in inducements if lvl < pdh]
 
         if not post_pdh or not pre_pdh:
             return None
@@ -120,7 +150,7 @@ class PatternDetector:
         df = self.fetch_m5()
 
         # SELL side (PDH logic)
-        if df.iloc[-1]["close"] > self.pdh:
+        if self.pdh is not None and df.iloc[-1]["close"] > self.pdh:
             p1 = self.pattern_1_sell(df)
             if p1:
                 return p1
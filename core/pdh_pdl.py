@@ -1,36 +1,24 @@
 # core/pdh_pdl.py
 
-import MetaTrader5 as mt5
+from core.mt5_api import mt5
+
+from core.daily_levels import DailyLevels
 
-from datetime import datetime, timedelta
-import pandas as pd
 
 class DailyLiquidity:
-    def __init__(self, symbol):
+    def __init__(self, symbol, levels: DailyLevels | None = None):
         self.symbol = symbol
+        self.levels = levels or DailyLevels(symbol, mt5)
+
+    @property
+    def used_levels(self):
+        return self.levels.used_levels
 
     def fetch_pdh_pdl(self):
         """
-        LIVE MODE: previous day relative to today
+        LIVE MODE: previous day relative to today (cached per day)
         """
-        today = datetime.utcnow().date()
-        prev_day = today - timedelta(days=1)
-
-        start = datetime.combine(prev_day, datetime.min.time())
-        end = datetime.combine(prev_day, datetime.max.time())
-
-        rates = mt5.copy_rates_range(
-            self.symbol,
-            mt5.TIMEFRAME_H1,
-            datetime.combine(prev_day, datetime.min.time()),
-            datetime.combine(prev_day, datetime.max.time())
-        )
-
-        df = pd.DataFrame(rates)
-        pdh = df["high"].max()
-        pdl = df["low"].min()
-
-        return pdh, pdl
+        return self.levels.get()
 
     def is_taken_by_close(self, level, direction="UP"):
         rates = mt5.copy_rates_from_pos(
@@ -48,7 +36,7 @@ class DailyLiquidity:
             return last_close < level
 
     def mark_used(self, level):
-        self.used_levels.add(round(level, 5))
+        self.levels.mark_used(level)
 
     def is_unused(self, level):
-        return round(level, 5) not in self.used_levels
+        return self.levels.is_unused(level)
@@ -1,6 +1,6 @@
 # core/risk_manager.py
 
-import MetaTrader5 as mt5
+from core.mt5_api import mt5
 import math
 from typing import Optional
 
@@ -1,16 +1,19 @@
+from core.bars import Bars, column
+
+
 def is_swing_low(df, i):
     if i <= 0 or i >= len(df) - 1:
         return False
-    return (
-        df.iloc[i]["low"] < df.iloc[i - 1]["low"]
-        and df.iloc[i]["low"] < df.iloc[i + 1]["low"]
-    )
+    if isinstance(df, Bars):
+        return df.swings().is_swing_low(i)
+    low = column(df, "low")
+    return bool(low[i] < low[i - 1] and low[i] < low[i + 1])
 
 
 def is_swing_high(df, i):
     if i <= 0 or i >= len(df) - 1:
         return False
-    return (
-        df.iloc[i]["high"] > df.iloc[i - 1]["high"]
-        and df.iloc[i]["high"] > df.iloc[i + 1]["high"]
-    )
+    if isinstance(df, Bars):
+        return df.swings().is_swing_high(i)
+    high = column(df, "high")
+    return bool(high[i] > high[i - 1] and high[i] > high[i + 1])
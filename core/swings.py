@@ -0,0 +1,147 @@
+# core/swings.py
+
+import numpy as np
+
+
+class SwingIndex:
+    """
+    Swing highs / lows for a whole bar array.
+
+    A bar i is a swing high when its high is strictly above the
+    `order` bars on each side (swing low: low strictly below).
+    order=1 → core.structure definition, order=2 → PatternDetector.
+
+    Built in one vectorized pass, then extended in O(order) per
+    appended bar. Bars without `order` right-hand neighbours yet are
+    not swings.
+    """
+
+    def __init__(self, high, low, order: int = 1):
+        self.order = order
+
+        n = len(high)
+        capacity = max(64, n * 2)
+
+        self._high = np.empty(capacity, dtype=np.float64)
+        self._low = np.empty(capacity, dtype=np.float64)
+        self._is_high = np.zeros(capacity, dtype=bool)
+        self._is_low = np.zeros(capacity, dtype=bool)
+        self._prev_high = np.full(capacity, -1, dtype=np.int64)
+        self._prev_low = np.full(capacity, -1, dtype=np.int64)
+        self._n = n
+
+        self._high[:n] = high
+        self._low[:n] = low
+
+        if n > 2 * order:
+            h = self._high[:n]
+            l = self._low[:n]
+            core = slice(order, n - order)
+            sh = np.ones(n - 2 * order, dtype=bool)
+            sl = np.ones(n - 2 * order, dtype=bool)
+
+            for k in range(1, order + 1):
+                sh &= h[core] > h[order - k:n - order - k]
+                sh &= h[core] > h[order + k:n - order + k]
+                sl &= l[core] < l[order - k:n - order - k]
+                sl &= l[core] < l[order + k:n - order + k]
+
+            self._is_high[core] = sh
+            self._is_low[core] = sl
+
+        idx = np.arange(n)
+        self._prev_high[:n] = np.maximum.accumulate(
+            np.where(self._is_high[:n], idx, -1)
+        )
+        self._prev_low[:n] = np.maximum.accumulate(
+            np.where(self._is_low[:n], idx, -1)
+        )
+
+    # -------------------------------------------------
+    @classmethod
+    def from_bars(cls, bars, order: int = 1) -> "SwingIndex":
+        return cls(bars.high, bars.low, order)
+
+    def __len__(self) -> int:
+        return self._n
+
+    @property
+    def is_high(self) -> np.ndarray:
+        return self._is_high[:self._n]
+
+    @property
+    def is_low(self) -> np.ndarray:
+        return self._is_low[:self._n]
+
+    # -------------------------------------------------
+    def is_swing_high(self, i: int) -> bool:
+        return 0 <= i < self._n and bool(self._is_high[i])
+
+    def is_swing_low(self, i: int) -> bool:
+        return 0 <= i < self._n and bool(self._is_low[i])
+
+    def prev_swing_high(self, i: int) -> int:
+        """
+        Index of the last confirmed swing high strictly before i, or -1.
+        """
+        if i <= 0:
+            return -1
+        return int(self._prev_high[min(i, self._n) - 1])
+
+    def prev_swing_low(self, i: int) -> int:
+        """
+        Index of the last confirmed swing low strictly before i, or -1.
+        """
+        if i <= 0:
+            return -1
+        return int(self._prev_low[min(i, self._n) - 1])
+
+    def swing_highs(self) -> np.ndarray:
+        return np.flatnonzero(self.is_high)
+
+    def swing_lows(self) -> np.ndarray:
+        return np.flatnonzero(self.is_low)
+
+    # -------------------------------------------------
+    def append(self, high: float, low: float):
+        """
+        Adds one bar; confirms (or rejects) the bar `order` positions back.
+        """
+        if self._n == len(self._high):
+            self._grow()
+
+        n = self._n
+        self._high[n] = high
+        self._low[n] = low
+        self._prev_high[n] = self._prev_high[n - 1] if n else -1
+        self._prev_low[n] = self._prev_low[n - 1] if n else -1
+        self._n = n + 1
+
+        j = n - self.order
+        if j < self.order:
+            return
+
+        lo, hi = j - self.order, j + self.order + 1
+        h = self._high[lo:hi]
+        l = self._low[lo:hi]
+        others = np.arange(hi - lo) != self.order
+
+        if np.all(h[self.order] > h[others]):
+            self._is_high[j] = True
+            self._prev_high[j:n + 1] = j
+
+        if np.all(l[self.order] < l[others]):
+            self._is_low[j] = True
+            self._prev_low[j:n + 1] = j
+
+    def _grow(self):
+        size = len(self._high) * 2
+        for name in (
+            "_high", "_low", "_is_high", "_is_low", "_prev_high", "_prev_low"
+        ):
+            old = getattr(self, name)
+            new = np.empty(size, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+        self._is_high[self._n:] = False
+        self._is_low[self._n:] = False
@@ -0,0 +1,70 @@
+# core/trade_state.py
+
+
+class TradeState:
+    """
+    Shared snapshot of the account's open positions and pending
+    orders.
+
+    refresh() costs one positions_get() and one orders_get() for the
+    whole account; the live loop calls it once per cycle and every
+    reader (order executor, breakeven, flip, portfolio limit) filters
+    the cached tuples instead of asking the terminal again.
+
+    invalidate() marks the snapshot stale after a trade event (order
+    placed, SL moved, deal seen); the next read refreshes it.
+    """
+
+    def __init__(self, mt5):
+        self.mt5 = mt5
+        self._positions = ()
+        self._orders = ()
+        self.stale = True
+        self.refreshes = 0
+
+    # -------------------------------------------------
+    def refresh(self):
+        self._positions = tuple(self.mt5.positions_get() or ())
+        self._orders = tuple(self.mt5.orders_get() or ())
+        self.stale = False
+        self.refreshes += 1
+
+    def invalidate(self):
+        self.stale = True
+
+    def _fresh(self):
+        if self.stale:
+            self.refresh()
+
+    # -------------------------------------------------
+    # QUERIES
+    # -------------------------------------------------
+    def positions(self, symbol=None, magics=None) -> list:
+        self._fresh()
+        return _select(self._positions, symbol, magics)
+
+    def orders(self, symbol=None, magics=None) -> list:
+        self._fresh()
+        return _select(self._orders, symbol, magics)
+
+    def position(self, ticket):
+        self._fresh()
+        for p in self._positions:
+            if p.ticket == ticket:
+                return p
+        return None
+
+    def open_count(self, symbol=None, magics=None) -> int:
+        """
+        Positions + pending orders (a pending limit will fill into a
+        position, so it takes a slot too).
+        """
+        return len(self.positions(symbol, magics)) + len(self.orders(symbol, magics))
+
+
+def _select(items, symbol, magics) -> list:
+    return [
+        x for x in items
+        if (symbol is None or x.symbol == symbol)
+        and (magics is None or x.magic in magics)
+    ]
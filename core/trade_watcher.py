@@ -1,22 +1,19 @@
-import MetaTrader5 as mt5
+from core.mt5_api import mt5
+
+from core.deal_tracker import DealTracker
+
 
 class TradeWatcher:
-    def __init__(self, magic):
+    def __init__(self, magic, tracker: DealTracker | None = None):
         self.magic = magic
-        self.checked_tickets = set()
+        self.tracker = tracker or DealTracker(mt5)
+        self._seq = 0  # last closing deal already checked
 
     def check_sl_hit(self):
-        deals = mt5.history_deals_get(0, mt5.time_current())
-        if deals is None:
-            return None
-
-        for d in deals:
-            if d.magic != self.magic:
-                continue
-            if d.ticket in self.checked_tickets:
-                continue
+        self.tracker.poll()
 
-            self.checked_tickets.add(d.ticket)
+        for seq, d in self.tracker.closes_since(self.magic, self._seq):
+            self._seq = seq
 
             # SL hit = negative profit & reason DEAL_REASON_SL
             if d.profit < 0 and d.reason == mt5.DEAL_REASON_SL:
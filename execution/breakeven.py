@@ -1,48 +1,113 @@
 # execution/breakeven.py
 
-import MetaTrader5 as mt5
-from typing import Optional
+from core.mt5_api import mt5
+import numpy as np
 
 from config.settings import BE_RR
 
 
 class BreakEvenManager:
-    def __init__(self, symbol: str):
+    """
+    Moves stops to entry once a position is `be_rr` R in profit
+    (optionally only positions with one of `magics`).
+
+    R is the position's original risk, remembered the first time the
+    position is seen (after the move, |entry - sl| is zero). Every
+    open position (one symbol, or all of them with symbol=None) is
+    checked in one vectorized pass against one tick per symbol.
+
+    Each position gets at most one SL modification per trigger: it
+    stays in flight until the snapshot shows the stop at entry, and a
+    rejected move is retried only after price falls back below the
+    trigger and crosses it again.
+    """
+
+    def __init__(self, symbol: str = None, state=None, be_rr=BE_RR, magics=None):
         self.symbol = symbol
+        self.magics = magics
+        self.state = state      # shared TradeState; None = ask the terminal
+        self.be_rr = be_rr
+
+        self.risk = {}          # ticket → original |entry - sl|
+        self.in_flight = set()  # tickets with a modification sent
 
     # -------------------------------------------------
-    def manage(self):
-        positions = mt5.positions_get(symbol=self.symbol)
-        if positions is None:
-            return
-
-        for pos in positions:
-            entry = pos.price_open
-            sl = pos.sl
-            tp = pos.tp
-            current = pos.price_current
-
-            # Calculate R
-            risk = abs(entry - sl)
-            reward = abs(current - entry)
-
-            if risk <= 0:
-                continue
-
-            rr = reward / risk
-
-            # Move SL to BE
-            if rr >= BE_RR:
-                if (
-                    (pos.type == mt5.POSITION_TYPE_BUY and sl < entry) or
-                    (pos.type == mt5.POSITION_TYPE_SELL and sl > entry)
-                ):
-                    self._move_sl_to_be(pos, entry)
+    def _positions(self):
+        if self.state is not None:
+            return self.state.positions(self.symbol, self.magics)
+        if self.symbol is None:
+            positions = mt5.positions_get() or ()
+        else:
+            positions = mt5.positions_get(symbol=self.symbol) or ()
+        if self.magics is None:
+            return positions
+        return [p for p in positions if p.magic in self.magics]
+
+    def manage(self) -> list:
+        """
+        Returns the tickets whose stop was moved.
+        """
+        positions = list(self._positions())
+
+        # forget closed positions
+        live = {p.ticket for p in positions}
+        for ticket in [t for t in self.risk if t not in live]:
+            del self.risk[ticket]
+        self.in_flight &= live
+
+        if not positions:
+            return []
+
+        for p in positions:
+            if p.ticket not in self.risk and p.sl:
+                self.risk[p.ticket] = abs(p.price_open - p.sl)
+
+        n = len(positions)
+        entry = np.fromiter((p.price_open for p in positions), float, n)
+        sl = np.fromiter((p.sl for p in positions), float, n)
+        risk = np.fromiter((self.risk.get(p.ticket, 0.0) for p in positions), float, n)
+        buy = np.fromiter((p.type == mt5.POSITION_TYPE_BUY for p in positions), bool, n)
+        flying = np.fromiter((p.ticket in self.in_flight for p in positions), bool, n)
+
+        # one tick per symbol; a buy closes at bid, a sell at ask
+        ticks = {}
+        for p in positions:
+            if p.symbol not in ticks:
+                ticks[p.symbol] = mt5.symbol_info_tick(p.symbol)
+        current = np.fromiter(
+            (
+                np.nan if ticks[p.symbol] is None
+                else ticks[p.symbol].bid if b else ticks[p.symbol].ask
+                for p, b in zip(positions, buy)
+            ),
+            float, n,
+        )
+
+        reward = np.where(buy, current - entry, entry - current)
+        triggered = (risk > 0) & (reward >= self.be_rr * risk)
+        at_entry = np.where(buy, sl >= entry, (sl > 0) & (sl <= entry))
+
+        # re-arm positions that fell back below the trigger
+        for k in np.flatnonzero(flying & ~triggered & ~at_entry):
+            self.in_flight.discard(positions[k].ticket)
+        # confirmed moves are no longer in flight
+        for k in np.flatnonzero(flying & at_entry):
+            self.in_flight.discard(positions[k].ticket)
+
+        moved = []
+        for k in np.flatnonzero(triggered & ~at_entry & ~flying):
+            pos = positions[k]
+            self.in_flight.add(pos.ticket)
+            if self._move_sl_to_be(pos, pos.price_open):
+                moved.append(pos.ticket)
+
+        return moved
 
     # -------------------------------------------------
-    def _move_sl_to_be(self, pos, entry):
+    def _move_sl_to_be(self, pos, entry) -> bool:
         request = {
             "action": mt5.TRADE_ACTION_SLTP,
+            "symbol": pos.symbol,
             "position": pos.ticket,
             "sl": entry,
             "tp": pos.tp,
@@ -51,4 +116,10 @@ class BreakEvenManager:
         result = mt5.order_send(request)
 
         if result and result.retcode == mt5.TRADE_RETCODE_DONE:
+            if self.state is not None:
+                self.state.invalidate()
             print(f"🔒 SL moved to BE | Ticket {pos.ticket}")
+            return True
+
+        print(f"❌ BE move failed | Ticket {pos.ticket}")
+        return False
@@ -1,19 +1,27 @@
 # execution/orders.py
 
-import MetaTrader5 as mt5
+from core.mt5_api import mt5
 from typing import Optional
 
 from config.settings import PRIMARY_MAGIC, FLIP_MAGIC, SLIPPAGE, MAX_OPEN_TRADES
 
 
 class OrderExecutor:
-    def __init__(self, symbol: str):
+    def __init__(self, symbol: str, state=None):
         self.symbol = symbol
+        self.state = state      # shared TradeState; None = ask the terminal
 
     # -------------------------------------------------
     def _has_open_trade(self) -> bool:
-        positions = mt5.positions_get(symbol=self.symbol)
-        return positions is not None and len(positions) >= MAX_OPEN_TRADES
+        """
+        Positions and pending orders on the symbol both take a slot.
+        """
+        if self.state is not None:
+            return self.state.open_count(self.symbol) >= MAX_OPEN_TRADES
+
+        positions = mt5.positions_get(symbol=self.symbol) or ()
+        orders = mt5.orders_get(symbol=self.symbol) or ()
+        return len(positions) + len(orders) >= MAX_OPEN_TRADES
 
     # -------------------------------------------------
     def place_limit(
@@ -63,5 +71,8 @@ class OrderExecutor:
             print(f"❌ Order failed: {result.retcode}")
             return None
 
+        if self.state is not None:
+            self.state.invalidate()
+
         print(f"✅ LIMIT ORDER ACCEPTED | Ticket: {result.order}")
         return result.order
@@ -0,0 +1,354 @@
+# live/engine.py
+
+from datetime import datetime, timezone, timedelta
+
+from core.mt5_api import mt5
+
+from config.settings import MAX_OPEN_TRADES, PRIMARY_MAGIC, FLIP_MAGIC
+from core.clock import SystemClock
+from core.bar_feed import BarFeed
+from core.daily_levels import DailyLevels
+from core.deal_tracker import DealTracker
+from core.trade_state import TradeState
+from core.latency import LatencyRecorder
+from core.mt5_connector import connect
+from core.session_filter import in_session, get_session
+from core.news_blackout import in_news_blackout
+from core.double_break_detector import DoubleBreakDetector
+from core.entry_engine import EntryEngine
+from core.risk_manager import RiskManager
+from execution.orders import OrderExecutor
+from execution.breakeven import BreakEvenManager
+from core.event_context import EventContext
+from core.event_logger import (
+    log_levels,
+    log_pdh_taken,
+    log_pdl_taken,
+    log_double_break,
+    log_entry,
+    log_flip,
+    flush_journal,
+)
+from core.notifier import send
+from live.scheduler import BarCloseScheduler, server_offset
+
+
+# =============================
+# CONFIG
+# =============================
+ENABLE_FLIP = True
+CHECK_INTERVAL = 10   # breakeven / flip monitoring between bar closes
+
+M5_BARS = 300
+H1_BARS = 72
+
+MIN_RR = 5
+BOT_MAGICS = (PRIMARY_MAGIC, FLIP_MAGIC)
+
+
+class SymbolState:
+    """
+    Everything the engine keeps per symbol: event, levels and the
+    plan / sizing / order helpers. Bars live in the shared feed.
+    """
+
+    def __init__(self, symbol: str, trades: TradeState):
+        self.symbol = symbol
+        self.levels = DailyLevels(symbol, mt5)
+        self.event = EventContext()
+        self.entry_engine = EntryEngine(symbol)
+        self.risk_manager = RiskManager(symbol)
+        self.executor = OrderExecutor(symbol, trades)
+        self.last_levels_date = None
+
+
+class LiveEngine:
+    """
+    One process, one terminal connection, many symbols.
+
+    Each M5 close wakes the engine once. It then polls the bar feed
+    for every symbol, refreshes the shared position / order snapshot
+    once, and runs the per-symbol pipeline on the newly closed bars.
+    MAX_OPEN_TRADES caps bot positions + pending orders across the
+    whole portfolio.
+
+    `latency` (core/latency.LatencyRecorder) times each stage from
+    bar close to order placement; the default one is disabled.
+    """
+
+    def __init__(self, symbols, clock=None, latency=None):
+        self.symbols = list(symbols)
+        self.clock = clock or SystemClock()
+        self.latency = latency or LatencyRecorder(enabled=False)
+        self.close = None
+
+        self.feed = None
+        self.deals = None
+        self.trades = TradeState(mt5)
+        self.breakeven = BreakEvenManager(state=self.trades, magics=BOT_MAGICS)
+        self.scheduler = None
+        self.states = {}
+
+    # -------------------------------------------------
+    def start(self):
+        connect(self.symbols)
+        now = self.clock.now()
+
+        self.feed = BarFeed(mt5)
+        for symbol in self.symbols:
+            self.feed.subscribe(symbol, mt5.TIMEFRAME_M5, M5_BARS)
+            self.feed.subscribe(symbol, mt5.TIMEFRAME_H1, H1_BARS)
+            self.states[symbol] = SymbolState(symbol, self.trades)
+
+        self.deals = DealTracker(mt5, start=now - timedelta(hours=12))
+        self.scheduler = BarCloseScheduler(
+            self.clock, server_offset=server_offset(mt5, self.symbols[0], now)
+        )
+
+        send(
+            "🚀 *Live Demo Trading Started*\n"
+            f"Symbols: {', '.join(self.symbols)}\n"
+            "Risk: $3000\n"
+            "TP: Previous-Day PDH / PDL\n"
+            "Flip: LIMIT | RR ≥ 5"
+        )
+
+    def run(self):
+        self.start()
+        while True:
+            self.close = self.scheduler.wait(monitor=self.monitor, interval=CHECK_INTERVAL)
+            mt5.begin_cycle()   # per-cycle terminal call budgets
+            with self.latency.stage("cycle"):
+                self.on_close(self.clock.now())
+            flush_journal()   # one group commit per cycle
+            self.latency.maybe_export()
+
+    # -------------------------------------------------
+    # PORTFOLIO
+    # -------------------------------------------------
+    def can_open(self) -> bool:
+        return self.trades.open_count(magics=BOT_MAGICS) < MAX_OPEN_TRADES
+
+    # -------------------------------------------------
+    # BAR CLOSE
+    # -------------------------------------------------
+    def utc(self, server_time: int) -> datetime:
+        """
+        A terminal timestamp (bar open, deal time: broker server
+        time) as a UTC datetime.
+        """
+        return datetime.fromtimestamp(
+            int(server_time) - self.scheduler.server_offset, timezone.utc
+        )
+
+    def tradable(self, symbol: str, bar_time: int) -> bool:
+        """
+        The bar opened in session and outside a news blackout (the
+        backtester's tradable mask, one bar at a time).
+        """
+        t = self.utc(bar_time)
+        return in_session(t) and not in_news_blackout(symbol, t)
+
+    def on_close(self, now: datetime):
+        with self.latency.stage("positions"):
+            self.trades.refresh()
+        with self.latency.stage("breakeven"):
+            self.breakeven.manage()
+
+        for symbol, state in self.states.items():
+            # poll every close, in session or not, so closed bars never
+            # pile up into a catch-up batch
+            with self.latency.stage("rates"):
+                new = self.feed.poll(symbol, mt5.TIMEFRAME_M5)
+                self.feed.poll(symbol, mt5.TIMEFRAME_H1)
+
+            # closed bars only (views into the ring buffers)
+            m5 = self.feed.bars(symbol, mt5.TIMEFRAME_M5)
+            h1 = self.feed.bars(symbol, mt5.TIMEFRAME_H1)
+
+            if new == 0 or len(m5) == 0 or len(h1) == 0:
+                continue
+
+            # every bar that closed since the last wake-up, oldest first,
+            # gated on its own time (not the wake-up time)
+            bars = [
+                i for i in range(len(m5) - min(new, len(m5)), len(m5))
+                if self.tradable(symbol, int(m5.time[i]))
+            ]
+            if not bars:
+                continue
+
+            with self.latency.stage("levels"):
+                pdh, pdl = state.levels.get(now, h1)
+            if pdh is None:
+                continue
+
+            today = now.date()
+            if state.last_levels_date != today:
+                log_levels(symbol, pdh, pdl)
+                state.last_levels_date = today
+
+            for i in bars:
+                self.on_bar(state, m5, i, pdh, pdl)
+
+        self.check_flips()
+
+    def on_bar(self, state: SymbolState, m5, i, pdh, pdl):
+        symbol = state.symbol
+        event = state.event
+        levels = state.levels
+        bar_time = self.utc(m5.time[i])
+
+        # an event whose detector expired without a signal ends here;
+        # its level stays used for the day
+        if event.active and event.allow_primary and event.detector.completed:
+            event.resolve()
+
+        # =============================
+        # ARM EVENT
+        # =============================
+        if not event.active:
+            if m5.high[i] >= pdh and levels.is_unused(pdh):
+                levels.mark_used(pdh)
+                event.arm(
+                    detector=DoubleBreakDetector(pdh, "SELL"),
+                    direction="SELL",
+                    flip_direction="BUY",
+                    tp=pdl,
+                    session=get_session(bar_time),
+                )
+                log_pdh_taken(symbol, m5.high[i], pdh)
+
+            elif m5.low[i] <= pdl and levels.is_unused(pdl):
+                levels.mark_used(pdl)
+                event.arm(
+                    detector=DoubleBreakDetector(pdl, "BUY"),
+                    direction="BUY",
+                    flip_direction="SELL",
+                    tp=pdh,
+                    session=get_session(bar_time),
+                )
+                log_pdl_taken(symbol, m5.low[i], pdl)
+
+        # =============================
+        # PRIMARY
+        # =============================
+        if not event.allow_primary:
+            return
+
+        with self.latency.stage("detector"):
+            idx = event.detector.update(m5, i)
+        if idx is None:
+            return
+
+        with self.latency.stage("plan"):
+            state.entry_engine.update(m5, idx)
+            plan = state.entry_engine.build_trade_plan(
+                type("Signal", (), {"direction": event.direction})(),
+                event.tp_level,
+            )
+
+        if not plan.valid:
+            event.resolve()
+            return
+
+        rr = abs(event.tp_level - plan.entry_price) / abs(
+            plan.entry_price - plan.stop_loss
+        )
+
+        if rr < MIN_RR or not self.can_open():
+            event.resolve()
+            return
+
+        with self.latency.stage("lot_size"):
+            lot = state.risk_manager.calculate_lot_size(
+                plan.entry_price, plan.stop_loss
+            )
+
+        with self.latency.stage("order_send"):
+            ticket = state.executor.place_limit(
+                plan.direction,
+                lot,
+                plan.entry_price,
+                plan.stop_loss,
+                event.tp_level,
+                is_flip=False
+            )
+
+        if ticket:
+            if self.close is not None:
+                self.latency.record(
+                    "close_to_order", (self.clock.now() - self.close).total_seconds()
+                )
+            with self.latency.stage("notify"):
+                log_double_break(symbol, event.direction, event.detector.breaks)
+                log_entry(
+                    symbol, plan.direction,
+                    plan.entry_price, plan.stop_loss, event.tp_level, rr
+                )
+            event.primary_placed(ticket)
+
+    # -------------------------------------------------
+    # BETWEEN CLOSES (cheap: no bar reads)
+    # -------------------------------------------------
+    def monitor(self):
+        self.breakeven.manage()
+        self.check_flips()
+
+    def check_flips(self):
+        now = self.clock.now()
+        if not ENABLE_FLIP or not in_session(now):
+            return
+
+        watching = [s for s in self.states.values() if s.event.allow_flip]
+        if not watching:
+            return
+
+        if self.deals.poll(now):
+            self.trades.invalidate()   # something filled or closed
+        for state in watching:
+            deal = self.deals.closed(state.event.primary_ticket)
+            if deal:
+                self.on_primary_closed(state, deal)
+
+    def on_primary_closed(self, state: SymbolState, deal):
+        event = state.event
+
+        # a stop moved to entry closes with reason SL too: flip only
+        # real losses, like the backtester
+        if (
+            deal.reason == mt5.DEAL_REASON_SL and deal.profit < 0
+            and get_session(self.utc(deal.time)) == event.session
+        ):
+
+            m5 = self.feed.bars(state.symbol, mt5.TIMEFRAME_M5)
+            state.entry_engine.update(m5, len(m5) - 1)
+            plan = state.entry_engine.build_trade_plan(
+                type("Signal", (), {"direction": event.flip_direction})(),
+                event.tp_level,
+            )
+
+            if plan.valid:
+                rr = abs(event.tp_level - plan.entry_price) / abs(
+                    plan.entry_price - plan.stop_loss
+                )
+            else:
+                rr = 0
+
+            if plan.valid and rr >= MIN_RR and self.can_open():
+                lot = state.risk_manager.calculate_lot_size(
+                    plan.entry_price, plan.stop_loss
+                )
+                ticket = state.executor.place_limit(
+                    plan.direction, lot,
+                    plan.entry_price, plan.stop_loss, event.tp_level,
+                    is_flip=True
+                )
+                if ticket:
+                    log_flip(
+                        state.symbol, plan.direction,
+                        plan.entry_price, plan.stop_loss, event.tp_level, rr
+                    )
+                    event.flip_placed()
+
+        event.resolve()
@@ -0,0 +1,554 @@
+# live/replay.py
+#
+# Accelerated replay: a local stand-in for the MetaTrader5 functions the
+# bot uses, backed by cached bars, a simulated clock and a simple
+# pending-order fill engine.
+#
+#   python live/replay.py --start 2024-01-01 --end 2024-04-01
+
+import sys
+import os
+import argparse
+import math
+import types
+from datetime import datetime, timezone
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+import numpy as np
+import pandas as pd
+
+from core.bars import Bars
+from core.bar_cache import BarCache
+
+
+RATES_DTYPE = np.dtype([
+    ("time", "<i8"),
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+    ("tick_volume", "<u8"),
+    ("spread", "<i4"),
+    ("real_volume", "<u8"),
+])
+
+HISTORY_DAYS = 3  # default warm-up before the first simulated tick
+
+
+class ReplayFinished(Exception):
+    """
+    Raised by the simulated clock when the bar history is exhausted.
+    """
+
+
+# =============================
+# SIMULATED CLOCK
+# =============================
+class SimClock:
+    def __init__(self, broker):
+        self.broker = broker
+
+    def now(self) -> datetime:
+        # the broker runs on server time; the clock is UTC
+        return datetime.fromtimestamp(
+            self.broker.time - self.broker.server_offset, timezone.utc
+        )
+
+    def sleep(self, seconds: float):
+        # whole simulated seconds, always moving forward
+        self.broker.advance(self.broker.time + max(1, math.ceil(seconds)))
+
+
+# =============================
+# TERMINAL STAND-IN
+# =============================
+class ReplayMT5:
+    """
+    Drop-in for the MetaTrader5 module (install() puts it in
+    sys.modules). Constants use the real terminal values.
+
+    Bars close on the simulated clock. The forming bar at position 0
+    is built from the finer closed bars of the current period (M1 if
+    cached, else flat at the open), so the loop never sees the future.
+    Pending limit orders fill when a later bar trades through them;
+    positions then close on SL (checked first) or TP.
+
+    Bar, tick and deal times are broker server time, `server_offset`
+    seconds ahead of the UTC clock (cached bars are taken as server
+    time).
+    """
+
+    TIMEFRAME_M1 = 1
+    TIMEFRAME_M5 = 5
+    TIMEFRAME_H1 = 16385
+
+    ORDER_TYPE_BUY = 0
+    ORDER_TYPE_SELL = 1
+    ORDER_TYPE_BUY_LIMIT = 2
+    ORDER_TYPE_SELL_LIMIT = 3
+
+    POSITION_TYPE_BUY = 0
+    POSITION_TYPE_SELL = 1
+
+    TRADE_ACTION_DEAL = 1
+    TRADE_ACTION_PENDING = 5
+    TRADE_ACTION_SLTP = 6
+    TRADE_ACTION_REMOVE = 8
+
+    TRADE_RETCODE_DONE = 10009
+    TRADE_RETCODE_INVALID = 10013
+
+    ORDER_TIME_GTC = 0
+    ORDER_FILLING_RETURN = 2
+
+    DEAL_TYPE_BUY = 0
+    DEAL_TYPE_SELL = 1
+    DEAL_ENTRY_IN = 0
+    DEAL_ENTRY_OUT = 1
+    DEAL_REASON_EXPERT = 3
+    DEAL_REASON_SL = 4
+    DEAL_REASON_TP = 5
+
+    PERIODS = {1: 60, 5: 300, 16385: 3600}
+
+    def __init__(self, cache: BarCache, symbols, start=None, end=None, balance=100_000.0,
+                 server_offset=0):
+        self.symbols = list(symbols)
+        self.server_offset = int(server_offset)
+        self.bars = {}
+
+        for symbol in self.symbols:
+            m5 = cache.load(symbol, "M5")
+            if len(m5) == 0:
+                raise RuntimeError(f"No cached M5 bars for {symbol}")
+
+            h1 = cache.load(symbol, "H1")
+            m1 = cache.load(symbol, "M1")
+            self.bars[symbol] = {
+                self.TIMEFRAME_M5: m5,
+                self.TIMEFRAME_H1: h1 if len(h1) else _resample(m5, 3600),
+                self.TIMEFRAME_M1: m1 if len(m1) else None,
+            }
+
+        first = min(b[self.TIMEFRAME_M5].time[0] for b in self.bars.values())
+        last = max(b[self.TIMEFRAME_M5].time[-1] for b in self.bars.values())
+
+        self.time = _epoch(start) if start is not None else int(first) + HISTORY_DAYS * 86400
+        self.end = _epoch(end) if end is not None else int(last) + 300
+
+        self.clock = SimClock(self)
+        self.balance = float(balance)
+
+        self.orders = {}
+        self.positions = {}
+        self.deals = []
+        self._next_ticket = 1
+
+    # -------------------------------------------------
+    # terminal / account
+    # -------------------------------------------------
+    def initialize(self, *args, **kwargs):
+        return True
+
+    def shutdown(self):
+        return True
+
+    def last_error(self):
+        return (1, "Success")
+
+    def terminal_info(self):
+        return types.SimpleNamespace(connected=True, name="Replay")
+
+    def symbol_select(self, symbol, enable=True):
+        return symbol in self.bars
+
+    def account_info(self):
+        return types.SimpleNamespace(
+            login=0,
+            company="Replay",
+            currency="USD",
+            balance=self.balance,
+            equity=self.balance + sum(p.profit for p in self.positions.values()),
+        )
+
+    def symbol_info(self, symbol):
+        if symbol not in self.bars:
+            return None
+        return types.SimpleNamespace(
+            name=symbol,
+            digits=5,
+            point=0.00001,
+            trade_tick_size=0.00001,
+            trade_tick_value=1.0,
+            volume_min=0.01,
+            volume_max=100.0,
+            volume_step=0.01,
+        )
+
+    def symbol_info_tick(self, symbol):
+        rates = self.copy_rates_from_pos(symbol, self._base_tf(symbol), 0, 1)
+        if rates is None or len(rates) == 0:
+            return None
+        price = float(rates["close"][-1])
+        return types.SimpleNamespace(time=self.time, bid=price, ask=price, last=price)
+
+    # -------------------------------------------------
+    # rates
+    # -------------------------------------------------
+    def copy_rates_from_pos(self, symbol, timeframe, start_pos, count):
+        closed, forming = self._view(symbol, timeframe)
+        total = len(closed) + (forming is not None)
+
+        hi = total - start_pos
+        lo = max(0, hi - count)
+        return self._series(closed, forming, lo, hi)
+
+    def copy_rates_from(self, symbol, timeframe, date_from, count):
+        closed, forming = self._view(symbol, timeframe)
+        t = _epoch(date_from)
+
+        hi = int(np.searchsorted(closed.time, t, side="right"))
+        if forming is not None and forming["time"] <= t:
+            hi = len(closed) + 1
+        return self._series(closed, forming, max(0, hi - count), hi)
+
+    def copy_rates_range(self, symbol, timeframe, date_from, date_to):
+        closed, forming = self._view(symbol, timeframe)
+        t0, t1 = _epoch(date_from), _epoch(date_to)
+
+        lo = int(np.searchsorted(closed.time, t0, side="left"))
+        hi = int(np.searchsorted(closed.time, t1, side="right"))
+        if forming is not None and t0 <= forming["time"] <= t1:
+            hi = len(closed) + 1
+        return self._series(closed, forming, lo, hi)
+
+    def _base_tf(self, symbol):
+        m1 = self.bars[symbol][self.TIMEFRAME_M1]
+        return self.TIMEFRAME_M1 if m1 is not None else self.TIMEFRAME_M5
+
+    def _view(self, symbol, timeframe):
+        """
+        (closed Bars, forming bar record or None) as of the clock.
+        """
+        source = self.bars.get(symbol, {}).get(timeframe)
+        if source is None:
+            return Bars([], [], [], [], []), None
+
+        period = self.PERIODS[timeframe]
+        now = self.time
+
+        n_closed = int(np.searchsorted(source.time, now - period, side="right"))
+        closed = source.slice(0, n_closed)
+
+        start = now - now % period
+        k = int(np.searchsorted(source.time, start, side="left"))
+        if k >= len(source) or source.time[k] != start:
+            return closed, None
+
+        forming = np.zeros((), dtype=RATES_DTYPE)
+        forming["time"] = start
+        forming["open"] = source.open[k]
+        forming["high"] = source.open[k]
+        forming["low"] = source.open[k]
+        forming["close"] = source.open[k]
+
+        finer = self._finer(symbol, timeframe)
+        if finer is not None:
+            fine_period = self.PERIODS[finer]
+            fb = self.bars[symbol][finer]
+            a = int(np.searchsorted(fb.time, start, side="left"))
+            b = int(np.searchsorted(fb.time, now - fine_period, side="right"))
+            if b > a:
+                forming["high"] = max(forming["high"], fb.high[a:b].max())
+                forming["low"] = min(forming["low"], fb.low[a:b].min())
+                forming["close"] = fb.close[b - 1]
+
+        return closed, forming
+
+    def _finer(self, symbol, timeframe):
+        if timeframe == self.TIMEFRAME_H1:
+            return self.TIMEFRAME_M5
+        if timeframe == self.TIMEFRAME_M5 and self.bars[symbol][self.TIMEFRAME_M1] is not None:
+            return self.TIMEFRAME_M1
+        return None
+
+    def _series(self, closed, forming, lo, hi):
+        n_closed = len(closed)
+        lo_c, hi_c = min(lo, n_closed), min(hi, n_closed)
+
+        out = np.zeros(max(0, hi - lo), dtype=RATES_DTYPE)
+        m = hi_c - lo_c
+        if m > 0:
+            out["time"][:m] = closed.time[lo_c:hi_c]
+            out["open"][:m] = closed.open[lo_c:hi_c]
+            out["high"][:m] = closed.high[lo_c:hi_c]
+            out["low"][:m] = closed.low[lo_c:hi_c]
+            out["close"][:m] = closed.close[lo_c:hi_c]
+        if hi > n_closed and forming is not None and len(out):
+            out[-1] = forming
+        return out
+
+    # -------------------------------------------------
+    # orders / positions / deals
+    # -------------------------------------------------
+    def orders_get(self, symbol=None, ticket=None, group=None):
+        return tuple(
+            o for o in self.orders.values()
+            if (symbol is None or o.symbol == symbol)
+            and (ticket is None or o.ticket == ticket)
+        )
+
+    def positions_get(self, symbol=None, ticket=None, group=None):
+        return tuple(
+            p for p in self.positions.values()
+            if (symbol is None or p.symbol == symbol)
+            and (ticket is None or p.ticket == ticket)
+        )
+
+    def history_deals_get(self, date_from=None, date_to=None, group=None, position=None):
+        if position is not None:
+            return tuple(d for d in self.deals if d.position_id == position)
+
+        t0, t1 = _epoch(date_from), _epoch(date_to)
+        return tuple(d for d in self.deals if t0 <= d.time <= t1)
+
+    def order_send(self, request):
+        action = request.get("action")
+
+        if action == self.TRADE_ACTION_PENDING:
+            if request.get("type") not in (self.ORDER_TYPE_BUY_LIMIT, self.ORDER_TYPE_SELL_LIMIT):
+                return self._result(self.TRADE_RETCODE_INVALID)
+            if request.get("volume", 0) <= 0 or request.get("symbol") not in self.bars:
+                return self._result(self.TRADE_RETCODE_INVALID)
+
+            ticket = self._ticket()
+            self.orders[ticket] = types.SimpleNamespace(
+                ticket=ticket,
+                symbol=request["symbol"],
+                type=request["type"],
+                volume_current=request["volume"],
+                price_open=request["price"],
+                sl=request.get("sl", 0.0),
+                tp=request.get("tp", 0.0),
+                magic=request.get("magic", 0),
+                comment=request.get("comment", ""),
+                time_setup=self.time,
+            )
+            return self._result(self.TRADE_RETCODE_DONE, order=ticket)
+
+        if action == self.TRADE_ACTION_SLTP:
+            pos = self.positions.get(request.get("position"))
+            if pos is None:
+                return self._result(self.TRADE_RETCODE_INVALID)
+            pos.sl = request.get("sl", pos.sl)
+            pos.tp = request.get("tp", pos.tp)
+            return self._result(self.TRADE_RETCODE_DONE)
+
+        if action == self.TRADE_ACTION_REMOVE:
+            if self.orders.pop(request.get("order"), None) is None:
+                return self._result(self.TRADE_RETCODE_INVALID)
+            return self._result(self.TRADE_RETCODE_DONE)
+
+        return self._result(self.TRADE_RETCODE_INVALID)
+
+    def _ticket(self):
+        ticket = self._next_ticket
+        self._next_ticket += 1
+        return ticket
+
+    def _result(self, retcode, order=0, deal=0):
+        return types.SimpleNamespace(retcode=retcode, order=order, deal=deal, comment="")
+
+    # -------------------------------------------------
+    # fill engine
+    # -------------------------------------------------
+    def advance(self, t: int):
+        """
+        Moves the clock to `t`, filling / closing against every base
+        bar that closed on the way.
+        """
+        if t > self.end:
+            raise ReplayFinished()
+
+        bars = []
+        for symbol in self.symbols:
+            tf = self._base_tf(symbol)
+            base = self.bars[symbol][tf]
+            period = self.PERIODS[tf]
+            a = int(np.searchsorted(base.time, self.time - period, side="right"))
+            b = int(np.searchsorted(base.time, t - period, side="right"))
+            bars.extend((int(base.time[k]), symbol, base, k) for k in range(a, b))
+
+        for _, symbol, base, k in sorted(bars, key=lambda x: x[0]):
+            self._on_bar(symbol, base, k)
+
+        self.time = t
+
+    def _on_bar(self, symbol, base, k):
+        bar_time = base.time[k]
+        o, h, l, c = base.open[k], base.high[k], base.low[k], base.close[k]
+
+        for ticket, order in list(self.orders.items()):
+            if order.symbol != symbol or order.time_setup > bar_time:
+                continue
+
+            if order.type == self.ORDER_TYPE_BUY_LIMIT and l <= order.price_open:
+                self._fill(order, min(o, order.price_open), bar_time)
+            elif order.type == self.ORDER_TYPE_SELL_LIMIT and h >= order.price_open:
+                self._fill(order, max(o, order.price_open), bar_time)
+
+        for pos in list(self.positions.values()):
+            if pos.symbol != symbol:
+                continue
+
+            buy = pos.type == self.POSITION_TYPE_BUY
+
+            if pos.sl and ((buy and l <= pos.sl) or (not buy and h >= pos.sl)):
+                price = min(o, pos.sl) if buy else max(o, pos.sl)
+                self._close(pos, price, bar_time, self.DEAL_REASON_SL)
+            elif pos.tp and ((buy and h >= pos.tp) or (not buy and l <= pos.tp)):
+                self._close(pos, pos.tp, bar_time, self.DEAL_REASON_TP)
+            else:
+                pos.price_current = c
+                pos.profit = self._profit(pos, c)
+
+    def _fill(self, order, price, t):
+        del self.orders[order.ticket]
+        buy = order.type == self.ORDER_TYPE_BUY_LIMIT
+
+        pos = types.SimpleNamespace(
+            ticket=order.ticket,
+            symbol=order.symbol,
+            type=self.POSITION_TYPE_BUY if buy else self.POSITION_TYPE_SELL,
+            volume=order.volume_current,
+            price_open=price,
+            price_current=price,
+            sl=order.sl,
+            tp=order.tp,
+            magic=order.magic,
+            comment=order.comment,
+            time=int(t),
+            profit=0.0,
+        )
+        self.positions[pos.ticket] = pos
+        self._deal(pos, self.DEAL_ENTRY_IN, price, t, self.DEAL_REASON_EXPERT, 0.0)
+
+    def _close(self, pos, price, t, reason):
+        del self.positions[pos.ticket]
+        profit = self._profit(pos, price)
+        self.balance += profit
+        self._deal(pos, self.DEAL_ENTRY_OUT, price, t, reason, profit)
+
+    def _profit(self, pos, price):
+        info = self.symbol_info(pos.symbol)
+        sign = 1.0 if pos.type == self.POSITION_TYPE_BUY else -1.0
+        return sign * (price - pos.price_open) * pos.volume * (
+            info.trade_tick_value / info.trade_tick_size
+        )
+
+    def _deal(self, pos, entry, price, t, reason, profit):
+        buy = pos.type == self.POSITION_TYPE_BUY
+        opening = entry == self.DEAL_ENTRY_IN
+        self.deals.append(types.SimpleNamespace(
+            ticket=self._ticket(),
+            order=pos.ticket,
+            position_id=pos.ticket,
+            symbol=pos.symbol,
+            type=self.DEAL_TYPE_BUY if buy == opening else self.DEAL_TYPE_SELL,
+            entry=entry,
+            reason=reason,
+            price=price,
+            volume=pos.volume,
+            profit=profit,
+            magic=pos.magic,
+            time=int(t),
+            time_msc=int(t) * 1000,
+        ))
+
+    # -------------------------------------------------
+    def report(self):
+        closes = [d for d in self.deals if d.entry == self.DEAL_ENTRY_OUT]
+        print("\n📼 REPLAY FINISHED")
+        print(f"Until: {datetime.fromtimestamp(self.time, timezone.utc):%Y-%m-%d %H:%M} UTC")
+        print(f"Closed trades: {len(closes)}")
+        print(f"  SL: {sum(d.reason == self.DEAL_REASON_SL for d in closes)}")
+        print(f"  TP: {sum(d.reason == self.DEAL_REASON_TP for d in closes)}")
+        print(f"Open positions: {len(self.positions)} | pending orders: {len(self.orders)}")
+        print(f"Balance: {self.balance:,.2f}")
+
+
+# =============================
+# HELPERS
+# =============================
+def install(replay: ReplayMT5):
+    """
+    Makes `import MetaTrader5` return the stand-in. Call before any
+    bot module is imported.
+    """
+    sys.modules["MetaTrader5"] = replay
+    return replay
+
+
+def _epoch(value) -> int:
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, float):
+        return int(value)
+    return int(pd.Timestamp(value).timestamp())
+
+
+def _resample(bars: Bars, period: int) -> Bars:
+    bucket = bars.time - bars.time % period
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    ends = np.r_[starts[1:], len(bars)] - 1
+    return Bars(
+        bucket[starts],
+        bars.open[starts],
+        np.maximum.reduceat(bars.high, starts),
+        np.minimum.reduceat(bars.low, starts),
+        bars.close[ends],
+    )
+
+
+# =============================
+# RUN
+# =============================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay the live loop on cached bars")
+    parser.add_argument("--start", help="UTC start (default: 3 days into the cache)")
+    parser.add_argument("--end", help="UTC end (default: end of the cache)")
+    parser.add_argument("--cache", default=os.path.join(PROJECT_ROOT, "data", "bars"))
+    parser.add_argument("--symbols", nargs="+", help="default: config/symbols.py")
+    parser.add_argument("--latency", metavar="FILE", help="export stage latencies (Prometheus text)")
+    parser.add_argument("--server-offset", type=float, default=0.0, metavar="HOURS",
+                        help="broker server time minus UTC of the cached bars")
+    args = parser.parse_args(argv)
+
+    # the watchlist import is MT5-optional, safe before install()
+    from config.symbols import SYMBOLS
+    symbols = args.symbols or SYMBOLS
+
+    replay = install(ReplayMT5(
+        BarCache(args.cache), symbols, start=args.start, end=args.end,
+        server_offset=int(args.server_offset * 3600),
+    ))
+
+    from live import forward_test
+
+    try:
+        forward_test.run(
+            clock=replay.clock, symbols=symbols, journal_dir=None, latency_file=args.latency
+        )
+    except ReplayFinished:
+        pass
+
+    replay.report()
+
+    from core.mt5_api import mt5
+    print(mt5.format_stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# live/scheduler.py
+
+import math
+from datetime import datetime, timedelta, timezone
+
+
+M5_SECONDS = 300
+OFFSET_STEP = 900     # broker offsets are whole quarter hours
+SETTLE = 1.0          # seconds after the close before reading the bar
+
+
+def server_offset(mt5, symbol: str, now: datetime) -> int:
+    """
+    Broker server time minus UTC, in seconds, from the last tick
+    time (rounded to the nearest quarter hour). 0 if unknown.
+    """
+    tick = mt5.symbol_info_tick(symbol)
+    if tick is None or not tick.time:
+        return 0
+    diff = tick.time - now.timestamp()
+    return int(round(diff / OFFSET_STEP) * OFFSET_STEP)
+
+
+class BarCloseScheduler:
+    """
+    Wakes the live loop once per bar close.
+
+    Bars close on broker server time: a bar of `period` seconds
+    closes when (utc + server_offset) is a multiple of `period`.
+    wait() sleeps until `settle` seconds after the next close,
+    optionally calling a cheap `monitor` every `interval` seconds
+    on the way.
+    """
+
+    def __init__(self, clock, period=M5_SECONDS, server_offset=0, settle=SETTLE):
+        self.clock = clock
+        self.period = period
+        self.server_offset = server_offset
+        self.settle = settle
+
+    def next_close(self, now: datetime) -> datetime:
+        server = now.timestamp() + self.server_offset
+        close = (math.floor(server / self.period) + 1) * self.period
+        return datetime.fromtimestamp(close - self.server_offset, timezone.utc)
+
+    def wait(self, monitor=None, interval=None) -> datetime:
+        """
+        Returns the close time that was waited for.
+        """
+        close = self.next_close(self.clock.now())
+        wake = close + timedelta(seconds=self.settle)
+
+        while True:
+            left = (wake - self.clock.now()).total_seconds()
+            if left <= 0:
+                return close
+
+            if monitor is None or not interval:
+                self.clock.sleep(left)
+                continue
+
+            self.clock.sleep(min(left, interval))
+            if self.clock.now() < wake:
+                monitor()
@@ -1,29 +1,43 @@
 # logging/trade_logger.py
 
-from datetime import datetime
-import json
 import os
 
+from core.journal import Journal
+
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+JOURNAL_DIR = os.path.join(PROJECT_ROOT, "journal")   # gitignored
+
 
 class TradeLogger:
-    def __init__(self, filename="trade_log.json"):
-        self.filename = filename
-        if not os.path.exists(filename):
-            with open(filename, "w") as f:
-                json.dump([], f)
+    """
+    Thin wrapper kept for old scripts: records go to an append-only
+    Journal (JSON Lines segments + index) instead of one JSON array
+    that was re-read and re-written on every call.
 
-    # -------------------------------------------------
-    def log(self, event: str, data: dict):
-        record = {
-            "timestamp": datetime.utcnow().isoformat(),
-            "event": event,
-            "data": data
-        }
-
-        with open(self.filename, "r+") as f:
-            logs = json.load(f)
-            logs.append(record)
-            f.seek(0)
-            json.dump(logs, f, indent=2)
+    The journal directory defaults to journal/trades. The old
+    `filename` argument (`TradeLogger("trade_log.json")`) still works
+    and names a journal under journal/ after the file's stem.
+    """
+
+    def __init__(self, directory=None, filename=None, **journal_options):
+        if directory is not None and directory.endswith(".json"):
+            filename, directory = directory, None   # old positional filename
+        if directory is None:
+            name = "trades"
+            if filename is not None:
+                name = os.path.splitext(os.path.basename(filename))[0]
+            directory = os.path.join(JOURNAL_DIR, name)
 
+        self.journal = Journal(directory, **journal_options)
+
+    # -------------------------------------------------
+    def log(self, event: str, data: dict, symbol=None):
+        self.journal.write(event, data, symbol=symbol)
         print(f"🧾 LOGGED: {event}")
+
+    def query(self, **filters):
+        return self.journal.query(**filters)
+
+    def close(self):
+        self.journal.close()
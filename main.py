@@ -3,7 +3,9 @@
 from config.settings import SYMBOL
 from core.mt5_connector import connect
 from core.session_filter import session_allowed
-from core.pdh_pdl import DailyLiquidity
+from core.mt5_api import mt5
+
+from core.daily_levels import DailyLevels
 from core.news_blackout import in_news_blackout
 
 from core.pattern_detector import PatternDetector
@@ -20,23 +22,25 @@ from notifications.telegram import send
 
 connect(SYMBOL)
 
-liq = DailyLiquidity(SYMBOL)
+levels = DailyLevels(SYMBOL, mt5)
 
-pdh, pdl = liq.fetch_pdh_pdl()
+pdh, pdl = levels.get()
 print(f"PDH: {pdh}")
 print(f"PDL: {pdl}")
 
 session = session_allowed()
 print(f"Session: {session}")
 
-print("News blackout:", in_news_blackout())
+print("News blackout:", in_news_blackout(SYMBOL))
 
 
-detector = PatternDetector(SYMBOL, pdh, pdl)
+detector = PatternDetector(SYMBOL, levels=levels)
 signal = detector.detect()
 
 if signal:
     engine = EntryEngine(SYMBOL)
+    m5 = detector.fetch_m5()
+    engine.update(m5, len(m5) - 1)
 
     # TP example (for SELL, use PDL)
     tp_level = pdl if signal.direction == "SELL" else pdh
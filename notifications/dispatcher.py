@@ -0,0 +1,217 @@
+# notifications/dispatcher.py
+
+import threading
+import time
+from collections import deque
+
+import requests
+
+
+# =============================
+# PRIORITIES
+# =============================
+LOW = 0       # informational (daily levels)
+NORMAL = 1    # sweeps, structure
+HIGH = 2      # orders, flips, failures
+
+PRIORITIES = (HIGH, NORMAL, LOW)
+
+TELEGRAM_API = "https://api.telegram.org"
+MAX_TEXT = 4096             # Telegram message limit
+
+
+class TelegramDispatcher:
+    """
+    Sends Telegram messages from a background thread.
+
+    send() only enqueues and never touches the network, so the
+    trading loop can't be stalled by a slow API. The worker drains
+    the queue highest priority first over one keep-alive
+    requests.Session, at most one message per `min_interval`
+    seconds, honouring 429 retry_after and backing off on server or
+    connection errors.
+
+    The queue holds at most `max_queue` messages. When full, the
+    oldest message of a lower priority is dropped. With nothing lower
+    queued, a message of any priority is appended to the newest
+    queued message of its own priority (coalesced), or dropped if
+    there is none or the result would be too long.
+    """
+
+    def __init__(
+        self,
+        token: str,
+        chat_id: str,
+        base_url: str = TELEGRAM_API,
+        max_queue: int = 100,
+        min_interval: float = 1.0,
+        max_retries: int = 5,
+        timeout: float = 5.0,
+    ):
+        self.url = f"{base_url}/bot{token}/sendMessage"
+        self.chat_id = chat_id
+        self.max_queue = max_queue
+        self.min_interval = min_interval
+        self.max_retries = max_retries
+        self.timeout = timeout
+
+        self.session = requests.Session()
+
+        self._queues = {p: deque() for p in PRIORITIES}
+        self._size = 0
+        self._busy = False
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._last_sent = 0.0
+
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.failed = 0
+
+        self._thread = threading.Thread(
+            target=self._run, name="telegram-dispatcher", daemon=True
+        )
+        self._thread.start()
+
+    # -------------------------------------------------
+    # PRODUCER SIDE (trading thread)
+    # -------------------------------------------------
+    def send(self, message: str, priority: int = NORMAL) -> bool:
+        """
+        Queues a message. Returns False if it was dropped.
+        """
+        with self._cond:
+            if self._size >= self.max_queue:
+                merged = self._make_room(message, priority)
+                if merged is not None:
+                    return merged
+
+            self._queues[priority].append(message)
+            self._size += 1
+            self._cond.notify()
+            return True
+
+    def _make_room(self, message, priority):
+        """
+        Called with the lock held and the queue full. Evicts the
+        oldest lower-priority message if there is one (None: a slot
+        was freed); otherwise coalesces into the newest message of
+        the same priority, whatever it is (True), or drops the new
+        message (False).
+        """
+        for p in reversed(PRIORITIES):
+            if p >= priority:
+                break
+            if self._queues[p]:
+                self._queues[p].popleft()
+                self._size -= 1
+                self.dropped += 1
+                return None
+
+        same = self._queues[priority]
+        if same and len(same[-1]) + len(message) + 2 <= MAX_TEXT:
+            same[-1] = f"{same[-1]}\n\n{message}"
+            self.coalesced += 1
+            return True
+
+        self.dropped += 1
+        return False
+
+    # -------------------------------------------------
+    def flush(self, timeout: float = 10.0) -> bool:
+        """
+        Waits until everything queued has been handled.
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._size or self._busy:
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    return False
+                self._cond.wait(left)
+        return True
+
+    def close(self, timeout: float = 10.0):
+        self.flush(timeout)
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        self.session.close()
+
+    # -------------------------------------------------
+    # WORKER
+    # -------------------------------------------------
+    def _next(self):
+        with self._cond:
+            while not self._size and not self._stop.is_set():
+                self._cond.wait()
+            if self._stop.is_set():
+                return None
+
+            for p in PRIORITIES:
+                if self._queues[p]:
+                    self._size -= 1
+                    self._busy = True
+                    return self._queues[p].popleft()
+
+    def _run(self):
+        while True:
+            message = self._next()
+            if message is None:
+                return
+
+            try:
+                self._deliver(message)
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def _deliver(self, message):
+        payload = {
+            "chat_id": self.chat_id,
+            "text": message,
+            "parse_mode": "Markdown",
+            "disable_web_page_preview": True,
+        }
+        backoff = 0.5
+
+        for _ in range(self.max_retries + 1):
+            wait = self._last_sent + self.min_interval - time.monotonic()
+            if wait > 0 and self._stop.wait(wait):
+                return
+
+            self._last_sent = time.monotonic()
+            try:
+                r = self.session.post(self.url, json=payload, timeout=self.timeout)
+            except requests.RequestException as e:
+                print(f"❌ Telegram send failed: {e}")
+                retry_after = backoff
+            else:
+                if r.status_code == 200:
+                    self.sent += 1
+                    return
+
+                if r.status_code == 429:
+                    retry_after = _retry_after(r, backoff)
+                elif r.status_code >= 500:
+                    retry_after = backoff
+                else:
+                    print(f"❌ Telegram error: {r.text}")
+                    self.failed += 1
+                    return
+
+            if self._stop.wait(retry_after):
+                return
+            backoff = min(backoff * 2, 30.0)
+
+        self.failed += 1
+
+
+def _retry_after(response, default):
+    try:
+        return float(response.json()["parameters"]["retry_after"])
+    except (ValueError, KeyError, TypeError):
+        return default
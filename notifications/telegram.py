@@ -1,34 +1,41 @@
 # notifications/telegram.py
 
-import os
-import requests
+import atexit
 from datetime import datetime, timezone
+
 from config.env import env
+from notifications.dispatcher import TelegramDispatcher, LOW, NORMAL, HIGH
 
 
+BOT_TOKEN = env("TELEGRAM_BOT_TOKEN")
+CHAT_ID = env("TELEGRAM_CHAT_ID")
 
-BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
-CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
+_dispatcher = None
 
 
 def timestamp():
     return datetime.now(timezone.utc).strftime("%H:%M:%S UTC")
 
 
-def send(message: str):
-    if not TELEGRAM_TOKEN or not TELEGRAM_CHAT_ID:
+def dispatcher():
+    """
+    Process-wide background sender (None when not configured).
+    Queued messages are flushed at interpreter exit.
+    """
+    global _dispatcher
+    if _dispatcher is None and BOT_TOKEN and CHAT_ID:
+        _dispatcher = TelegramDispatcher(BOT_TOKEN, CHAT_ID)
+        atexit.register(_dispatcher.close)
+    return _dispatcher
+
+
+def send(message: str, priority: int = NORMAL):
+    """
+    Queues a Telegram message; returns immediately.
+    Safe to call from anywhere.
+    """
+    d = dispatcher()
+    if d is None:
         print("[TELEGRAM DISABLED]", message)
         return
-
-    url = f"https://api.telegram.org/bot{TELEGRAM_TOKEN}/sendMessage"
-
-    payload = {
-        "chat_id": TELEGRAM_CHAT_ID,
-        "text": message,
-        "parse_mode": "Markdown"
-    }
-
-    try:
-        requests.post(url, json=payload, timeout=5)
-    except Exception as e:
-        print("Telegram error:", e)
+    d.send(message, priority)
@@ -0,0 +1,88 @@
+# tests/test_bar_cache.py
+
+import types
+
+import numpy as np
+
+from core.bar_cache import BarCache
+
+RATES_DTYPE = [
+    ("time", "<i8"), ("open", "<f8"), ("high", "<f8"),
+    ("low", "<f8"), ("close", "<f8"), ("tick_volume", "<u8"),
+]
+
+
+def make_rates(start, count, step=300):
+    rates = np.zeros(count, dtype=RATES_DTYPE)
+    rates["time"] = start + np.arange(count) * step
+    rates["close"] = 1.10 + np.arange(count) * 0.0001
+    rates["high"] = rates["close"] + 0.0002
+    rates["low"] = rates["close"] - 0.0002
+    rates["open"] = rates["close"]
+    return rates
+
+
+def test_append_skips_cached_bars(tmp_path):
+    cache = BarCache(str(tmp_path))
+
+    assert cache.append("EURUSD", "M5", make_rates(0, 10)) == 10
+    assert cache.append("EURUSD", "M5", make_rates(1500, 10)) == 5
+
+    bars = cache.load("EURUSD", "M5")
+    assert len(bars) == 15
+    assert np.all(np.diff(bars.time) == 300)
+
+
+def test_load_range_is_a_view(tmp_path):
+    cache = BarCache(str(tmp_path))
+    cache.append("EURUSD", "M5", make_rates(0, 100))
+
+    bars = cache.load("EURUSD", "M5", start=600, end=1500)
+
+    assert list(bars.time) == [600, 900, 1200]
+    # read-only memory map, not a copy
+    assert bars.close.flags.writeable is False
+    assert len(cache.tail("EURUSD", "M5", 7)) == 7
+
+
+def test_partial_write_is_trimmed(tmp_path):
+    cache = BarCache(str(tmp_path))
+    cache.append("EURUSD", "M5", make_rates(0, 5))
+
+    # simulate a crash after "close" was written but before "time"
+    with open(tmp_path / "EURUSD" / "M5" / "close.bin", "ab") as f:
+        f.write(np.zeros(3).tobytes())
+
+    assert len(cache.load("EURUSD", "M5")) == 5
+
+    cache.append("EURUSD", "M5", make_rates(1500, 2))
+    bars = cache.load("EURUSD", "M5")
+    assert len(bars) == 7
+    assert bars.close[-1] == make_rates(1500, 2)["close"][-1]
+
+
+def test_sync_fetches_only_new_closed_bars(tmp_path):
+    history = make_rates(0, 2000)
+    calls = []
+
+    def copy_rates_from_pos(symbol, timeframe, pos, count):
+        calls.append((pos, count))
+        end = len(history) - pos
+        return history[max(0, end - count):end]
+
+    mt5 = types.SimpleNamespace(
+        TIMEFRAME_M5=5,
+        copy_rates_from_pos=copy_rates_from_pos,
+    )
+
+    cache = BarCache(str(tmp_path))
+    cache.sync(mt5, "EURUSD", "M5", 500)
+
+    bars = cache.load("EURUSD", "M5")
+    assert len(bars) == 500
+    assert bars.time[-1] == history["time"][-2]  # forming bar excluded
+
+    history = make_rates(0, 2600)
+    assert cache.sync(mt5, "EURUSD", "M5", 500) == 600
+    assert cache.last_time("EURUSD", "M5") == history["time"][-2]
+    assert calls[-1] == (1, 1024)
@@ -0,0 +1,107 @@
+# tests/test_bar_feed.py
+
+import numpy as np
+
+from core.bar_feed import BarFeed, BarRing
+
+RATES_DTYPE = [
+    ("time", "<i8"), ("open", "<f8"), ("high", "<f8"),
+    ("low", "<f8"), ("close", "<f8"),
+]
+
+
+def make_rates(n, start=0):
+    rates = np.zeros(n, dtype=RATES_DTYPE)
+    rates["time"] = (start + np.arange(n)) * 300
+    rates["open"] = start + np.arange(n)
+    rates["high"] = rates["open"] + 0.5
+    rates["low"] = rates["open"] - 0.5
+    rates["close"] = rates["open"] + 0.25
+    return rates
+
+
+class FakeTerminal:
+    """History whose last `visible` bar is the forming one."""
+
+    def __init__(self, n):
+        self.history = make_rates(n)
+        self.visible = 0
+        self.rows_sent = 0
+        self.calls = []      # count of every request
+
+    def copy_rates_from_pos(self, symbol, timeframe, start_pos, count):
+        out = self.history[:self.visible][-count:]
+        self.rows_sent += len(out)
+        self.calls.append(count)
+        return out
+
+
+def test_ring_window_matches_tail_after_wrapping():
+    ring = BarRing(5)
+    rates = make_rates(23)
+
+    for chunk in np.array_split(rates, 7):
+        ring.extend(chunk)
+        bars = ring.window()
+        expected = rates[:ring.count][-5:]
+        assert bars.time.tolist() == expected["time"].tolist()
+        assert bars.close.tolist() == expected["close"].tolist()
+        assert np.shares_memory(bars.close, ring.close)
+
+
+def test_forming_bar_is_last_row_and_not_closed():
+    ring = BarRing(3)
+    ring.extend(make_rates(4))
+    ring.set_forming(make_rates(1, start=4)[0])
+
+    assert ring.window().time.tolist() == [300, 600, 900]
+    assert ring.window(forming=True).time.tolist() == [300, 600, 900, 1200]
+
+    # closing the forming bar replaces it
+    ring.extend(make_rates(1, start=4))
+    assert ring.window(forming=True).time.tolist() == [600, 900, 1200]
+
+
+def test_window_view_cached_until_change():
+    ring = BarRing(3)
+    ring.extend(make_rates(3))
+    ring.set_forming(make_rates(1, start=3)[0])
+
+    view = ring.window(forming=True)
+    ring.set_forming(make_rates(1, start=3)[0])
+    assert ring.window(forming=True) is view
+
+    tick = make_rates(1, start=3)[0].copy()
+    tick["high"] += 1
+    ring.set_forming(tick)
+    assert ring.window(forming=True) is not view
+    assert ring.window(forming=True).high[-1] == tick["high"]
+
+
+def test_poll_fetches_only_new_bars():
+    mt5 = FakeTerminal(500)
+    mt5.visible = 300
+    feed = BarFeed(mt5)
+
+    ring = feed.subscribe("EURUSD", 5, 100)
+    assert len(ring) == 100
+    assert ring.last_time == 298 * 300
+
+    # idle tick: one small request
+    mt5.rows_sent, mt5.calls = 0, []
+    assert feed.poll("EURUSD", 5) == 0
+    assert mt5.calls == [3] and mt5.rows_sent <= 3
+
+    # one bar closes: still one request
+    mt5.visible += 1
+    mt5.rows_sent, mt5.calls = 0, []
+    assert feed.poll("EURUSD", 5) == 1
+    assert ring.last_time == 299 * 300
+    assert len(mt5.calls) == 1 and mt5.rows_sent <= 3
+
+    # 20 missed bars: request widens until the gap is covered
+    mt5.visible += 20
+    assert feed.poll("EURUSD", 5) == 20
+    closed = feed.bars("EURUSD", 5)
+    assert closed.time.tolist() == mt5.history["time"][mt5.visible - 101:mt5.visible - 1].tolist()
+    assert feed.bars("EURUSD", 5, forming=True).time[-1] == mt5.history["time"][mt5.visible - 1]
@@ -0,0 +1,72 @@
+# tests/test_bars.py
+
+import numpy as np
+import pandas as pd
+
+from core.bars import Bars, SharedBars
+from core.double_break_detector import DoubleBreakDetector
+from core.structure import is_swing_high, is_swing_low
+
+
+def make_df(n=400, seed=3):
+    rng = np.random.default_rng(seed)
+    close = 1.10 + np.cumsum(rng.normal(0, 0.0005, n))
+    open_ = np.r_[close[0], close[:-1]]
+    return pd.DataFrame({
+        "time": pd.date_range("2024-06-10", periods=n, freq="5min"),
+        "open": open_,
+        "high": np.maximum(open_, close) + rng.random(n) * 0.0003,
+        "low": np.minimum(open_, close) - rng.random(n) * 0.0003,
+        "close": close,
+    })
+
+
+def test_from_frame_columns():
+    df = make_df(10)
+    bars = Bars.from_frame(df)
+
+    assert len(bars) == 10
+    assert bars.high.dtype == np.float64
+    assert bars.time.dtype == np.int64
+    assert bars.time[1] - bars.time[0] == 300
+    assert bars.close[4] == df.iloc[4]["close"]
+
+
+def test_swings_match_dataframe():
+    df = make_df()
+    bars = Bars.from_frame(df)
+
+    for i in range(len(df)):
+        assert is_swing_low(bars, i) == is_swing_low(df, i)
+        assert is_swing_high(bars, i) == is_swing_high(df, i)
+
+
+def test_detector_same_result_for_bars_and_dataframe():
+    df = make_df()
+    bars = Bars.from_frame(df)
+
+    for direction in ("BUY", "SELL"):
+        a = DoubleBreakDetector(1.10, direction, max_candles=len(df))
+        b = DoubleBreakDetector(1.10, direction, max_candles=len(df))
+
+        for i in range(len(df)):
+            assert a.update(df, i) == b.update(bars, i)
+
+        assert a.breaks == b.breaks
+        assert a.completed == b.completed
+
+
+def test_shared_bars_attach_without_copy():
+    bars = Bars.from_frame(make_df(50))
+    shared = SharedBars.create(bars)
+
+    try:
+        view = SharedBars.attach(shared.handle)
+        assert np.array_equal(view.bars.close, bars.close)
+        assert np.array_equal(view.bars.time, bars.time)
+
+        shared.bars.high[0] = 9.0
+        assert view.bars.high[0] == 9.0
+        view.close()
+    finally:
+        shared.close()
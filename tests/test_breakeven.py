@@ -0,0 +1,128 @@
+# tests/test_breakeven.py
+
+import importlib
+import sys
+import types
+
+import pytest
+
+import config.settings  # noqa: F401  (binds the real/absent MT5 first)
+from core.trade_state import TradeState
+
+
+class FakeMT5(types.ModuleType):
+    POSITION_TYPE_BUY = 0
+    POSITION_TYPE_SELL = 1
+    TRADE_ACTION_SLTP = 6
+    TRADE_RETCODE_DONE = 10009
+    TRADE_RETCODE_REJECT = 10006
+
+    def __init__(self):
+        super().__init__("MetaTrader5")
+        self.positions = {}
+        self.prices = {}
+        self.sent = []
+        self.reject = False
+        self.tick_calls = 0
+
+    def positions_get(self, symbol=None):
+        return tuple(p for p in self.positions.values() if symbol in (None, p.symbol))
+
+    def orders_get(self, symbol=None):
+        return ()
+
+    def symbol_info_tick(self, symbol):
+        self.tick_calls += 1
+        price = self.prices[symbol]
+        return types.SimpleNamespace(bid=price, ask=price)
+
+    def order_send(self, request):
+        self.sent.append(request)
+        if self.reject:
+            return types.SimpleNamespace(retcode=self.TRADE_RETCODE_REJECT)
+        self.positions[request["position"]].sl = request["sl"]
+        return types.SimpleNamespace(retcode=self.TRADE_RETCODE_DONE)
+
+
+@pytest.fixture
+def mt5(monkeypatch):
+    fake = FakeMT5()
+    monkeypatch.setitem(sys.modules, "MetaTrader5", fake)
+    sys.modules.pop("execution.breakeven", None)
+    yield fake
+    sys.modules.pop("execution.breakeven", None)
+
+
+def manager(mt5, **kwargs):
+    return importlib.import_module("execution.breakeven").BreakEvenManager(**kwargs)
+
+
+def open_position(mt5, ticket, symbol, buy, entry, sl):
+    mt5.positions[ticket] = types.SimpleNamespace(
+        ticket=ticket, symbol=symbol, magic=91001, tp=0.0,
+        type=mt5.POSITION_TYPE_BUY if buy else mt5.POSITION_TYPE_SELL,
+        price_open=entry, sl=sl,
+    )
+
+
+def test_moves_every_symbol_in_one_pass(mt5):
+    open_position(mt5, 1, "EURUSD", True, 1.1000, 1.0990)     # R = 10 pips
+    open_position(mt5, 2, "EURUSD", False, 1.1050, 1.1060)
+    open_position(mt5, 3, "GBPUSD", False, 1.2500, 1.2520)    # R = 20 pips
+    mt5.prices = {"EURUSD": 1.1041, "GBPUSD": 1.2430}
+
+    moved = manager(mt5, be_rr=4).manage()
+
+    # EURUSD buy +4R, sell +1R; GBPUSD sell +3.5R
+    assert moved == [1]
+    assert mt5.positions[1].sl == 1.1000
+    assert mt5.tick_calls == 2
+
+
+def test_remembers_original_risk(mt5):
+    open_position(mt5, 1, "EURUSD", True, 1.1000, 1.0990)
+    mt5.prices = {"EURUSD": 1.1041}
+    be = manager(mt5, be_rr=4)
+    be.manage()
+
+    mt5.prices = {"EURUSD": 1.1100}
+    assert be.manage() == []
+    assert len(mt5.sent) == 1
+    assert be.risk[1] == pytest.approx(0.0010)
+
+
+def test_one_modification_per_trigger(mt5):
+    open_position(mt5, 1, "EURUSD", True, 1.1000, 1.0990)
+    mt5.prices = {"EURUSD": 1.1045}
+    mt5.reject = True
+    be = manager(mt5, be_rr=4)
+
+    for _ in range(5):
+        be.manage()
+    assert len(mt5.sent) == 1
+
+    # back under the trigger and through it again: one retry
+    mt5.prices = {"EURUSD": 1.1020}
+    be.manage()
+    mt5.prices = {"EURUSD": 1.1045}
+    mt5.reject = False
+    be.manage()
+    be.manage()
+
+    assert len(mt5.sent) == 2
+    assert mt5.positions[1].sl == 1.1000
+
+
+def test_stale_snapshot_does_not_resend(mt5):
+    open_position(mt5, 1, "EURUSD", False, 1.1050, 1.1060)
+    mt5.prices = {"EURUSD": 1.1000}
+    state = TradeState(mt5)
+    be = manager(mt5, state=state, be_rr=4)
+
+    assert be.manage() == [1]
+    assert state.stale
+    be.manage()
+    be.manage()
+
+    assert len(mt5.sent) == 1
+    assert not be.in_flight
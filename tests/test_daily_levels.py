@@ -0,0 +1,81 @@
+# tests/test_daily_levels.py
+
+from datetime import datetime, timezone
+
+import numpy as np
+
+from core.bars import Bars
+from core.daily_levels import DailyLevels
+
+DAY = 86400
+T0 = 1704672000  # 2024-01-08 00:00 UTC
+
+
+def h1_bars(hours, start=T0):
+    t = start + np.arange(hours) * 3600
+    base = np.arange(hours, dtype=float)
+    return Bars(t, base, base + 0.5, base - 0.5, base)
+
+
+def at(ts):
+    return datetime.fromtimestamp(ts, timezone.utc)
+
+
+class FakeTerminal:
+    TIMEFRAME_H1 = 16385
+
+    def __init__(self):
+        self.calls = 0
+
+    def copy_rates_range(self, symbol, timeframe, date_from, date_to):
+        self.calls += 1
+        rates = np.zeros(24, dtype=[("high", "<f8"), ("low", "<f8")])
+        rates["high"] = np.arange(24) + 10.0
+        rates["low"] = np.arange(24) - 10.0
+        return rates
+
+
+def test_levels_from_h1_cached_per_day():
+    levels = DailyLevels("EURUSD")
+    h1 = h1_bars(48)
+
+    assert levels.get(at(T0 + DAY + 8 * 3600), h1) == (23.5, -0.5)
+    assert levels.levels.day == at(T0 + DAY).date()
+
+    # same day: answered from the cache, even without bars
+    assert levels.get(at(T0 + DAY + 12 * 3600)) == (23.5, -0.5)
+
+
+def test_incomplete_day_not_cached():
+    levels = DailyLevels("EURUSD")
+
+    # last closed H1 is 22:00 of the previous day
+    assert levels.get(at(T0 + DAY), h1_bars(23)) == (22.5, -0.5)
+    assert levels.levels is None
+
+    assert levels.get(at(T0 + DAY), h1_bars(24)) == (23.5, -0.5)
+    assert levels.levels is not None
+
+
+def test_used_levels_reset_on_new_day():
+    levels = DailyLevels("EURUSD")
+    levels.get(at(T0 + DAY + 3600), h1_bars(48))
+
+    levels.mark_used(23.5)
+    assert not levels.is_unused(23.500001)
+    assert levels.is_unused(-0.5)
+
+    levels.get(at(T0 + 2 * DAY + 3600), h1_bars(72))
+    assert levels.is_unused(23.5)
+
+
+def test_terminal_fetched_once_per_day():
+    mt5 = FakeTerminal()
+    levels = DailyLevels("EURUSD", mt5)
+
+    for hour in range(7, 20):
+        assert levels.get(at(T0 + DAY + hour * 3600)) == (33.0, -10.0)
+    assert mt5.calls == 1
+
+    levels.get(at(T0 + 2 * DAY + 3600))
+    assert mt5.calls == 2
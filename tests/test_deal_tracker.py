@@ -0,0 +1,97 @@
+# tests/test_deal_tracker.py
+
+import types
+from datetime import datetime, timezone
+
+from core.deal_tracker import DealTracker
+
+T0 = 1704700800
+
+
+class FakeTerminal:
+    DEAL_ENTRY_IN = 0
+    DEAL_ENTRY_OUT = 1
+    DEAL_REASON_EXPERT = 3
+    DEAL_REASON_SL = 4
+    DEAL_REASON_TP = 5
+
+    def __init__(self):
+        self.deals = []
+        self.returned = 0
+
+    def add(self, ticket, position, time, entry, reason=3, magic=1, profit=0.0, symbol="EURUSD"):
+        self.deals.append(types.SimpleNamespace(
+            ticket=ticket, position_id=position, time=time, entry=entry,
+            reason=reason, magic=magic, profit=profit, symbol=symbol,
+        ))
+
+    def history_deals_get(self, date_from, date_to):
+        t0 = int(date_from.timestamp())
+        out = tuple(d for d in self.deals if d.time >= t0)
+        self.returned += len(out)
+        return out
+
+
+def now():
+    return datetime.fromtimestamp(T0 + 3600, timezone.utc)
+
+
+def test_indexes_by_position():
+    mt5 = FakeTerminal()
+    tracker = DealTracker(mt5, start=T0)
+
+    mt5.add(1, position=10, time=T0 + 60, entry=0)
+    tracker.poll(now())
+    assert tracker.opened(10).ticket == 1
+    assert tracker.closed(10) is None
+
+    mt5.add(2, position=10, time=T0 + 120, entry=1, reason=4, profit=-3000.0)
+    tracker.poll(now())
+    assert tracker.closed(10).ticket == 2
+    assert tracker.closed_by_sl(10).time == T0 + 120
+
+
+def test_fetches_only_from_cursor():
+    mt5 = FakeTerminal()
+    tracker = DealTracker(mt5, start=T0)
+
+    for k in range(50):
+        mt5.add(k, position=k, time=T0 + k, entry=0)
+    assert len(tracker.poll(now())) == 50
+
+    mt5.returned = 0
+    assert tracker.poll(now()) == []
+    assert mt5.returned == 1  # only the deal in the cursor second
+
+    # a later deal in the same second is still picked up
+    mt5.add(99, position=99, time=T0 + 49, entry=0)
+    assert [d.ticket for d in tracker.poll(now())] == [99]
+
+
+def test_symbol_filter_and_magic_index():
+    mt5 = FakeTerminal()
+    tracker = DealTracker(mt5, symbol="EURUSD", start=T0)
+
+    mt5.add(1, position=1, time=T0 + 1, entry=1, magic=7)
+    mt5.add(2, position=2, time=T0 + 2, entry=1, magic=8)
+    mt5.add(3, position=3, time=T0 + 3, entry=1, magic=7, symbol="GBPUSD")
+    tracker.poll(now())
+
+    assert tracker.last_close(7).ticket == 1
+    assert tracker.last_close().ticket == 2
+
+    pairs = tracker.closes_since(7)
+    assert [d.ticket for _, d in pairs] == [1]
+    assert tracker.closes_since(7, pairs[-1][0]) == []
+
+
+def test_old_deals_pruned():
+    mt5 = FakeTerminal()
+    tracker = DealTracker(mt5, start=T0, retention=100)
+
+    mt5.add(1, position=1, time=T0, entry=0)
+    mt5.add(2, position=2, time=T0 + 500, entry=0)
+    tracker.poll(now())
+
+    assert tracker.opened(1) is None
+    assert tracker.opened(2) is not None
@@ -0,0 +1,149 @@
+# tests/test_dispatcher.py
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from notifications.dispatcher import TelegramDispatcher, LOW, NORMAL, HIGH
+
+
+class TelegramStandIn:
+    """
+    Local sendMessage endpoint. `responses` is consumed one status
+    per request (200 once empty); `delay` slows every reply.
+    """
+
+    def __init__(self, delay=0.0, responses=()):
+        self.delay = delay
+        self.responses = list(responses)
+        self.texts = []
+        self.connections = set()
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                stand_in.connections.add(self.client_address)
+                time.sleep(stand_in.delay)
+
+                status = stand_in.responses.pop(0) if stand_in.responses else 200
+                if status == 200:
+                    stand_in.texts.append(json.loads(body)["text"])
+                    reply = {"ok": True}
+                else:
+                    reply = {"ok": False, "parameters": {"retry_after": 0.05}}
+
+                data = json.dumps(reply).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def make(request):
+    created = []
+
+    def factory(delay=0.0, responses=(), **kwargs):
+        server = TelegramStandIn(delay, responses)
+        kwargs.setdefault("min_interval", 0.0)
+        d = TelegramDispatcher("TOKEN", "42", base_url=server.url, **kwargs)
+        created.append((d, server))
+        return d, server
+
+    yield factory
+
+    for d, server in created:
+        d.close(timeout=2)
+        server.close()
+
+
+def test_send_never_waits_on_network(make):
+    d, server = make(delay=0.3)
+
+    started = time.perf_counter()
+    for k in range(5):
+        d.send(f"msg {k}")
+    assert time.perf_counter() - started < 0.05
+
+    assert d.flush(timeout=5)
+    assert server.texts == [f"msg {k}" for k in range(5)]
+    assert d.sent == 5
+
+
+def test_one_keep_alive_connection(make):
+    d, server = make()
+    for k in range(10):
+        d.send(f"msg {k}")
+    assert d.flush(timeout=5)
+    assert len(server.connections) == 1
+
+
+def test_retries_on_rate_limit_and_server_error(make):
+    d, server = make(responses=[429, 502])
+    d.send("entry")
+    assert d.flush(timeout=5)
+    assert server.texts == ["entry"]
+    assert d.failed == 0
+
+
+def test_full_queue_drops_lower_priority_first(make):
+    d, server = make(delay=0.2, max_queue=3)
+
+    d.send("busy")                 # taken by the worker
+    time.sleep(0.05)
+    d.send("levels", LOW)
+    d.send("sweep", NORMAL)
+    d.send("sweep 2", NORMAL)
+    assert d.send("entry", HIGH)   # evicts "levels"
+
+    assert d.flush(timeout=5)
+    assert server.texts == ["busy", "entry", "sweep", "sweep 2"]
+    assert d.dropped == 1
+
+
+def test_full_queue_coalesces_same_priority(make):
+    d, server = make(delay=0.2, max_queue=2)
+
+    d.send("busy")
+    time.sleep(0.05)
+    d.send("a", LOW)
+    d.send("b", LOW)
+    assert d.send("c", LOW)
+
+    assert d.flush(timeout=5)
+    assert server.texts == ["busy", "a", "b\n\nc"]
+    assert d.coalesced == 1
+
+
+def test_full_queue_coalesces_normal_with_nothing_lower(make):
+    d, server = make(delay=0.2, max_queue=3)
+
+    d.send("busy")
+    time.sleep(0.05)
+    d.send("sweep", NORMAL)
+    d.send("entry", HIGH)
+    d.send("flip", HIGH)
+    assert d.send("sweep 2", NORMAL)   # no LOW to evict: joins "sweep"
+
+    assert d.flush(timeout=5)
+    assert server.texts == ["busy", "entry", "flip", "sweep\n\nsweep 2"]
+    assert d.coalesced == 1
+    assert d.dropped == 0
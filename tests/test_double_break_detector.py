@@ -81,3 +81,58 @@ def test_detector_expiry():
 
     assert detector.completed is True
     assert len(detector.breaks) == 0
+
+
+# ============================
+# STREAMING API PARITY
+# ============================
+
+def stream(detector, df, start):
+    """
+    Feeds df through on_bar(); bars before `start` are primed.
+    """
+    results = []
+    for i, row in enumerate(df.itertuples(index=False)):
+        if i < start:
+            detector.prime(row.open, row.high, row.low, row.close)
+        else:
+            results.append(detector.on_bar(row.open, row.high, row.low, row.close))
+    return results
+
+
+def assert_same_as_update(df, direction, start=2, **kwargs):
+    indexed = DoubleBreakDetector(1.12, direction, **kwargs)
+    streamed = DoubleBreakDetector(1.12, direction, **kwargs)
+
+    expected = [indexed.update(df, i) for i in range(start, len(df))]
+
+    assert stream(streamed, df, start) == expected
+    assert streamed.breaks == indexed.breaks
+    assert streamed.completed == indexed.completed
+
+
+def test_streaming_matches_update():
+    scenarios = [
+        [(1.10, 1.11, 1.09, 1.10)] * 3,
+        [
+            (1.10, 1.11, 1.09, 1.10),
+            (1.10, 1.11, 1.08, 1.09),
+            (1.09, 1.10, 1.07, 1.08),
+        ],
+        [
+            (1.10, 1.11, 1.09, 1.10),
+            (1.10, 1.11, 1.08, 1.09),
+            (1.09, 1.10, 1.07, 1.08),
+            (1.08, 1.09, 1.08, 1.085),
+            (1.085, 1.09, 1.06, 1.07),
+        ],
+    ]
+
+    for rows in scenarios:
+        for direction in ("BUY", "SELL"):
+            assert_same_as_update(make_m5_df(rows), direction)
+
+
+def test_streaming_expiry_matches_update():
+    df = make_m5_df([(1.10, 1.11, 1.09, 1.10)] * 30)
+    assert_same_as_update(df, "SELL", max_candles=5)
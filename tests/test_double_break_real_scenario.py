@@ -76,3 +76,33 @@ def test_buy_double_break_after_structure_invalidation():
     assert detector.completed is True
     assert entry_index == len(df) - 1
     assert detector.breaks[0] < detector.breaks[1]
+
+
+def test_buy_double_break_streaming_api():
+    """
+    Same chart replayed bar by bar through on_bar().
+    """
+    df = make_df([
+        (1.1660, 1.1670, 1.1655, 1.1668),
+        (1.1668, 1.1672, 1.1662, 1.1664),
+        (1.1664, 1.1666, 1.1650, 1.1652),
+        (1.1652, 1.1660, 1.1651, 1.1658),
+        (1.1658, 1.1666, 1.1656, 1.1663),
+        (1.1663, 1.1664, 1.1659, 1.1660),
+        (1.1660, 1.1672, 1.1659, 1.1670),
+        (1.1670, 1.1671, 1.1663, 1.1665),
+        (1.1665, 1.1674, 1.1664, 1.1672),
+        (1.1672, 1.1673, 1.1667, 1.1669),
+        (1.1669, 1.1685, 1.1668, 1.1680),
+    ])
+
+    indexed = DoubleBreakDetector(1.1675, "BUY", max_candles=30)
+    streamed = DoubleBreakDetector(1.1675, "BUY", max_candles=30)
+
+    for i, row in enumerate(df.itertuples(index=False)):
+        res = streamed.on_bar(row.open, row.high, row.low, row.close, time=i)
+        assert res == indexed.update(df, i)
+
+    assert streamed.breaks == indexed.breaks
+    assert streamed.completed is True
+    assert streamed.entry_time == len(df) - 1
@@ -0,0 +1,229 @@
+# tests/test_engine.py
+
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in a fresh interpreter: the replay stand-in has to be installed
+# as MetaTrader5 before any bot module is imported.
+SCRIPT = r"""
+import json, sys
+import numpy as np
+
+from benchmarks.synthetic import generate_market
+from core.bar_cache import BarCache
+from live.replay import ReplayMT5, ReplayFinished, install
+
+symbols = sys.argv[2].split(",")
+news = json.loads(sys.argv[3])      # [(currency, epoch seconds)]
+offset = int(sys.argv[4])           # broker server time - UTC
+
+cache = BarCache(sys.argv[1])
+for seed, symbol in enumerate(symbols, start=3):
+    m5, h1 = generate_market(288 * 12, seed)
+    for tf, b in (("M5", m5), ("H1", h1)):
+        r = np.zeros(len(b), dtype=[("time", "<i8"), ("open", "<f8"),
+                                     ("high", "<f8"), ("low", "<f8"), ("close", "<f8")])
+        for name in r.dtype.names:
+            r[name] = getattr(b, name)
+        cache.append(symbol, tf, r)
+
+replay = install(ReplayMT5(cache, symbols, server_offset=offset))
+
+import core.event_logger
+import core.news_blackout
+from config.settings import MAX_OPEN_TRADES, PRIMARY_MAGIC, FLIP_MAGIC
+from live.engine import LiveEngine
+
+core.event_logger.send = lambda *a: None
+core.news_blackout._calendar = core.news_blackout.NewsCalendar(news)
+
+
+class RecordingEngine(LiveEngine):
+    bar = None          # time of the bar being processed
+    flipping = False    # inside on_primary_closed
+
+    def on_bar(self, state, m5, i, pdh, pdl):
+        self.bar = int(m5.time[i])
+        seen.setdefault(state.symbol, []).append(self.bar)
+        super().on_bar(state, m5, i, pdh, pdl)
+        self.bar = None
+
+    def on_primary_closed(self, state, deal):
+        self.flipping = True
+        super().on_primary_closed(state, deal)
+        self.flipping = False
+
+
+seen = {}          # symbol → times of every bar run through on_bar
+engine = RecordingEngine(symbols, clock=replay.clock)
+
+# primary orders: (symbol, time of the bar they came from)
+primaries, placed, over_limit = [], [], 0
+flips = []          # magic of every order placed by on_primary_closed
+order_send = replay.order_send
+
+def checked_send(request):
+    global over_limit
+    if request["action"] == replay.TRADE_ACTION_PENDING:
+        bot = [x for x in list(replay.positions_get()) + list(replay.orders_get())
+               if x.magic in (PRIMARY_MAGIC, FLIP_MAGIC)]
+        over_limit += len(bot) >= MAX_OPEN_TRADES
+        placed.append(request["symbol"])
+        if engine.flipping:
+            flips.append(request["magic"])
+        elif request["magic"] == PRIMARY_MAGIC:
+            primaries.append((request["symbol"], engine.bar))
+    return order_send(request)
+
+replay.order_send = checked_send
+
+try:
+    engine.run()
+except ReplayFinished:
+    pass
+
+print(json.dumps({
+    "symbols": sorted(engine.states),
+    "levels": {s: st.last_levels_date is not None for s, st in engine.states.items()},
+    "placed": placed,
+    "primaries": primaries,
+    "flips": flips,
+    "seen": seen,
+    "over_limit": over_limit,
+}))
+"""
+
+
+def replay(tmp_path, symbols, news=(), offset=0):
+    out = subprocess.run(
+        [sys.executable, "-c", SCRIPT, str(tmp_path), ",".join(symbols),
+         json.dumps(list(news)), str(offset)],
+        capture_output=True, text=True, check=True, cwd=PROJECT_ROOT,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def in_session(t):
+    from datetime import datetime, timezone
+    from core.session_filter import in_session
+    return in_session(datetime.fromtimestamp(t, timezone.utc))
+
+
+def test_orders_only_come_from_session_bars(tmp_path):
+    result = replay(tmp_path, ["EURUSD"])
+
+    assert result["primaries"]
+    for _, bar in result["primaries"]:
+        assert bar is not None and in_session(bar)
+
+
+def test_sessions_are_utc_with_a_broker_offset(tmp_path):
+    offset = 3 * 3600           # bars on UTC+3 server time
+    result = replay(tmp_path, ["EURUSD"], offset=offset)
+
+    seen = np.asarray(result["seen"]["EURUSD"])
+    assert all(in_session(t - offset) for t in seen)
+
+    # 06:55 UTC (09:55 server) is just before London: never run.
+    # 07:00 UTC and 20:55 UTC (10:00 / 23:55 server) are in session
+    clock = seen % 86400
+    assert not (clock == 9 * 3600 + 55 * 60).any()
+    assert (clock == 10 * 3600).any()
+    assert (clock == 23 * 3600 + 55 * 60).any()
+
+    for _, bar in result["primaries"]:
+        assert in_session(bar - offset)
+
+
+def test_flip_orders_carry_the_flip_magic(tmp_path):
+    from config.settings import FLIP_MAGIC
+
+    result = replay(tmp_path, ["EURUSD"])
+
+    assert result["flips"]
+    assert set(result["flips"]) == {FLIP_MAGIC}
+
+
+def test_one_engine_trades_every_symbol_within_portfolio_limit(tmp_path):
+    from benchmarks.synthetic import generate_market
+    from core.news_blackout import NewsCalendar
+
+    # a GBP release at 13:00 UTC every day: blacks out GBPUSD only
+    m5, _ = generate_market(288 * 12, 3)
+    days = np.unique(m5.time - m5.time % 86400)
+    news = [("GBP", int(d + 13 * 3600)) for d in days]
+    calendar = NewsCalendar(news)
+
+    result = replay(tmp_path, ["EURUSD", "GBPUSD"], news)
+
+    assert result["symbols"] == ["EURUSD", "GBPUSD"]
+    assert result["levels"] == {"EURUSD": True, "GBPUSD": True}
+    assert set(result["placed"]) == {"EURUSD", "GBPUSD"}
+    assert result["over_limit"] == 0
+
+    # every bar each symbol ran on, and so every primary order, was
+    # in session and outside that symbol's blackout
+    for symbol, times in result["seen"].items():
+        times = np.asarray(times)
+        assert all(in_session(t) for t in times)
+        assert not calendar.mask(symbol, times).any()
+    # EURUSD kept trading through the GBP releases
+    assert calendar.mask("GBPUSD", np.asarray(result["seen"]["EURUSD"])).any()
+
+    for symbol, bar in result["primaries"]:
+        assert bar is not None and in_session(bar)
+        assert not calendar.in_blackout(symbol, bar)
+
+
+def test_flip_only_after_a_losing_stop_out(monkeypatch):
+    import types
+    from datetime import datetime, timezone
+
+    from core.event_context import EventContext
+    from live.engine import LiveEngine
+
+    # terminal constants for the facade
+    terminal = types.ModuleType("MetaTrader5")
+    terminal.DEAL_REASON_SL = 4
+    terminal.TIMEFRAME_M5 = 5
+    monkeypatch.setitem(sys.modules, "MetaTrader5", terminal)
+
+    london = int(datetime(2024, 1, 8, 9, 0, tzinfo=timezone.utc).timestamp())
+    plan = types.SimpleNamespace(valid=True, direction="BUY",
+                                 entry_price=1.1000, stop_loss=1.0990)
+    placed = []
+
+    def closed(profit):
+        event = EventContext()
+        event.arm(None, "SELL", "BUY", 1.1100, "LONDON")
+        event.primary_placed(1)
+        state = types.SimpleNamespace(
+            symbol="EURUSD",
+            event=event,
+            entry_engine=types.SimpleNamespace(
+                update=lambda m5, i: None, build_trade_plan=lambda s, tp: plan),
+            risk_manager=types.SimpleNamespace(calculate_lot_size=lambda e, sl: 1.0),
+            executor=types.SimpleNamespace(
+                place_limit=lambda *a, **k: placed.append(k["is_flip"]) or 7),
+        )
+        engine = LiveEngine(["EURUSD"])
+        engine.feed = types.SimpleNamespace(bars=lambda s, tf: [0])
+        engine.scheduler = types.SimpleNamespace(server_offset=0)
+        engine.can_open = lambda: True
+        engine.on_primary_closed(
+            state, types.SimpleNamespace(reason=4, profit=profit, time=london))
+
+    monkeypatch.setattr("live.engine.log_flip", lambda *a: None)
+
+    # stop moved to entry: closes with reason SL at no loss
+    closed(0.0)
+    assert placed == []
+
+    closed(-3000.0)
+    assert placed == [True]
@@ -61,3 +61,37 @@ def test_sell_entry_valid_with_pullback():
     assert plan.valid is True
     assert plan.entry_price < plan.stop_loss
     assert plan.entry_price > tp
+
+
+def naive_pullback(o, c, end, direction):
+    for i in range(end - 1, -1, -1):
+        if (c[i] < o[i]) if direction == "BUY" else (c[i] > o[i]):
+            return i
+    return None
+
+
+def test_running_pullback_matches_backward_scan():
+    import numpy as np
+    from core.bars import Bars
+
+    rng = np.random.default_rng(3)
+    n = 2000
+    o = 1.1 + rng.normal(0, 0.001, n)
+    c = o + rng.choice([-1, 0, 1], n) * rng.random(n) * 0.001
+    bars = Bars(np.arange(n) * 300, o, np.maximum(o, c) + 0.0002,
+                np.minimum(o, c) - 0.0002, c)
+
+    engine = EntryEngine("EURUSD")
+    # forward steps plus jumps back (flip plan, then the next signal)
+    for end in [2, 3, 10, 500, 1999, 40, 41, 1200, 1201]:
+        engine.update(bars, end)
+        assert np.shares_memory(engine._close, bars.close)
+
+        for direction in ("BUY", "SELL"):
+            plan = engine.build_trade_plan(DummySignal(direction), 1.0)
+            k = naive_pullback(o, c, end, direction)
+            if k is None:
+                assert not plan.valid
+                continue
+            expected = bars.low[k] if direction == "BUY" else bars.high[k]
+            assert plan.stop_loss == expected
@@ -0,0 +1,179 @@
+# tests/test_intrabar.py
+
+import numpy as np
+
+from core.bars import Bars
+from core.bar_cache import BarCache
+from backtest.intrabar import IntrabarResolver
+
+RATES_DTYPE = [
+    ("time", "<i8"), ("open", "<f8"), ("high", "<f8"),
+    ("low", "<f8"), ("close", "<f8"),
+]
+
+
+def make_m5(rows):
+    rows = np.array(rows, dtype=np.float64)
+    times = np.arange(len(rows)) * 300
+    return Bars(times, rows[:, 0], rows[:, 1], rows[:, 2], rows[:, 0])
+
+
+def write_m1(cache, bar_time, rows):
+    rates = np.zeros(len(rows), dtype=RATES_DTYPE)
+    rates["time"] = bar_time + np.arange(len(rows)) * 60
+    rates["high"] = [r[0] for r in rows]
+    rates["low"] = [r[1] for r in rows]
+    cache.append("EURUSD", "M1", rates)
+
+
+# BUY: entry 1.1000, SL 1.0990, TP 1.1050, BE 1.1040
+PLAN = ("BUY", 1.1000, 1.0990, 1.1050, 1.1040)
+
+
+def test_tp_first_inside_ambiguous_bar(tmp_path):
+    m5 = make_m5([
+        (1.1000, 1.1005, 1.0995),
+        (1.1000, 1.1060, 1.0980),  # touches SL and TP
+    ])
+    cache = BarCache(str(tmp_path))
+    write_m1(cache, 300, [
+        (1.1060, 1.1002),  # BE trigger and TP, entry untouched
+        (1.1010, 1.0980),
+    ])
+
+    resolver = IntrabarResolver(cache, "EURUSD")
+    res = resolver.resolve(m5, 0, *PLAN)
+
+    assert (res.exit_reason, res.exit_index) == ("TP", 1)
+    assert resolver.trades_changed == 1
+    assert resolver.m1_bars_used == 2
+
+
+def test_unambiguous_bar_never_reads_m1(tmp_path):
+    m5 = make_m5([
+        (1.1000, 1.1005, 1.0995),
+        (1.1000, 1.1010, 1.0980),  # SL only
+    ])
+    resolver = IntrabarResolver(BarCache(str(tmp_path)), "EURUSD")
+
+    res = resolver.resolve(m5, 0, *PLAN)
+
+    assert res.exit_reason == "SL"
+    assert resolver.ambiguous_bars == 0
+    assert resolver.m1_bars_used == 0
+
+
+def test_be_inside_bar_then_continue_on_m5(tmp_path):
+    m5 = make_m5([
+        (1.1000, 1.1005, 1.0995),
+        (1.1000, 1.1045, 1.0998),  # BE trigger + entry touched
+        (1.1040, 1.1055, 1.1020),  # TP
+    ])
+    cache = BarCache(str(tmp_path))
+    write_m1(cache, 300, [
+        (1.1003, 1.0998),  # entry touched BEFORE the BE trigger
+        (1.1045, 1.1010),  # BE trigger, no return to entry
+    ])
+
+    resolver = IntrabarResolver(cache, "EURUSD")
+    res = resolver.resolve(m5, 0, *PLAN)
+
+    assert (res.exit_reason, res.exit_index) == ("TP", 2)
+    assert res.be_index == 1
+
+
+def test_missing_m1_keeps_m5_answer(tmp_path):
+    m5 = make_m5([
+        (1.1000, 1.1005, 1.0995),
+        (1.1000, 1.1060, 1.0980),
+    ])
+    resolver = IntrabarResolver(BarCache(str(tmp_path)), "EURUSD")
+
+    res = resolver.resolve(m5, 0, *PLAN)
+
+    # M5 rule: BE fires first, then the stop at entry is hit
+    assert res.exit_reason == "BE"
+    assert resolver.m1_missing == 1
+
+
+class M1Terminal:
+    """
+    Terminal stand-in serving M1 bars through copy_rates_range.
+    """
+
+    TIMEFRAME_M1 = 1
+
+    def __init__(self, m1):
+        self.m1 = m1
+        self.requests = []
+
+    def copy_rates_range(self, symbol, timeframe, date_from, date_to):
+        t0, t1 = int(date_from.timestamp()), int(date_to.timestamp())
+        self.requests.append((symbol, timeframe, t0, t1))
+        return self.m1[(self.m1["time"] >= t0) & (self.m1["time"] <= t1)]
+
+
+def split_m1(m5):
+    """
+    Five M1 bars per M5 bar with the same open / high / low / close.
+    """
+    n = len(m5)
+    rates = np.zeros(5 * n, dtype=RATES_DTYPE)
+    rates["time"] = (m5.time[:, None] + np.arange(5) * 60).ravel()
+    o, h, l, c = m5.open, m5.high, m5.low, m5.close
+    rates["high"] = np.stack([h, o, o, o, c], axis=1).ravel()
+    rates["low"] = np.stack([o, l, o, o, c], axis=1).ravel()
+    rates["open"] = np.stack([o, o, o, o, c], axis=1).ravel()
+    rates["close"] = np.stack([o, o, o, c, c], axis=1).ravel()
+    return rates
+
+
+def test_backtest_fetches_m1_only_for_ambiguous_bars(tmp_path, monkeypatch):
+    from benchmarks.synthetic import generate_market
+    from backtest.intrabar import M1_WINDOWS
+    from backtest.run_backtest import Backtester, SYMBOL
+    from core.news_blackout import NewsCalendar
+
+    # synthetic M5 bars are narrow next to the stop distance: treat
+    # every exit bar as ambiguous so each one needs M1
+    monkeypatch.setattr(IntrabarResolver, "_ambiguous", lambda *a: True)
+
+    m5, h1 = generate_market(288 * 40, 3)
+    terminal = M1Terminal(split_m1(m5))
+    cache = BarCache(str(tmp_path))
+
+    resolver = IntrabarResolver(cache, SYMBOL, terminal)
+    Backtester(intrabar=resolver, news=NewsCalendar()).run(m5, h1, report=False)
+
+    assert resolver.ambiguous_bars > 0
+    assert resolver.m1_missing == 0
+
+    # one M5 bar (5 M1 rows) per request, never the whole range
+    spans = [t1 - t0 for _, _, t0, t1 in terminal.requests]
+    assert spans and set(spans) == {299}
+    assert 0 < resolver.m1_requests <= resolver.ambiguous_bars
+    assert resolver.m1_fetched == 5 * resolver.m1_requests
+    assert resolver.m1_fetched < len(m5) // 10
+
+    # kept apart from the contiguous M1 history
+    assert len(cache.load(SYMBOL, "M1")) == 0
+    assert len(cache.load(SYMBOL, M1_WINDOWS)) > 0
+
+    # a second run is served from the cache, except windows that came
+    # in older than the cached tail (append-only) and weren't kept
+    cached = set(cache.load(SYMBOL, M1_WINDOWS).time)
+    dropped = {t0 for _, _, t0, _ in terminal.requests if t0 not in cached}
+    assert len(dropped) < len(terminal.requests) // 4
+
+    first = len(terminal.requests)
+    again = IntrabarResolver(cache, SYMBOL, terminal)
+    Backtester(intrabar=again, news=NewsCalendar()).run(m5, h1, report=False)
+    assert again.m1_missing == 0 and again.m1_bars_used > 0
+    assert {t0 for _, _, t0, _ in terminal.requests[first:]} == dropped
+
+    # without a terminal an empty cache leaves the M5 answers
+    offline = IntrabarResolver(BarCache(str(tmp_path / "offline")), SYMBOL)
+    Backtester(intrabar=offline, news=NewsCalendar()).run(m5, h1, report=False)
+
+    assert offline.m1_missing == offline.ambiguous_bars > 0
+    assert offline.m1_bars_used == 0
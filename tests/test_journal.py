@@ -0,0 +1,107 @@
+# tests/test_journal.py
+
+import json
+import os
+
+from core.journal import Journal, INDEX_FILE
+
+DAY = 86400
+T0 = 1704700800  # 2024-01-08 08:00 UTC
+
+
+def segment_files(path):
+    return sorted(p for p in os.listdir(path) if p.endswith(".jsonl"))
+
+
+def test_group_commit(tmp_path):
+    j = Journal(str(tmp_path), batch_size=3, flush_interval=60)
+
+    j.write("entry", {"k": 0}, "EURUSD", at=T0)
+    j.write("entry", {"k": 1}, "EURUSD", at=T0 + 1)
+    assert j.written == 0 and not segment_files(tmp_path)
+
+    j.write("entry", {"k": 2}, "EURUSD", at=T0 + 2)
+    assert j.written == 3
+
+    with open(tmp_path / segment_files(tmp_path)[0]) as f:
+        assert [json.loads(line)["data"]["k"] for line in f] == [0, 1, 2]
+
+
+def test_rotates_by_day_and_size(tmp_path):
+    with Journal(str(tmp_path), batch_size=100, max_bytes=400) as j:
+        for k in range(6):
+            j.write("levels", {"k": k}, "EURUSD", at=T0 + k)
+        j.write("levels", {"k": 6}, "EURUSD", at=T0 + DAY)
+
+    files = segment_files(tmp_path)
+    assert files[0] == "20240108-000.jsonl"
+    assert files[-1] == "20240109-000.jsonl"
+    assert len(files) > 2
+    assert all(os.path.getsize(tmp_path / f) <= 400 for f in files)
+
+
+def test_query_by_event_symbol_and_time(tmp_path):
+    with Journal(str(tmp_path), batch_size=1000) as j:
+        for d in range(5):
+            for symbol in ("EURUSD", "GBPUSD"):
+                j.write("levels", {"d": d}, symbol, at=T0 + d * DAY)
+                j.write("entry", {"d": d}, symbol, at=T0 + d * DAY + 60)
+
+        hits = j.query(event="entry", symbol="GBPUSD", start=T0 + DAY, end=T0 + 3 * DAY)
+        assert [r["data"]["d"] for r in hits] == [1, 2]
+        assert all(r["event"] == "entry" and r["symbol"] == "GBPUSD" for r in hits)
+
+        assert len(j.query()) == 20
+        assert j.query(event="flip") == []
+
+    with open(tmp_path / INDEX_FILE) as f:
+        index = json.load(f)
+    assert len(index) == 5
+    assert index[0]["events"] == ["entry", "levels"]
+    assert index[0]["symbols"] == ["EURUSD", "GBPUSD"]
+
+
+def test_recovers_from_torn_write(tmp_path):
+    with Journal(str(tmp_path)) as j:
+        j.write("entry", {"k": 0}, "EURUSD", at=T0)
+        j.write("entry", {"k": 1}, "EURUSD", at=T0 + 1)
+
+    # crash: half a record appended after the last index save
+    name = segment_files(tmp_path)[0]
+    with open(tmp_path / name, "a") as f:
+        f.write('{"time": 1704700802, "event": "ent')
+
+    j = Journal(str(tmp_path))
+    assert [r["data"]["k"] for r in j.query()] == [0, 1]
+
+    j.write("flip", {"k": 2}, "EURUSD", at=T0 + 2)
+    j.close()
+    assert [r["event"] for r in Journal(str(tmp_path)).query()] == ["entry", "entry", "flip"]
+
+
+def test_trade_logger_journals_under_ignored_dir(tmp_path, monkeypatch):
+    import importlib.util
+
+    # logging/ shadows the stdlib package: load the module by path
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    spec = importlib.util.spec_from_file_location(
+        "trade_logger", os.path.join(root, "logging", "trade_logger.py")
+    )
+    trade_logger = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(trade_logger)
+
+    assert trade_logger.JOURNAL_DIR == os.path.join(root, "journal")
+    monkeypatch.setattr(trade_logger, "JOURNAL_DIR", str(tmp_path))
+
+    for logger, name in (
+        (trade_logger.TradeLogger(), "trades"),
+        (trade_logger.TradeLogger("trade_log.json"), "trade_log"),
+        (trade_logger.TradeLogger(filename="old/backtest.json"), "backtest"),
+    ):
+        logger.log("entry", {"k": 1}, symbol="EURUSD")
+        logger.close()
+        assert logger.journal.directory == str(tmp_path / name)
+        assert segment_files(tmp_path / name)
+
+    explicit = trade_logger.TradeLogger(str(tmp_path / "mine"))
+    assert explicit.journal.directory == str(tmp_path / "mine")
@@ -0,0 +1,86 @@
+# tests/test_latency.py
+
+import re
+
+import pytest
+
+from core.latency import LatencyRecorder, METRIC
+
+
+def test_quantiles_over_rolling_window():
+    rec = LatencyRecorder(window=100)
+    for ms in range(1, 201):               # only 101..200 stay in the window
+        rec.record("order_send", ms / 1000)
+
+    s = rec.summary()["order_send"]
+    assert s["count"] == 200
+    assert s["sum"] == pytest.approx(sum(range(1, 201)) / 1000)
+    assert s["p50"] == pytest.approx(0.1505)
+    assert s["p99"] == pytest.approx(0.19901)
+
+
+def test_stage_context_times_the_block():
+    rec = LatencyRecorder()
+    with rec.stage("plan"):
+        sum(range(10_000))
+    with rec.stage("plan"):
+        pass
+
+    stats = rec.stages["plan"]
+    assert stats.n == 2
+    assert stats.total > 0
+
+
+def test_disabled_records_nothing(tmp_path):
+    path = tmp_path / "latency.prom"
+    rec = LatencyRecorder(enabled=False, path=str(path), export_interval=0)
+
+    with rec.stage("plan"):
+        pass
+    rec.record("order_send", 0.5)
+    rec.maybe_export()
+
+    assert rec.stages == {}
+    assert not path.exists()
+    assert rec.stage("a") is rec.stage("b")   # shared no-op
+
+
+def test_prometheus_export(tmp_path):
+    path = tmp_path / "latency.prom"
+    rec = LatencyRecorder(path=str(path), export_interval=0)
+    rec.record("rates", 0.002)
+    rec.record("rates", 0.004)
+    rec.maybe_export()
+
+    text = path.read_text()
+    assert f"# TYPE {METRIC} summary" in text
+    assert f'{METRIC}_count{{stage="rates"}} 2' in text
+    quantiles = re.findall(rf'{METRIC}{{stage="rates",quantile="([\d.]+)"}} ', text)
+    assert quantiles == ["0.5", "0.95", "0.99"]
+
+
+def test_forward_test_reads_the_flag_when_run(monkeypatch):
+    import live.forward_test as forward_test
+
+    built = []
+
+    class Engine:
+        def __init__(self, symbols, clock, latency):
+            built.append(latency)
+
+        def run(self):
+            pass
+
+    monkeypatch.setattr(forward_test, "LiveEngine", Engine)
+    monkeypatch.setattr(forward_test.atexit, "register", lambda fn: None)
+
+    # flipped after import, as a caller setting it before run() would
+    monkeypatch.setattr(forward_test, "LATENCY_METRICS", True)
+    forward_test.run(journal_dir=None)
+    monkeypatch.setattr(forward_test, "LATENCY_METRICS", False)
+    forward_test.run(journal_dir=None)
+    forward_test.run(journal_dir=None, latency_file="x.prom")
+
+    assert built[0].enabled and built[0].path == forward_test.LATENCY_FILE
+    assert not built[1].enabled
+    assert built[2].enabled and built[2].path == "x.prom"
@@ -0,0 +1,49 @@
+# tests/test_levels.py
+
+import numpy as np
+import pandas as pd
+
+from core.levels import build_level_table, ROLLING, CALENDAR
+
+
+def make_h1(hours, start="2024-06-10 00:00"):
+    rng = np.random.default_rng(7)
+    close = 1.10 + np.cumsum(rng.normal(0, 0.001, hours))
+    return pd.DataFrame({
+        "time": pd.date_range(start, periods=hours, freq="h"),
+        "high": close + 0.0005,
+        "low": close - 0.0005,
+    })
+
+
+def test_rolling_matches_tail_24():
+    h1 = make_h1(96)
+    m5_times = pd.Series(pd.date_range("2024-06-10 00:00", periods=96 * 12, freq="5min"))
+
+    pdh, pdl = build_level_table(m5_times, h1, mode=ROLLING)
+
+    indexed = h1.set_index("time")
+    for i in range(0, len(m5_times), 7):
+        t = m5_times.iloc[i]
+        window = indexed[indexed.index < t].tail(24)
+        if len(window) < 24:
+            assert np.isnan(pdh[i]) and np.isnan(pdl[i])
+        else:
+            assert pdh[i] == window["high"].max()
+            assert pdl[i] == window["low"].min()
+
+
+def test_calendar_uses_previous_utc_day():
+    h1 = make_h1(72)
+    m5_times = pd.Series(pd.to_datetime(
+        ["2024-06-10 12:00", "2024-06-11 08:05", "2024-06-12 23:55"], utc=True
+    ))
+
+    pdh, pdl = build_level_table(m5_times, h1, mode=CALENDAR)
+
+    days = h1["time"].dt.date
+    assert np.isnan(pdh[0])
+    for i, day in ((1, "2024-06-10"), (2, "2024-06-11")):
+        prev = h1[days == pd.Timestamp(day).date()]
+        assert pdh[i] == prev["high"].max()
+        assert pdl[i] == prev["low"].min()
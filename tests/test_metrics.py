@@ -0,0 +1,80 @@
+# tests/test_metrics.py
+
+import json
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from backtest.metrics import TradeMetrics
+from backtest.report import write_report
+
+RISK = 3000
+
+
+def records(n, seed=0):
+    rng = np.random.default_rng(seed)
+    for r, flip, sell in zip(
+        rng.choice([-1, 0, 5], n), rng.random(n) < 0.3, rng.random(n) < 0.5
+    ):
+        yield {
+            "R": float(r),
+            "pnl": float(r) * RISK,
+            "is_flip": bool(flip),
+            "direction": "SELL" if sell else "BUY",
+        }
+
+
+def test_matches_batch_computation():
+    trades = list(records(500))
+    m = TradeMetrics(100_000)
+    for t in trades:
+        m.update(t)
+
+    r = np.array([t["R"] for t in trades])
+    flip = np.array([t["is_flip"] for t in trades])
+    equity = 100_000 + np.cumsum(r * RISK)
+    dd = equity - np.maximum.accumulate(np.maximum(equity, 100_000))
+
+    s = m.summary()
+    assert s["trades"] == 500
+    assert s["winrate"] == pytest.approx((r > 0).mean())
+    assert s["expectancy"] == pytest.approx(r.mean())
+    assert s["max_drawdown"] == pytest.approx(dd.min())
+    assert s["final_balance"] == pytest.approx(equity[-1])
+
+    assert m.flip.trades == flip.sum()
+    assert m.flip.expectancy == pytest.approx(r[flip].mean())
+    assert m.flip.max_drawdown == pytest.approx(dd[flip].min())
+    assert m.primary.max_drawdown == pytest.approx(dd[~flip].min())
+
+
+def test_empty_summary():
+    s = TradeMetrics(100_000).summary()
+    assert s == {
+        "trades": 0, "winrate": 0.0, "expectancy": 0.0,
+        "max_drawdown": 0.0, "final_balance": 100_000,
+    }
+
+
+def test_report_writes_files(tmp_path):
+    m = TradeMetrics(100_000)
+    for t in records(20):
+        m.update(t)
+
+    paths = write_report(m, [100_000, 103_000], str(tmp_path))
+    with open(tmp_path / "summary.json") as f:
+        assert json.load(f)["trades"] == 20
+    assert str(tmp_path / "summary.json") in paths
+
+
+def test_backtester_import_skips_matplotlib():
+    code = (
+        "import sys; import backtest.run_backtest; "
+        "print('matplotlib' in sys.modules)"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert out.stdout.strip() == "False"
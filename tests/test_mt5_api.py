@@ -0,0 +1,137 @@
+# tests/test_mt5_api.py
+
+import sys
+import types
+from collections import namedtuple
+
+import numpy as np
+import pytest
+
+from core.mt5_api import MT5Api
+
+Tick = namedtuple("Tick", "time bid ask last volume")
+
+
+class FakeMT5(types.ModuleType):
+    TIMEFRAME_M5 = 5
+
+    def __init__(self):
+        super().__init__("MetaTrader5")
+        self.errors = []          # last_error codes handed out in order
+        self.failures = 0         # next N reads return None
+
+    def copy_rates_from_pos(self, symbol, timeframe, start, count):
+        if self.failures:
+            self.failures -= 1
+            return None
+        return np.zeros(count, dtype=[("time", "<i8"), ("close", "<f8")])
+
+    def positions_get(self, symbol=None):
+        return (1, 2, 3)
+
+    def symbol_info_tick(self, symbol):
+        return Tick(0, 1.1, 1.1002, 0.0, 0)
+
+    def orders_get(self, symbol=None):
+        return (Tick(0, 1.1, 1.1002, 0.0, 0),) * 2
+
+    def order_send(self, request):
+        return None
+
+    def last_error(self):
+        return (self.errors.pop(0) if self.errors else 1, "")
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    mod = FakeMT5()
+    monkeypatch.setitem(sys.modules, "MetaTrader5", mod)
+    return mod
+
+
+def test_counts_latency_and_payload(fake):
+    api = MT5Api()
+
+    assert api.TIMEFRAME_M5 == 5
+    for _ in range(3):
+        api.copy_rates_from_pos("EURUSD", api.TIMEFRAME_M5, 0, 10)
+    api.positions_get()
+
+    stats = api.call_stats()
+    assert stats["copy_rates_from_pos"]["calls"] == 3
+    assert stats["copy_rates_from_pos"]["items"] == 30
+    assert stats["copy_rates_from_pos"]["bytes"] == 30 * 16
+    assert stats["copy_rates_from_pos"]["seconds"] > 0
+    assert stats["positions_get"]["items"] == 3
+    assert "copy_rates_from_pos" in api.format_stats()
+
+
+def test_namedtuple_result_is_one_item(fake):
+    api = MT5Api()
+    api.symbol_info_tick("EURUSD")
+    api.orders_get()
+
+    stats = api.call_stats()
+    assert stats["symbol_info_tick"]["items"] == 1      # not its 5 fields
+    assert stats["symbol_info_tick"]["bytes"] == sys.getsizeof(Tick(0, 0, 0, 0, 0))
+    assert stats["orders_get"]["items"] == 2
+
+
+def test_sees_monkeypatched_functions(fake, monkeypatch):
+    api = MT5Api()
+    api.positions_get()
+
+    monkeypatch.setattr(fake, "positions_get", lambda symbol=None: ())
+    assert api.positions_get() == ()
+    assert api.call_stats()["positions_get"]["calls"] == 2
+
+
+def test_retries_reads_on_ipc_error_only(fake):
+    api = MT5Api(retries=2, retry_delay=0)
+
+    fake.failures, fake.errors = 1, [-10005]          # IPC timeout
+    assert api.copy_rates_from_pos("EURUSD", 5, 0, 3) is not None
+
+    fake.failures, fake.errors = 1, [-2]              # plain "no data"
+    assert api.copy_rates_from_pos("EURUSD", 5, 0, 3) is None
+
+    fake.errors = [-10005, -10005]
+    assert api.order_send({}) is None                 # never retried
+
+    stats = api.call_stats()
+    assert stats["copy_rates_from_pos"]["retries"] == 1
+    assert stats["copy_rates_from_pos"]["failures"] == 1
+    assert stats["order_send"]["retries"] == 0
+
+
+def test_retry_policy_changes_apply_to_cached_wrappers(fake):
+    api = MT5Api(retry_delay=0)
+    api.copy_rates_from_pos("EURUSD", 5, 0, 3)        # wrapper built and cached
+
+    api.retries = 3
+    fake.failures, fake.errors = 3, [-10005] * 3
+    assert api.copy_rates_from_pos("EURUSD", 5, 0, 3) is not None
+    assert api.call_stats()["copy_rates_from_pos"]["retries"] == 3
+
+
+def test_shared_instance_uses_settings():
+    from config.settings import MT5_RETRIES, MT5_RETRY_DELAY, MT5_CALL_BUDGET
+    from core.mt5_api import mt5
+
+    assert mt5.retries == MT5_RETRIES > 0
+    assert mt5.retry_delay == MT5_RETRY_DELAY
+    assert mt5.budget == MT5_CALL_BUDGET
+
+
+def test_cycle_budget(fake, capsys):
+    api = MT5Api(budget={"positions_get": 2, "*": 4})
+
+    for _ in range(5):
+        api.positions_get()
+    assert api.over_budget == {"positions_get", "*"}
+    assert capsys.readouterr().out.count("budget exceeded") == 2
+
+    api.begin_cycle()
+    api.positions_get()
+    assert api.over_budget == set()
+    assert api.call_stats()["positions_get"]["cycle_calls"] == 1
@@ -0,0 +1,72 @@
+# tests/test_news_blackout.py
+
+from datetime import datetime, timezone
+
+import numpy as np
+
+from benchmarks.synthetic import generate_market
+from backtest.run_backtest import Backtester
+from core.news_blackout import NewsCalendar
+
+T0 = 1704700800  # 2024-01-08 08:00 UTC
+W = 15 * 60
+
+
+def test_point_queries_and_merged_windows():
+    cal = NewsCalendar(
+        [("USD", T0), ("USD", T0 + 600), ("EUR", T0 + 7200), ("JPY", T0 + 3600)],
+        blackout_minutes=15,
+    )
+
+    starts, ends = cal.windows["USD"]
+    assert list(starts) == [T0 - W] and list(ends) == [T0 + 600 + W]
+
+    assert cal.in_blackout("EURUSDm", T0 + 600 + W)
+    assert not cal.in_blackout("EURUSDm", T0 + 600 + W + 1)
+    assert cal.in_blackout("EURUSD", datetime.fromtimestamp(T0 + 7200, timezone.utc))
+    assert not cal.in_blackout("EURGBP", T0)
+    assert cal.in_blackout("USDJPY", T0 + 3600)
+    assert not cal.in_blackout("EURUSD", T0 + 3600)
+
+
+def test_mask_matches_point_queries():
+    rng = np.random.default_rng(0)
+    events = [("USD", int(t)) for t in T0 + rng.integers(0, 86400 * 30, 2000)]
+    events += [("EUR", int(t)) for t in T0 + rng.integers(0, 86400 * 30, 2000)]
+    cal = NewsCalendar(events, blackout_minutes=5)
+
+    times = T0 + np.arange(0, 86400 * 30, 300)
+    mask = cal.mask("EURUSD", times)
+
+    assert mask.any() and not mask.all()
+    assert list(mask) == [cal.in_blackout("EURUSD", int(t)) for t in times]
+
+
+def test_load_keeps_high_impact(tmp_path):
+    path = tmp_path / "calendar.csv"
+    path.write_text(
+        "time,currency,impact,title\n"
+        "2024-01-08T08:00:00,USD,High,CPI\n"
+        "2024-01-08T10:00:00,USD,Low,Claims\n"
+        f"{T0 + 7200},EUR,HIGH,ECB\n"
+    )
+    cal = NewsCalendar.load(str(path))
+
+    assert cal.in_blackout("EURUSD", T0)
+    assert not cal.in_blackout("EURUSD", T0 + 3600 * 2 - 3600)
+    assert cal.in_blackout("EURGBP", T0 + 7200)
+    assert len(NewsCalendar.load(str(tmp_path / "missing.csv"))) == 0
+
+
+def test_backtester_skips_blackout_before_simulating():
+    m5, h1 = generate_market(288 * 20, 3)
+
+    quiet = Backtester(news=NewsCalendar())
+    quiet.run(m5, h1, report=False)
+    assert quiet.metrics.summary()["trades"] > 0
+
+    # one release per M5 bar open: every bar is blacked out
+    busy = Backtester(news=NewsCalendar([("USD", t) for t in m5.time], blackout_minutes=1))
+    busy.run(m5, h1, report=False)
+    assert busy.metrics.summary()["trades"] == 0
+    assert busy.balance == busy.equity[0]
@@ -0,0 +1,109 @@
+# tests/test_replay.py
+
+import numpy as np
+import pytest
+
+from core.bar_cache import BarCache
+from live.replay import ReplayMT5, ReplayFinished
+
+RATES_DTYPE = [
+    ("time", "<i8"), ("open", "<f8"), ("high", "<f8"),
+    ("low", "<f8"), ("close", "<f8"),
+]
+
+DAY = 86400
+
+
+def write(cache, timeframe, start, period, rows):
+    rates = np.zeros(len(rows), dtype=RATES_DTYPE)
+    rates["time"] = start + np.arange(len(rows)) * period
+    for k, name in enumerate(("open", "high", "low", "close")):
+        rates[name] = [r[k] for r in rows]
+    cache.append("EURUSD", timeframe, rates)
+
+
+@pytest.fixture
+def replay(tmp_path):
+    cache = BarCache(str(tmp_path))
+    rows = [(1.1000, 1.1005, 1.0995, 1.1000)] * 24
+    rows[12] = (1.1000, 1.1010, 1.0988, 1.0990)   # trades through 1.0990
+    rows[13] = (1.0990, 1.1060, 1.0985, 1.1050)   # reaches 1.1050
+    write(cache, "M5", DAY, 300, rows)
+    return ReplayMT5(cache, ["EURUSD"], start=DAY + 10 * 300, balance=1000.0)
+
+
+def buy_limit(mt5, price, sl, tp):
+    return mt5.order_send({
+        "action": mt5.TRADE_ACTION_PENDING,
+        "symbol": "EURUSD",
+        "volume": 1.0,
+        "type": mt5.ORDER_TYPE_BUY_LIMIT,
+        "price": price,
+        "sl": sl,
+        "tp": tp,
+    })
+
+
+def test_rates_stop_at_the_clock(replay):
+    rates = replay.copy_rates_from_pos("EURUSD", replay.TIMEFRAME_M5, 0, 300)
+
+    # 10 closed bars + the forming one, flat at its open
+    assert len(rates) == 11
+    assert rates["time"][-1] == replay.time
+    last = rates[-1]
+    assert last["open"] == last["high"] == last["low"] == last["close"]
+
+    closed = replay.copy_rates_from_pos("EURUSD", replay.TIMEFRAME_M5, 1, 300)
+    assert len(closed) == 10
+    assert closed["time"][-1] == replay.time - 300
+
+
+def test_h1_resampled_when_not_cached(replay):
+    rates = replay.copy_rates_from_pos("EURUSD", replay.TIMEFRAME_H1, 0, 72)
+    assert len(rates) == 1  # forming hour only
+    assert rates["time"][0] == DAY
+
+
+def test_limit_fills_then_takes_profit(replay):
+    result = buy_limit(replay, 1.0990, 1.0970, 1.1050)
+    assert result.retcode == replay.TRADE_RETCODE_DONE
+    assert len(replay.orders_get()) == 1
+
+    replay.clock.sleep(13 * 300 - 10 * 300)   # bar 12 closes
+    assert replay.orders_get() == ()
+    (pos,) = replay.positions_get(symbol="EURUSD")
+    assert pos.ticket == result.order
+    assert pos.price_open == 1.0990
+
+    replay.clock.sleep(300)                   # bar 13 closes
+    assert replay.positions_get() == ()
+
+    deals = replay.history_deals_get(0, replay.time)
+    assert [d.entry for d in deals] == [replay.DEAL_ENTRY_IN, replay.DEAL_ENTRY_OUT]
+    assert deals[-1].reason == replay.DEAL_REASON_TP
+    assert deals[-1].position_id == result.order
+    assert replay.balance == pytest.approx(1000.0 + 0.0060 * 100_000)
+
+
+def test_stop_loss_checked_before_take_profit(replay):
+    buy_limit(replay, 1.0990, 1.0986, 1.1050)
+    replay.clock.sleep(13 * 300 - 10 * 300)
+    (pos,) = replay.positions_get()
+
+    # bar 13 touches both levels
+    replay.clock.sleep(300)
+    (deal,) = replay.history_deals_get(position=pos.ticket)[1:]
+    assert deal.reason == replay.DEAL_REASON_SL
+    assert deal.profit == pytest.approx(-0.0004 * 100_000)
+
+
+def test_remove_pending(replay):
+    ticket = buy_limit(replay, 1.0900, 1.0890, 1.1000).order
+    result = replay.order_send({"action": replay.TRADE_ACTION_REMOVE, "order": ticket})
+    assert result.retcode == replay.TRADE_RETCODE_DONE
+    assert replay.orders_get() == ()
+
+
+def test_clock_stops_at_end_of_history(replay):
+    with pytest.raises(ReplayFinished):
+        replay.clock.sleep(DAY)
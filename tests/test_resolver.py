@@ -0,0 +1,108 @@
+# tests/test_resolver.py
+
+import numpy as np
+
+from backtest.resolver import resolve_trade, resolve_batch
+
+
+def reference(high, low, entry_index, direction, entry, sl, tp, be_level):
+    """
+    Original bar-by-bar manage_trade loop.
+    """
+    moved = False
+    for j in range(entry_index + 1, len(high)):
+        if not moved:
+            if (direction == "SELL" and low[j] <= be_level) or (
+                direction == "BUY" and high[j] >= be_level
+            ):
+                sl = entry
+                moved = True
+
+        if (direction == "SELL" and high[j] >= sl) or (
+            direction == "BUY" and low[j] <= sl
+        ):
+            return ("BE" if moved else "SL"), j
+
+        if (direction == "SELL" and low[j] <= tp) or (
+            direction == "BUY" and high[j] >= tp
+        ):
+            return "TP", j
+
+    return "NONE", len(high) - 1
+
+
+def make_prices(n=3000, seed=11):
+    rng = np.random.default_rng(seed)
+    close = 1.10 + np.cumsum(rng.normal(0, 0.0004, n))
+    high = close + rng.random(n) * 0.0004
+    low = close - rng.random(n) * 0.0004
+    return high, low
+
+
+def make_plans(high, low, count=300, seed=5):
+    rng = np.random.default_rng(seed)
+    plans = []
+    for _ in range(count):
+        i = int(rng.integers(0, len(high) - 1))
+        direction = "BUY" if rng.random() < 0.5 else "SELL"
+        risk = float(rng.uniform(0.0002, 0.003))
+        entry = float(high[i] if direction == "BUY" else low[i])
+        sign = 1 if direction == "BUY" else -1
+        rr, be_rr = rng.choice([(5, 4), (2, 1), (1, 3)])
+        plans.append((
+            i, direction, entry,
+            entry - sign * risk,
+            entry + sign * risk * rr,
+            entry + sign * risk * be_rr,
+        ))
+    return plans
+
+
+def test_matches_bar_by_bar_loop():
+    high, low = make_prices()
+
+    for plan in make_plans(high, low):
+        res = resolve_trade(high, low, *plan)
+        assert (res.exit_reason, res.exit_index) == reference(high, low, *plan)
+
+
+def test_sl_checked_before_tp_in_same_bar():
+    high = np.array([1.10, 1.10, 1.20])
+    low = np.array([1.10, 1.10, 1.00])
+
+    res = resolve_trade(high, low, 0, "BUY", 1.10, 1.05, 1.15, 1.30)
+
+    assert res.exit_reason == "SL"
+    assert res.exit_index == 2
+
+
+def test_batch_matches_single():
+    high, low = make_prices()
+    plans = make_plans(high, low, count=100)
+
+    reasons, exits = resolve_batch(high, low, *zip(*plans))
+
+    for k, plan in enumerate(plans):
+        assert (reasons[k], exits[k]) == reference(high, low, *plan)
+
+
+def test_batch_across_many_windows(monkeypatch):
+    import backtest.resolver as resolver
+
+    # tiny windows: every search takes several passes, rows finishing
+    # in different ones
+    monkeypatch.setattr(resolver, "WINDOW", 4)
+    monkeypatch.setattr(resolver, "BLOCK", 64)
+
+    high, low = make_prices(n=800, seed=3)
+    plans = make_plans(high, low, count=200, seed=9)
+    # entries on the last two bars: nothing (or one bar) left to scan
+    for i in (len(high) - 2, len(high) - 1):
+        entry = float(high[i])
+        plans.append((i, "BUY", entry, entry - 0.001, entry + 0.005, entry + 0.004))
+
+    reasons, exits = resolve_batch(high, low, *zip(*plans))
+
+    for k, plan in enumerate(plans):
+        assert (reasons[k], exits[k]) == reference(high, low, *plan)
+    assert set(reasons) >= {"SL", "BE", "TP", "NONE"}
@@ -0,0 +1,61 @@
+# tests/test_scheduler.py
+
+import types
+from datetime import datetime, timezone
+
+from live.scheduler import BarCloseScheduler, server_offset
+
+T0 = 1704700800  # 2024-01-08 08:00 UTC
+
+
+class FakeClock:
+    def __init__(self, t):
+        self.t = t
+        self.sleeps = []
+
+    def now(self):
+        return datetime.fromtimestamp(self.t, timezone.utc)
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.t += seconds
+
+
+def test_next_close_on_server_time():
+    clock = FakeClock(T0 + 10)
+
+    assert BarCloseScheduler(clock).next_close(clock.now()).timestamp() == T0 + 300
+
+    # H1 on a +02:30 server: hours close at :30 UTC
+    h1 = BarCloseScheduler(clock, period=3600, server_offset=9000)
+    assert h1.next_close(clock.now()).timestamp() == T0 + 1800
+
+
+def test_wait_sleeps_once_to_the_close():
+    clock = FakeClock(T0 + 42)
+    close = BarCloseScheduler(clock, settle=1.0).wait()
+
+    assert close.timestamp() == T0 + 300
+    assert clock.t == T0 + 301
+    assert clock.sleeps == [259.0]
+
+
+def test_wait_runs_monitor_between_closes():
+    clock = FakeClock(T0)
+    calls = []
+
+    BarCloseScheduler(clock, settle=0).wait(monitor=lambda: calls.append(clock.t), interval=60)
+
+    assert calls == [T0 + 60, T0 + 120, T0 + 180, T0 + 240]
+    assert clock.t == T0 + 300
+
+
+def test_server_offset_from_tick():
+    now = datetime.fromtimestamp(T0, timezone.utc)
+    mt5 = types.SimpleNamespace(
+        symbol_info_tick=lambda s: types.SimpleNamespace(time=T0 + 7200 - 4)
+    )
+    assert server_offset(mt5, "EURUSD", now) == 7200
+
+    mt5.symbol_info_tick = lambda s: None
+    assert server_offset(mt5, "EURUSD", now) == 0
@@ -0,0 +1,64 @@
+# tests/test_swings.py
+
+import numpy as np
+
+from core.swings import SwingIndex
+
+
+def make_prices(n=500, seed=9):
+    rng = np.random.default_rng(seed)
+    close = 1.10 + np.cumsum(rng.normal(0, 0.0005, n))
+    # rounding creates equal neighbours (not swings)
+    high = np.round(close + rng.random(n) * 0.0003, 4)
+    low = np.round(close - rng.random(n) * 0.0003, 4)
+    return high, low
+
+
+def brute_force(high, low, order):
+    n = len(high)
+    sh = np.zeros(n, dtype=bool)
+    sl = np.zeros(n, dtype=bool)
+    for i in range(order, n - order):
+        sides = [i + k for k in range(-order, order + 1) if k != 0]
+        sh[i] = all(high[i] > high[j] for j in sides)
+        sl[i] = all(low[i] < low[j] for j in sides)
+    return sh, sl
+
+
+def test_vectorized_matches_neighbour_comparisons():
+    high, low = make_prices()
+
+    for order in (1, 2):
+        index = SwingIndex(high, low, order)
+        sh, sl = brute_force(high, low, order)
+
+        assert np.array_equal(index.is_high, sh)
+        assert np.array_equal(index.is_low, sl)
+
+
+def test_prev_swing_before_i():
+    high, low = make_prices()
+    index = SwingIndex(high, low)
+    highs = index.swing_highs()
+
+    for i in range(len(high)):
+        before = highs[highs < i]
+        expected = before[-1] if len(before) else -1
+        assert index.prev_swing_high(i) == expected
+
+
+def test_incremental_append_matches_batch():
+    high, low = make_prices(300)
+
+    for order in (1, 2):
+        batch = SwingIndex(high, low, order)
+        live = SwingIndex(high[:10], low[:10], order)
+
+        for i in range(10, len(high)):
+            live.append(high[i], low[i])
+
+        assert len(live) == len(batch)
+        assert np.array_equal(live.is_high, batch.is_high)
+        assert np.array_equal(live.is_low, batch.is_low)
+        for i in range(0, len(high), 13):
+            assert live.prev_swing_low(i) == batch.prev_swing_low(i)
@@ -0,0 +1,59 @@
+# tests/test_synthetic.py
+
+import numpy as np
+
+from benchmarks.synthetic import generate_market, BARS_PER_DAY
+from benchmarks.bench import compare
+from core.double_break_detector import DoubleBreakDetector
+from core.levels import build_level_table, CALENDAR
+
+
+def test_same_seed_same_market():
+    a, _ = generate_market(5000, seed=3)
+    b, _ = generate_market(5000, seed=3)
+    c, _ = generate_market(5000, seed=4)
+
+    assert np.array_equal(a.close, b.close)
+    assert np.array_equal(a.high, b.high)
+    assert not np.array_equal(a.close, c.close)
+
+
+def test_bars_are_consistent():
+    m5, h1 = generate_market(BARS_PER_DAY * 5, seed=1)
+
+    assert np.all(m5.high >= np.maximum(m5.open, m5.close))
+    assert np.all(m5.low <= np.minimum(m5.open, m5.close))
+    assert len(h1) == len(m5) // 12
+    assert h1.high[0] == m5.high[:12].max()
+
+
+def test_daily_sweeps_lead_to_double_breaks():
+    days = 30
+    m5, h1 = generate_market(BARS_PER_DAY * days, seed=1)
+    pdh, pdl = build_level_table(m5.time, h1, mode=CALENDAR)
+
+    swept = entries = 0
+    for day in range(1, days):
+        detector = None
+        for i in range(day * BARS_PER_DAY, (day + 1) * BARS_PER_DAY):
+            if detector is None:
+                if m5.high[i] >= pdh[i]:
+                    detector = DoubleBreakDetector(pdh[i], "SELL")
+                elif m5.low[i] <= pdl[i]:
+                    detector = DoubleBreakDetector(pdl[i], "BUY")
+                swept += detector is not None
+            if detector and detector.update(m5, i) is not None:
+                entries += 1
+                break
+
+    assert swept == days - 1
+    assert entries >= days // 3
+
+
+def test_compare_flags_regressions():
+    base = {"detector": {"bars": 10, "per_sec": 1000.0, "peak_mb": 1.0}}
+    slow = {"detector": {"bars": 10, "per_sec": 700.0, "peak_mb": 1.0, "unit": "bars"}}
+    fine = {"detector": {"bars": 10, "per_sec": 950.0, "peak_mb": 1.05, "unit": "bars"}}
+
+    assert len(compare(slow, base, 0.15)) == 1
+    assert compare(fine, base, 0.15) == []
@@ -0,0 +1,65 @@
+# tests/test_trade_state.py
+
+import types
+
+from core.trade_state import TradeState
+
+
+def item(ticket, symbol="EURUSD", magic=91001):
+    return types.SimpleNamespace(ticket=ticket, symbol=symbol, magic=magic)
+
+
+class FakeMT5:
+    def __init__(self, positions=(), orders=()):
+        self.positions = list(positions)
+        self.orders = list(orders)
+        self.calls = 0
+
+    def positions_get(self, symbol=None):
+        self.calls += 1
+        return tuple(self.positions)
+
+    def orders_get(self, symbol=None):
+        self.calls += 1
+        return tuple(self.orders)
+
+
+def test_one_refresh_serves_every_reader():
+    mt5 = FakeMT5(positions=[item(1)], orders=[item(2, "GBPUSD")])
+    state = TradeState(mt5)
+
+    state.refresh()
+    for _ in range(10):
+        state.positions("EURUSD")
+        state.open_count("GBPUSD")
+        state.position(1)
+
+    assert mt5.calls == 2
+    assert state.refreshes == 1
+
+
+def test_open_count_includes_pending_orders():
+    mt5 = FakeMT5(
+        positions=[item(1), item(3, magic=7)],
+        orders=[item(2), item(4, "GBPUSD")],
+    )
+    state = TradeState(mt5)
+
+    assert state.open_count("EURUSD") == 3
+    assert state.open_count("EURUSD", magics=(91001, 91002)) == 2
+    assert state.open_count(magics=(91001,)) == 3
+
+
+def test_invalidate_refreshes_on_next_read():
+    mt5 = FakeMT5(orders=[item(2)])
+    state = TradeState(mt5)
+    assert state.open_count() == 1
+
+    # the pending order filled
+    mt5.orders, mt5.positions = [], [item(2)]
+    assert state.position(2) is None          # cached until a trade event
+
+    state.invalidate()
+    assert state.position(2).ticket == 2
+    assert state.refreshes == 2
+    assert mt5.calls == 4
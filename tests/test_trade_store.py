@@ -0,0 +1,67 @@
+# tests/test_trade_store.py
+
+import numpy as np
+import pytest
+
+from backtest.trade_store import TradeWriter, read_trades, trades_frame
+
+
+def record(k, result="TP", session="LONDON"):
+    return {
+        "direction": "SELL" if k % 2 else "BUY",
+        "result": result,
+        "R": 5.0 if result == "TP" else -1.0,
+        "pnl": 15000.0 if result == "TP" else -3000.0,
+        "balance": 100_000.0 + k,
+        "entry_index": 100 + k,
+        "exit_index": 110 + k,
+        "entry_time": 1704700800 + k * 300,
+        "exit_time": 1704703800 + k * 300,
+        "session": session,
+        "entry": 1.1,
+        "stop_loss": 1.099,
+        "take_profit": 1.105,
+        "exit_price": 1.105,
+        "is_flip": bool(k % 3 == 0),
+    }
+
+
+def test_flushes_in_batches(tmp_path):
+    writer = TradeWriter(str(tmp_path), ["LONDON", "NY"], batch_size=4)
+
+    for k in range(10):
+        writer.write(record(k))
+
+    # two full batches on disk, two rows still buffered
+    assert len(read_trades(str(tmp_path))["entry_time"]) == 8
+
+    writer.close()
+    cols = read_trades(str(tmp_path))
+    assert len(cols["entry_time"]) == 10
+    assert isinstance(cols["R"], np.memmap)
+    assert cols["entry_index"].tolist() == list(range(100, 110))
+
+
+def test_frame_decodes_codes(tmp_path):
+    with TradeWriter(str(tmp_path), ["LONDON", "NY"]) as writer:
+        writer.write(record(1, "SL", "NY"))
+        writer.write(record(2, "TP", None))
+
+    df = trades_frame(str(tmp_path))
+    assert df["direction"].tolist() == ["SELL", "BUY"]
+    assert df["result"].tolist() == ["SL", "TP"]
+    assert df["session"].iloc[0] == "NY"
+    assert df["session"].isna().iloc[1]
+    assert str(df["entry_time"].dt.tz) == "UTC"
+
+
+def test_appends_across_writers(tmp_path):
+    with TradeWriter(str(tmp_path), ["LONDON"]) as writer:
+        writer.write(record(0))
+    with TradeWriter(str(tmp_path), ["LONDON"]) as writer:
+        writer.write(record(1))
+
+    assert len(trades_frame(str(tmp_path))) == 2
+
+    with pytest.raises(ValueError):
+        TradeWriter(str(tmp_path), ["NY"])